@@ -0,0 +1,66 @@
+"""
+Compare ``DatasetGenerator.choose_multiple()`` (and the pre-deduplicated
+pool path used by ``gen_lots()`` and ``gen_multisec()``) against the
+original set/list implementation, across small and large
+``avail_lots`` / ``avail_sec`` ranges.
+
+Run from the repo root (with the package installed, or ``PYTHONPATH=.``):
+    python benchmarks/bench_choose_multiple.py
+"""
+
+import timeit
+
+from dataset_gen.dataset_gen import DatasetGenerator
+
+# (population size, min_count, repeat_wt)
+CASES = [
+    (16, 1, 0.6),       # default lots
+    (36, 2, 0.01),      # default multi-sections
+    (1_000, 1, 0.6),
+    (1_000, 2, 0.9),
+    (100_000, 1, 0.6),
+    (100_000, 2, 0.99),
+]
+
+
+def legacy_choose_multiple(gen, choose_from: list, min_count=2, repeat_wt=0.01, reverse=False):
+    """The original implementation, rebuilding ``list(avail)`` for every element."""
+    if len(choose_from) < min_count:
+        raise ValueError("length of `choose_from` must be >= `min_count`")
+    chosen = set()
+    avail = set(choose_from)
+    new_choice = gen.rng.sample(list(avail), min_count)
+    chosen.update(new_choice)
+    avail -= chosen
+    while (len(chosen) < min_count or gen.roll(repeat_wt)) and avail:
+        new_choice = gen.rng.choice(list(avail))
+        chosen.add(new_choice)
+        avail.remove(new_choice)
+    return sorted(chosen, reverse=reverse)
+
+
+def per_call_us(func, number):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    gen = DatasetGenerator(seed=1)
+    print(
+        f"{'size':>8} {'min':>4} {'repeat_wt':>9} {'legacy us':>10} {'new us':>10} {'speedup':>8}"
+        f" {'pooled us':>10} {'speedup':>8}")
+    for size, min_count, repeat_wt in CASES:
+        avail = list(range(1, size + 1))
+        # ``gen_lots()`` and ``gen_multisec()`` sample from a pool of
+        # distinct elements, deduplicated when ``avail_*`` is set.
+        gen.avail_lots = avail
+        number = max(10, 200_000 // size)
+        legacy = per_call_us(lambda: legacy_choose_multiple(gen, avail, min_count, repeat_wt), number)
+        new = per_call_us(lambda: gen.choose_multiple(avail, min_count, repeat_wt), number)
+        pooled = per_call_us(lambda: gen._choose_multiple(gen._lot_pool, min_count, repeat_wt), number)
+        print(
+            f"{size:>8} {min_count:>4} {repeat_wt:>9} {legacy:>10.2f} {new:>10.2f} {legacy / new:>7.1f}x"
+            f" {pooled:>10.2f} {legacy / pooled:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare drawing from each default vocabulary with its precompiled
+``WeightedDict.sample()`` against the original per-call
+``random.choices()`` (rebuilding the keys and weights every call),
+with the same seeded ``random.Random``; then the end-to-end
+rows/sec of ``DatasetGenerator.generate_many()`` with every
+``WeightedDict`` draw done either way.
+
+Run from the repo root (with the package installed, or ``PYTHONPATH=.``):
+    python benchmarks/bench_choose_weighted.py [number] [rows]
+"""
+
+import random
+import sys
+import time
+import timeit
+from bisect import bisect
+from itertools import accumulate
+
+from dataset_gen._weighted import WeightedDict
+from dataset_gen.dataset_gen import DEFAULT_VOCABULARY, WEIGHTED_VOCABULARIES, DatasetGenerator
+
+SEED = 1
+
+
+def legacy_choose_weighted(rng: random.Random, weight_dict: dict):
+    """The original implementation, rebuilding both lists every call."""
+    return rng.choices(list(weight_dict.keys()), weights=list(weight_dict.values()), k=1)[0]
+
+
+def legacy_sample(weight_dict: dict, rand=random.random):
+    """
+    ``WeightedDict.sample()`` as ``random.choices()`` does it (rebuilding
+    the population and cumulative weights every call), drawing the same
+    element from the same random number.
+    """
+    population = list(weight_dict.keys())
+    cum_weights = list(accumulate(weight_dict.values()))
+    return population[bisect(cum_weights, rand() * (cum_weights[-1] + 0.0), 0, len(population) - 1)]
+
+
+def per_call_us(func, number):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def generate_rows(rows):
+    """Time ``.generate_many(rows)``; return the rows and the rows/sec."""
+    gen = DatasetGenerator(seed=SEED)
+    start = time.perf_counter()
+    result = list(gen.generate_many(rows))
+    return result, rows / (time.perf_counter() - start)
+
+
+def end_to_end(rows):
+    compiled_rows, compiled = generate_rows(rows)
+    sample = WeightedDict.sample
+    WeightedDict.sample = legacy_sample
+    try:
+        legacy_rows, legacy = generate_rows(rows)
+    finally:
+        WeightedDict.sample = sample
+    if legacy_rows != compiled_rows:
+        raise AssertionError("generate_many() generated different rows with the legacy draws")
+    print(f"\ngenerate_many({rows:,}) rows/sec: legacy {legacy:,.0f}, compiled {compiled:,.0f}"
+          f" ({compiled / legacy:.2f}x)")
+
+
+def main(number=200_000, rows=20_000):
+    print(f"{'vocabulary':>18} {'size':>5} {'legacy us':>10} {'compiled us':>12} {'speedup':>8}")
+    legacy_total = compiled_total = 0.0
+    for name in WEIGHTED_VOCABULARIES:
+        weight_dict = getattr(DEFAULT_VOCABULARY, name)
+        weight_dict.compile()
+        # Both draw the same elements from the same random numbers.
+        legacy_rng = random.Random(SEED)
+        compiled_rng = random.Random(SEED)
+        for _ in range(1_000):
+            if legacy_choose_weighted(legacy_rng, weight_dict) != weight_dict.sample(compiled_rng.random):
+                raise AssertionError(f"{name}: WeightedDict.sample() drew differently than random.choices()")
+
+        rng = random.Random(SEED)
+        legacy = per_call_us(lambda: legacy_choose_weighted(rng, weight_dict), number)
+        rng = random.Random(SEED)
+        rand = rng.random
+        compiled = per_call_us(lambda: weight_dict.sample(rand), number)
+        legacy_total += legacy
+        compiled_total += compiled
+        print(f"{name:>18} {len(weight_dict):>5} {legacy:>10.3f} {compiled:>12.3f} {legacy / compiled:>7.1f}x")
+    print(f"{'all':>18} {'':>5} {legacy_total:>10.3f} {compiled_total:>12.3f} {legacy_total / compiled_total:>7.1f}x")
+    end_to_end(rows)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,56 @@
+"""
+Measure what ``DatasetGenerator(component_cache_size=...)`` costs and
+saves: rows/sec from ``.generate_many()``, and the memory (via
+``tracemalloc``) held by a list of generated Townships and sections,
+and by a list of generated rows, with the cache off and on.
+
+Run from the repo root (with the package installed, or ``PYTHONPATH=.``):
+    python benchmarks/bench_component_cache.py [n] [cache_size]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from dataset_gen.dataset_gen import DatasetGenerator
+
+
+def rows_per_sec(gen: DatasetGenerator, n: int):
+    start = time.perf_counter()
+    for _ in gen.generate_many(n):
+        pass
+    return n / (time.perf_counter() - start)
+
+
+def kept_mib(func):
+    """Get the memory (in MiB) held by the result of ``func()``."""
+    gc.collect()
+    tracemalloc.start()
+    kept = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size / 2 ** 20
+
+
+def main(n=40_000, cache_size=4096):
+    print(f"{'':>22} {'off':>10} {'on':>10}")
+    results = {}
+    for cache_size_ in (0, cache_size):
+        gen = DatasetGenerator(seed=1, component_cache_size=cache_size_)
+        # (Best of three.)
+        speed = max(rows_per_sec(gen, n) for _ in range(3))
+        gen = DatasetGenerator(seed=1, component_cache_size=cache_size_)
+        components = kept_mib(lambda: [gen.gen_twp() for _ in range(n)] + [gen.gen_sec() for _ in range(n)])
+        gen = DatasetGenerator(seed=1, component_cache_size=cache_size_)
+        rows = kept_mib(lambda: list(gen.generate_many(n)))
+        results[cache_size_] = (speed, components, rows)
+    (off_speed, off_components, off_rows), (on_speed, on_components, on_rows) = results.values()
+    print(f"{'rows/sec':>22} {off_speed:>10,.0f} {on_speed:>10,.0f}")
+    print(f"{'kept components (MiB)':>22} {off_components:>10.1f} {on_components:>10.1f}")
+    print(f"{'kept rows (MiB)':>22} {off_rows:>10.1f} {on_rows:>10.1f}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
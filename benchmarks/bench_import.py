@@ -0,0 +1,131 @@
+"""
+Measure the startup cost of the package in fresh interpreters (as paid
+by each worker of a spawn-based process pool): the time to import each
+module, the time until a ``DatasetGenerator`` has generated its first
+description, and the slowest imports under ``python -X importtime``.
+
+Run from the repo root (with the package installed, or ``PYTHONPATH=.``):
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --runs 50 -o import_times.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules to time the import of (each in a fresh interpreter).
+MODULES = (
+    'dataset_gen.dataset_gen',
+    'dataset_gen.parallel',
+    'dataset_gen.cli',
+)
+
+_IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+_FIRST_ROW_SCRIPT = """
+import time
+start = time.perf_counter()
+from dataset_gen.dataset_gen import DatasetGenerator
+next(DatasetGenerator(seed=1).generate_many(1))
+print(time.perf_counter() - start)
+"""
+
+# Which of the lazily built module attributes are built by generating
+# with the default settings (only ``DEFAULT_VOCABULARY`` should be).
+_LAZY_SCRIPT = """
+import dataset_gen.dataset_gen as dg
+next(dg.DatasetGenerator(seed=1).generate_many(1))
+print(' '.join(name for name in dg._LAZY_ATTRIBUTES if name in vars(dg)))
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [root, env.get('PYTHONPATH')]))
+    return env
+
+
+def _run(script, *args):
+    out = subprocess.run(
+        [sys.executable, *args, '-c', script], capture_output=True, text=True, check=True, env=_env())
+    return out
+
+
+def time_script(script, runs):
+    """Run ``script`` in ``runs`` fresh interpreters, and get the seconds each printed."""
+    # One untimed run, so that bytecode is cached.
+    _run(script)
+    return [float(_run(script).stdout) for _ in range(runs)]
+
+
+def importtime(module, limit):
+    """
+    Get the slowest imports (cumulative microseconds) under
+    ``-X importtime``, when importing ``module``.
+    """
+    stderr = _run(f"import {module}", '-X', 'importtime').stderr
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    imports.sort(key=lambda item: item[2], reverse=True)
+    return imports[:limit]
+
+
+def _summary(times):
+    return {
+        'median_ms': statistics.median(times) * 1e3,
+        'min_ms': min(times) * 1e3,
+        'max_ms': max(times) * 1e3,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=20, help='fresh interpreters per measurement')
+    parser.add_argument('--top', type=int, default=15, help='number of slowest imports to list')
+    parser.add_argument('-o', '--output', help='also write the results to this JSON file')
+    args = parser.parse_args(argv)
+
+    results = {'imports': {}}
+    print(f"{'':<36} {'median ms':>10} {'min ms':>8} {'max ms':>8}")
+    cases = [(f"import {module}", _IMPORT_SCRIPT.format(module=module)) for module in MODULES]
+    cases.append(('import + first description', _FIRST_ROW_SCRIPT))
+    for name, script in cases:
+        summary = _summary(time_script(script, args.runs))
+        results['imports'][name] = summary
+        print(f"{name:<36} {summary['median_ms']:>10.2f} {summary['min_ms']:>8.2f} {summary['max_ms']:>8.2f}")
+
+    built = _run(_LAZY_SCRIPT).stdout.split()
+    results['lazy_attributes_built'] = built
+    print(f"\nLazy attributes built by default generation: {', '.join(built) or 'none'}")
+
+    slowest = importtime(MODULES[0], args.top)
+    results['importtime'] = [
+        {'module': module, 'self_us': self_us, 'cumulative_us': cumulative_us}
+        for module, self_us, cumulative_us in slowest
+    ]
+    print(f"\nSlowest imports of {MODULES[0]} (-X importtime):")
+    print(f"  {'module':<40} {'self us':>9} {'cum us':>9}")
+    for module, self_us, cumulative_us in slowest:
+        print(f"  {module:<40} {self_us:>9,} {cumulative_us:>9,}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""
+Benchmark suite for ``DatasetGenerator``: per-method and per-layout
+throughput, memory allocated per call (via ``tracemalloc``), and
+end-to-end rows/sec from ``.generate_many()``, at several weight
+configurations. Results are written to a JSON file, so that runs from
+different versions can be compared.
+
+Run from the repo root (with the package installed, or ``PYTHONPATH=.``):
+    python benchmarks/run_benchmarks.py -o results.json
+    python benchmarks/run_benchmarks.py --quick --filter layout
+    python benchmarks/run_benchmarks.py --compare old.json new.json
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from dataset_gen.dataset_gen import DatasetGenerator, LAYOUTS, TOWNSHIP
+
+# Weight configurations (``DatasetGenerator`` kwargs) to benchmark.
+CONFIGS = {
+    'default': {},
+    'noisy': {
+        'misspell_twp_wt': 0.3,
+        'misspell_rge_wt': 0.3,
+        'drop_twp_wt': 0.05,
+        'drop_rge_wt': 0.05,
+    },
+    'multisec': {
+        'multi_sec_wt': 0.5,
+        'qq_continue_wt': 0.5,
+        'desc_continue_wt': 0.8,
+    },
+    'minimal': {
+        'qq_continue_wt': 0.0,
+        'desc_continue_wt': 0.0,
+        'multi_sec_wt': 0.0,
+        'pm_wt': 0.0,
+    },
+}
+
+# Individual generator methods, each called with a generator.
+METHODS = {
+    'gen_twp': lambda gen: gen.gen_twp(),
+    'gen_rge': lambda gen: gen.gen_rge(),
+    'gen_sec': lambda gen: gen.gen_sec(),
+    'gen_pm': lambda gen: gen.gen_pm(),
+    'gen_twprge': lambda gen: gen.gen_twprge(),
+    'gen_sec_or_multisec': lambda gen: gen.gen_sec_or_multisec(),
+    'gen_multisec': lambda gen: gen.gen_multisec(),
+    'gen_lots': lambda gen: gen.gen_lots(),
+    'gen_desc_qq': lambda gen: gen.gen_desc_qq(),
+    'gen_desc': lambda gen: gen.gen_desc(),
+    'gen_all_description_components': lambda gen: gen.gen_all_description_components(),
+    'choose_weighted': lambda gen: gen.choose_weighted(TOWNSHIP),
+    'choose_multiple': lambda gen: gen.choose_multiple(gen.avail_sec, 2, 0.3),
+    'misspell': lambda gen: gen.misspell('township', a=2, b=4),
+    'misspell_cached': lambda gen: gen.misspell_cached('township', a=2, b=4),
+    '_elements_to_str_list': lambda gen: gen._elements_to_str_list(
+        [1, 2, 3, 7, 9, 10, 15], 'through', ',', 0.5, 'sec', 0.5),
+}
+
+# Layouts, and a combination of layouts, for ``.gen_combo_desc()``.
+LAYOUT_CASES = {layout: [layout] for layout in LAYOUTS}
+LAYOUT_CASES['all_combined'] = list(LAYOUTS)
+
+
+def time_per_call(func, min_time):
+    """
+    Call ``func`` repeatedly for at least ``min_time`` seconds (in
+    three rounds) and get the best time per call, in seconds.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10:
+            break
+        number *= 4
+    best = elapsed / number
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def allocations_per_call(func, calls):
+    """
+    Measure the memory allocated by ``func`` under ``tracemalloc``.
+    :return: A tuple of the peak KiB traced over ``calls`` calls, and
+     the number of memory blocks still allocated afterward (per call).
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        results = [func() for _ in range(calls)]
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    del results
+    return (peak - base) / 1024, blocks / calls
+
+
+def measure(group, name, config, func, min_time, alloc_calls, unit_count=1):
+    """
+    Benchmark one ``func``, which produces ``unit_count`` units (e.g.,
+    rows) per call.
+    """
+    seconds = time_per_call(func, min_time)
+    peak_kib, blocks = allocations_per_call(func, alloc_calls)
+    return {
+        'group': group,
+        'name': name,
+        'config': config,
+        'ops_per_sec': unit_count / seconds,
+        'us_per_op': seconds / unit_count * 1e6,
+        'peak_kib': peak_kib,
+        'blocks_per_call': blocks,
+    }
+
+
+def bench_methods(config, kwargs, min_time, alloc_calls):
+    gen = DatasetGenerator(seed=1, **kwargs)
+    for name, method in METHODS.items():
+        yield measure('method', name, config, lambda: method(gen), min_time, alloc_calls)
+
+
+def bench_layouts(config, kwargs, min_time, alloc_calls):
+    gen = DatasetGenerator(seed=1, **kwargs)
+    for name, layouts in LAYOUT_CASES.items():
+        yield measure('layout', name, config, lambda: gen.gen_combo_desc(layouts), min_time, alloc_calls)
+        yield measure(
+            'layout_labeled', name, config, lambda: gen.gen_labeled(layouts), min_time, alloc_calls)
+
+
+def bench_end_to_end(config, kwargs, rows, backends):
+    for backend in backends:
+        for labeled in (False, True):
+            gen = DatasetGenerator(seed=1, backend=backend, **kwargs)
+            name = f"generate_many[{backend}{', labeled' if labeled else ''}]"
+            start = time.perf_counter()
+            for _ in gen.generate_many(rows, labeled=labeled):
+                pass
+            seconds = time.perf_counter() - start
+            gen = DatasetGenerator(seed=1, backend=backend, **kwargs)
+            peak_kib, _ = allocations_per_call(
+                lambda: sum(1 for _ in gen.generate_many(1000, labeled=labeled)), 1)
+            yield {
+                'group': 'end_to_end',
+                'name': name,
+                'config': config,
+                'ops_per_sec': rows / seconds,
+                'us_per_op': seconds / rows * 1e6,
+                'peak_kib': peak_kib,
+                'blocks_per_call': None,
+            }
+
+
+def _available_backends():
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return ['python']
+    return ['python', 'numpy']
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)))
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def metadata():
+    try:
+        from importlib.metadata import version
+        package_version = version('dataset_gen')
+    except Exception:
+        package_version = None
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'package_version': package_version,
+        'git_commit': _git_commit(),
+    }
+
+
+def run(configs, groups, min_time, alloc_calls, rows, name_filter=None):
+    results = []
+    for config in configs:
+        kwargs = CONFIGS[config]
+        benches = []
+        if 'method' in groups:
+            benches.append(bench_methods(config, kwargs, min_time, alloc_calls))
+        if 'layout' in groups:
+            benches.append(bench_layouts(config, kwargs, min_time, alloc_calls))
+        if 'end_to_end' in groups:
+            benches.append(bench_end_to_end(config, kwargs, rows, _available_backends()))
+        for bench in benches:
+            for result in bench:
+                if name_filter and name_filter not in f"{result['group']}:{result['name']}":
+                    continue
+                results.append(result)
+                print(
+                    f"{result['config']:<10} {result['group']:<15} {result['name']:<32} "
+                    f"{result['ops_per_sec']:>12,.0f}/s {result['us_per_op']:>10.2f} us "
+                    f"{result['peak_kib']:>9.1f} KiB",
+                    file=sys.stderr,
+                )
+    return results
+
+
+def _key(result):
+    return result['config'], result['group'], result['name']
+
+
+def compare(base_path, new_path, threshold=0.05):
+    """
+    Print the change in throughput of each benchmark between two
+    results files, flagging changes beyond ``threshold``.
+    """
+    with open(base_path, encoding='utf-8') as file:
+        base = json.load(file)
+    with open(new_path, encoding='utf-8') as file:
+        new = json.load(file)
+    base_results = {_key(result): result for result in base['results']}
+    print(f"base: {base['meta'].get('git_commit')}  new: {new['meta'].get('git_commit')}")
+    for result in new['results']:
+        old = base_results.get(_key(result))
+        if old is None:
+            continue
+        ratio = result['ops_per_sec'] / old['ops_per_sec']
+        flag = ''
+        if ratio < 1 - threshold:
+            flag = '  SLOWER'
+        elif ratio > 1 + threshold:
+            flag = '  faster'
+        print(f"{result['config']:<10} {result['group']:<15} {result['name']:<32} {ratio:>7.2f}x{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help='JSON results file')
+    parser.add_argument(
+        '--configs', nargs='+', choices=list(CONFIGS), default=list(CONFIGS), help='weight configurations')
+    parser.add_argument(
+        '--groups', nargs='+', choices=('method', 'layout', 'end_to_end'),
+        default=['method', 'layout', 'end_to_end'])
+    parser.add_argument('--filter', help="only run benchmarks whose 'group:name' contains this")
+    parser.add_argument('--quick', action='store_true', help='shorter runs (noisier results)')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'), help='compare two results files')
+    args = parser.parse_args(argv)
+    if args.compare:
+        compare(*args.compare)
+        return 0
+    if args.quick:
+        min_time, alloc_calls, rows = 0.05, 100, 5_000
+    else:
+        min_time, alloc_calls, rows = 0.5, 1_000, 50_000
+    results = run(args.configs, args.groups, min_time, alloc_calls, rows, args.filter)
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump({'meta': metadata(), 'results': results}, file, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Bounded caches of rendered description components (e.g., ``'t154n'``),
+so that each distinct component is built once and then shared.
+
+This saves memory only where the components themselves are kept (e.g.,
+lists of ``.gen_twp()`` results): a row concatenates its components
+into a new string either way, and a lookup costs a little more than
+the rendering it saves, so ``DatasetGenerator`` does not use these
+caches unless given a ``component_cache_size``.
+"""
+
+
+def render_parts(key: tuple):
+    """Render a component by concatenating its parts."""
+    return ''.join(map(str, key))
+
+
+class ComponentCache(dict):
+    """
+    A cache of components, keyed by the tuple of the parts they are
+    rendered from (e.g., ``('t', '', 154, '', 'n')``). Look up (or
+    render) a component with ``.get_or_render()``.
+
+    Holds at most ``maxsize`` recently used components, plus up to
+    ``maxsize`` from before (an approximation of LRU): when full, its
+    contents become the previous generation, from which components are
+    moved back as they are used, and the rest are dropped at the next
+    turnover.
+    """
+
+    __slots__ = ('maxsize', 'lookups', 'renders', '_old')
+
+    def __init__(self, maxsize: int):
+        """
+        :param maxsize: Max number of recently used components to keep.
+        """
+        super().__init__()
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be >= 1")
+        self.maxsize = maxsize
+        self.lookups = 0
+        self.renders = 0
+        self._old = {}
+
+    def get_or_render(self, key: tuple, render=render_parts):
+        """
+        Get the cached component for the ``key``, or render it with
+        ``render(key)`` and cache it.
+        """
+        self.lookups += 1
+        text = self.get(key)
+        if text is None:
+            text = self._old.pop(key, None)
+            if text is None:
+                text = render(key)
+                self.renders += 1
+            if len(self) >= self.maxsize:
+                self._old = dict(self)
+                self.clear()
+            self[key] = text
+        return text
+
+    def stats(self):
+        """
+        Get the number of lookups, hits (lookups that did not render a
+        new component) and cached components, as a dict.
+        """
+        hits = self.lookups - self.renders
+        return {
+            'lookups': self.lookups,
+            'hits': hits,
+            'hit_rate': hits / self.lookups if self.lookups else 0.0,
+            'size': len(self) + len(self._old),
+        }
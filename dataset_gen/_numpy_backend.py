@@ -0,0 +1,197 @@
+"""
+Optional NumPy backend for ``DatasetGenerator``.
+
+The independent numeric draws behind Townships, Ranges, Sections and
+principal meridians (word choices, numbers, directions, spacing, drop
+and misspell rolls, connectors) are drawn for a whole block of rows in
+a few vectorized calls. Only the string assembly happens per row.
+
+The first block of each is small (``FIRST_BLOCK_SIZE`` rows), and each
+block after is twice the size of the last, up to the full block size,
+so that generating only a few rows does not pay for drawing (and
+assembling) a whole block. (For 1,000 rows, drawing a full block up
+front made the NumPy backend ~7x slower than the Python backend.)
+"""
+
+import numpy as np
+
+DEFAULT_BLOCK_SIZE = 65_536
+FIRST_BLOCK_SIZE = 512
+
+TWPRGE_CONNECTORS = (', ', ' - ', '-')
+PM_CONNECTORS = (', ', ' of the ')
+
+
+def weighted_indexes(np_rng, weight_dict, size):
+    """
+    Draw ``size`` indexes into the population of a ``WeightedDict``,
+    per its weights.
+    """
+    _, cum_weights, total, hi = weight_dict.table
+    idxs = np.searchsorted(cum_weights, np_rng.random(size) * total, side='right')
+    np.minimum(idxs, hi, out=idxs)
+    return idxs
+
+
+def weighted_choices(np_rng, weight_dict, size):
+    """Draw ``size`` elements from a ``WeightedDict``, per its weights."""
+    population = weight_dict.table[0]
+    return [population[i] for i in weighted_indexes(np_rng, weight_dict, size).tolist()]
+
+
+def rolls(np_rng, weight, size):
+    """Roll ``size`` probabilities at once, as with ``DatasetGenerator.roll()``."""
+    return (np_rng.random(size) <= weight).tolist()
+
+
+def uniform_choices(np_rng, seq, size):
+    """Draw ``size`` elements from ``seq`` (uniformly, with replacement)."""
+    return [seq[i] for i in np_rng.integers(0, len(seq), size).tolist()]
+
+
+def direction_choices(np_rng, dir1: dict, dir2: dict, size):
+    """
+    Choose ``dir1`` or ``dir2`` (equally likely) for each row, then a
+    word from the chosen direction.
+    """
+    use_dir1 = np_rng.integers(0, 2, size).astype(bool)
+    words1 = weighted_choices(np_rng, dir1, size)
+    words2 = weighted_choices(np_rng, dir2, size)
+    return [w1 if d1 else w2 for d1, w1, w2 in zip(use_dir1.tolist(), words1, words2)]
+
+
+class NumpyColumns:
+    """
+    Buffers of pre-assembled Townships, Ranges, Sections and
+    Twp/Rge/PM strings, refilled a block at a time for a
+    ``DatasetGenerator``. Each is a tuple of its text and its values,
+    as returned by ``DatasetGenerator._gen_twp()``, etc.
+    """
+
+    def __init__(self, generator, block_size: int = DEFAULT_BLOCK_SIZE, first_block_size: int = FIRST_BLOCK_SIZE):
+        """
+        :param generator: The ``DatasetGenerator`` whose weights and
+         available numbers to use. Its ``.rng`` seeds the NumPy
+         generator, and is used for the (rare) misspellings.
+        :param block_size: Maximum number of rows to draw at once.
+        :param first_block_size: Number of rows to draw in the first
+         block (doubling for each block after, up to ``block_size``).
+        """
+        if block_size < 1 or first_block_size < 1:
+            raise ValueError("`block_size` and `first_block_size` must be >= 1")
+        self.generator = generator
+        self.block_size = block_size
+        self.first_block_size = min(first_block_size, block_size)
+        # Buffer name --> size of its next block.
+        self._next_sizes = {}
+        self.np_rng = np.random.default_rng(generator.rng.getrandbits(64))
+        self._twp = []
+        self._rge = []
+        self._sec = []
+        self._twprge = []
+
+    def twp(self):
+        if not self._twp:
+            self._twp = self._draw_twp(self._next_size('twp'))
+        return self._twp.pop()
+
+    def rge(self):
+        if not self._rge:
+            self._rge = self._draw_rge(self._next_size('rge'))
+        return self._rge.pop()
+
+    def sec(self):
+        if not self._sec:
+            self._sec = self._draw_sec(self._next_size('sec'))
+        return self._sec.pop()
+
+    def twprge(self):
+        if not self._twprge:
+            self._twprge = self._draw_twprge(self._next_size('twprge'))
+        return self._twprge.pop()
+
+    def _next_size(self, name):
+        """Get the size of the next block of a buffer (doubling the one after)."""
+        size = self._next_sizes.get(name, self.first_block_size)
+        self._next_sizes[name] = min(2 * size, self.block_size)
+        return size
+
+    def _draw_twp(self, size):
+        gen = self.generator
+        vocab = gen.vocab
+        np_rng = self.np_rng
+        words = weighted_choices(np_rng, vocab.TOWNSHIP, size)
+        misspell = rolls(np_rng, gen.misspell_twp_wt, size)
+        nums = uniform_choices(np_rng, gen.avail_twp, size)
+        nss = direction_choices(np_rng, vocab.NORTH, vocab.SOUTH, size)
+        tight1 = rolls(np_rng, 0.9, size)
+        tight2 = rolls(np_rng, 0.9, size)
+        out = []
+        for twp_wd, do_misspell, twp_num, ns, t1, t2 in zip(words, misspell, nums, nss, tight1, tight2):
+            space_req = twp_wd in vocab.TWPRGE_REQUIRE_SPACE
+            if do_misspell:
+                twp_wd = gen._misspell(twp_wd, a=2, b=4, drop_chance=0.1)
+            if space_req:
+                twp_wd = f"{twp_wd} "
+            space1 = '' if t1 else ' '
+            space2 = '' if t2 and ns in ('n', 's') else ' '
+            out.append((f"{twp_wd}{space1}{twp_num}{space2}{ns}", twp_num, ns[0].upper()))
+        return out
+
+    def _draw_rge(self, size):
+        gen = self.generator
+        vocab = gen.vocab
+        np_rng = self.np_rng
+        words = weighted_choices(np_rng, vocab.RANGE, size)
+        misspell = rolls(np_rng, gen.misspell_rge_wt, size)
+        nums = uniform_choices(np_rng, gen.avail_rge, size)
+        ews = direction_choices(np_rng, vocab.WEST, vocab.EAST, size)
+        tight1 = rolls(np_rng, 0.9, size)
+        tight2 = rolls(np_rng, 0.9, size)
+        out = []
+        for rge_wd, do_misspell, rge_num, ew, t1, t2 in zip(words, misspell, nums, ews, tight1, tight2):
+            space_req = rge_wd in vocab.TWPRGE_REQUIRE_SPACE
+            if do_misspell:
+                rge_wd = gen._misspell(rge_wd, a=1, b=3, drop_chance=0.1)
+            if space_req:
+                rge_wd = f"{rge_wd} "
+            space1 = '' if t1 and rge_wd == 'r' else ' '
+            space2 = '' if t2 and ew in ('e', 'w') else ' '
+            out.append((f"{rge_wd}{space1}{rge_num}{space2}{ew}", rge_num, ew[0].upper()))
+        return out
+
+    def _draw_sec(self, size):
+        np_rng = self.np_rng
+        words = weighted_choices(np_rng, self.generator.vocab.SECTION, size)
+        nums = uniform_choices(np_rng, self.generator.avail_sec, size)
+        return [
+            (f"{sec_wd}{sec_num}" if sec_wd == '§' else f"{sec_wd} {sec_num}", (sec_num,))
+            for sec_wd, sec_num in zip(words, nums)
+        ]
+
+    def _draw_twprge(self, size):
+        gen = self.generator
+        np_rng = self.np_rng
+        drop_twps = rolls(np_rng, gen.drop_twp_wt, size)
+        drop_rges = rolls(np_rng, gen.drop_rge_wt, size)
+        twprge_connectors = uniform_choices(np_rng, TWPRGE_CONNECTORS, size)
+        use_pm = rolls(np_rng, gen.pm_wt, size)
+        pm_wds = weighted_choices(np_rng, gen.vocab.PM, size)
+        pm_ids = uniform_choices(np_rng, gen.vocab.PM_IDS, size)
+        pm_connectors = uniform_choices(np_rng, PM_CONNECTORS, size)
+        out = []
+        rows = zip(drop_twps, drop_rges, twprge_connectors, use_pm, pm_wds, pm_ids, pm_connectors)
+        for drop_twp, drop_rge, twprge_connector, pm_needed, pm_wd, pm_id, pm_connector in rows:
+            twp, twp_num, ns = ('', None, None) if drop_twp else self.twp()
+            rge, rge_num, ew = ('', None, None) if drop_rge else self.rge()
+            if not (twp and rge):
+                twprge_connector = ''
+            pm = ''
+            if pm_needed:
+                pm = f"{pm_id} {pm_wd}"
+            else:
+                pm_id = None
+            if not ((twp or rge) and pm):
+                pm_connector = ''
+            out.append((f"{twp}{twprge_connector}{rge}{pm_connector}{pm}", twp_num, ns, rge_num, ew, pm_id))
+        return out
@@ -0,0 +1,99 @@
+"""
+Weighted vocabularies that are compiled once into cumulative-weight
+tables, so that repeated sampling is a single ``bisect``.
+"""
+
+import random
+from bisect import bisect
+from itertools import accumulate
+from math import isfinite
+
+
+class WeightedDict(dict):
+    """
+    A ``dict`` of ``{element: weight}`` that compiles itself into a
+    cumulative-weight table the first time it is sampled. Sampling
+    draws exactly the same random number (and so returns exactly the
+    same element) as ``random.choices(keys, weights=values)``.
+
+    Any modification to the dict invalidates the compiled table, which
+    is then rebuilt on the next sample.
+    """
+
+    __slots__ = ('_table',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._table = None
+
+    def compile(self):
+        """
+        Build (or rebuild) the cumulative-weight table.
+        :return: A tuple of ``(population, cum_weights, total, hi)``.
+        """
+        population = tuple(self.keys())
+        if not population:
+            raise IndexError('Cannot sample from an empty WeightedDict')
+        cum_weights = list(accumulate(self.values()))
+        total = cum_weights[-1] + 0.0
+        if total <= 0.0:
+            raise ValueError('Total of weights must be greater than zero')
+        if not isfinite(total):
+            raise ValueError('Total of weights must be finite')
+        self._table = (population, cum_weights, total, len(population) - 1)
+        return self._table
+
+    @property
+    def table(self):
+        """
+        The compiled ``(population, cum_weights, total, hi)`` table
+        (compiled now, if necessary).
+        """
+        return self._table or self.compile()
+
+    def sample(self, rand=random.random):
+        """
+        Choose 1 element, per the weights.
+        :param rand: A function returning a float in ``[0.0, 1.0)``.
+        """
+        table = self._table
+        if table is None:
+            table = self.compile()
+        population, cum_weights, total, hi = table
+        return population[bisect(cum_weights, rand() * total, 0, hi)]
+
+    def __setitem__(self, key, value):
+        self._table = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._table = None
+        super().__delitem__(key)
+
+    def __ior__(self, other):
+        self._table = None
+        return super().__ior__(other)
+
+    def update(self, *args, **kwargs):
+        self._table = None
+        super().update(*args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        self._table = None
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self._table = None
+        return super().pop(*args)
+
+    def popitem(self):
+        self._table = None
+        return super().popitem()
+
+    def clear(self):
+        self._table = None
+        super().clear()
+
+    def __reduce__(self):
+        # Keep the compiled table, if any, so it is not rebuilt on load.
+        return self.__class__, (dict(self),), (None, {'_table': self._table})
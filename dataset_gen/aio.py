@@ -0,0 +1,140 @@
+"""
+Async interfaces for consuming generated descriptions from an event
+loop (e.g., in a data-loading service) without blocking it.
+
+Batches are generated in the background (in a thread, or in a process
+pool), with no more than ``max_pending`` batches generated ahead of
+the consumer, so a slow consumer pauses generation instead of letting
+batches pile up in memory.
+
+Example:
+    async for batch in agenerate(DatasetGenerator(seed=42), 1_000_000, batch_size=512):
+        await feed(batch)
+"""
+
+import asyncio
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+from .dataset_gen import DatasetGenerator
+from .parallel import DEFAULT_SHARD_SIZE, derive_seed, generate_shard, iter_shards
+
+
+async def _prefetch(executor, calls, max_pending: int):
+    """
+    Run each ``(func, *args)`` in ``calls`` in the ``executor``, with up
+    to ``max_pending`` running (or done but not yet consumed) at once,
+    and yield their results in order.
+    """
+    if max_pending < 1:
+        raise ValueError("`max_pending` must be >= 1")
+    loop = asyncio.get_running_loop()
+    pending = deque()
+    try:
+        for call in calls:
+            pending.append(loop.run_in_executor(executor, *call))
+            if len(pending) >= max_pending:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def agenerate(
+        generator: DatasetGenerator,
+        n: int,
+        batch_size: int = 1024,
+        layouts: list = None,
+        layout_weights: list = None,
+        labeled: bool = False,
+        max_pending: int = 2,
+):
+    """
+    Asynchronously generate ``n`` descriptions from the ``generator``,
+    in batches generated by a background thread. The rows are the same
+    as from ``generator.generate_many()`` (with the same arguments).
+
+    (Generation still holds the GIL in the background thread, but the
+    event loop gets its turn at least every switch interval, rather
+    than waiting for a whole batch. For more throughput, see
+    ``agenerate_parallel()``.)
+
+    If the consumer stops early, closing the async generator (as
+    ``async for`` does on ``break`` or an exception) cancels the
+    batches not yet started and waits for the one in progress, so the
+    ``generator`` is no longer used once it is closed.
+
+    :param batch_size: Number of rows per batch.
+    :param max_pending: Max number of batches generated ahead of the
+     consumer.
+    :return: An async generator of lists of description strings (or
+     ``LabeledDescription`` objects, if ``labeled=True``).
+    """
+    if batch_size < 1:
+        raise ValueError("`batch_size` must be >= 1")
+    rows = generator.generate_many(n, layouts=layouts, layout_weights=layout_weights, labeled=labeled)
+    calls = ((_next_batch, rows, min(batch_size, n - start)) for start in range(0, n, batch_size))
+    # One thread, so that batches are generated in order.
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='dataset_gen')
+    batches = _prefetch(executor, calls, max_pending)
+    try:
+        async for batch in batches:
+            yield batch
+    finally:
+        await batches.aclose()
+        executor.shutdown(wait=False, cancel_futures=True)
+        # Join the thread without blocking the event loop.
+        await asyncio.to_thread(executor.shutdown)
+
+
+def _next_batch(rows, count):
+    return list(islice(rows, count))
+
+
+async def agenerate_parallel(
+        n: int,
+        seed: int = 0,
+        workers: int = None,
+        batch_size: int = DEFAULT_SHARD_SIZE,
+        layouts: list = None,
+        layout_weights: list = None,
+        generator_kwargs: dict = None,
+        labeled: bool = False,
+        noise_kwargs: dict = None,
+        max_pending: int = None,
+        mp_context=None,
+):
+    """
+    Asynchronously generate ``n`` descriptions across a process pool,
+    one batch per seeded shard. The rows are the same as from
+    ``dataset_gen.parallel.generate_parallel()`` with a ``shard_size``
+    of ``batch_size`` (for any number of workers).
+
+    :param max_pending: Max number of batches generated ahead of the
+     consumer. Defaults to ``2 * workers``.
+    :return: An async generator of lists of description strings (or
+     ``LabeledDescription`` objects, if ``labeled=True``).
+
+    See ``generate_parallel()`` for the other parameters.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_pending is None:
+        max_pending = 2 * workers
+    calls = (
+        (generate_shard, derive_seed(seed, shard_index), count, layouts, layout_weights, generator_kwargs, labeled,
+         noise_kwargs)
+        for shard_index, _, count in iter_shards(n, batch_size)
+    )
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context)
+    batches = _prefetch(executor, calls, max_pending)
+    try:
+        async for batch in batches:
+            yield batch
+    finally:
+        await batches.aclose()
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,259 @@
+"""
+Command-line entry point for generating datasets in bulk.
+
+Example:
+    dataset_gen -n 1000000 -o corpus.jsonl.gz --workers 8 --seed 42 \\
+        --layouts TRS_desc desc_STR TRS_desc+desc_STR --layout-weights 5 3 1
+"""
+
+import argparse
+import inspect
+import os
+import random
+import sys
+import time
+
+from .dataset_gen import DatasetGenerator, LAYOUTS, LAYOUT_TEMPLATES, LayoutTemplate
+from .dedup import DEDUP_METHODS, Deduplicator
+from .noise import NoiseGenerator
+from .parallel import DEFAULT_SHARD_SIZE, generate_parallel
+from .writers import COMPRESSIONS, DEFAULT_CHUNK_SIZE, FORMATS, resolve_output, write_rows
+
+# ``DatasetGenerator`` parameters that take a list of available numbers.
+_AVAIL_PARAMS = ('avail_twp', 'avail_rge', 'avail_sec', 'avail_lots')
+
+
+def _weight_params(cls=DatasetGenerator):
+    """
+    The constructor's weight parameters (those ending in ``_wt``) and
+    their defaults, for ``DatasetGenerator`` (or ``NoiseGenerator``).
+    """
+    signature = inspect.signature(cls.__init__)
+    return {
+        name: param.default
+        for name, param in signature.parameters.items()
+        if name.endswith('_wt')
+    }
+
+
+def parse_numbers(text: str):
+    """
+    Parse a list of numbers, such as ``'1-36'`` or ``'1,2,5-8'``.
+    """
+    numbers = []
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-', 1)
+            numbers.extend(range(int(start), int(end) + 1))
+        else:
+            numbers.append(int(part))
+    if not numbers:
+        raise argparse.ArgumentTypeError(f"No numbers in {text!r}")
+    return numbers
+
+
+def parse_layout(text: str):
+    """
+    Parse a layout, or a ``+``-separated combination of layouts
+    (e.g., ``'TRS_desc+desc_STR'``). (Names are checked once any
+    ``--layout-template`` layouts are known.)
+    """
+    layouts = text.split('+')
+    if len(layouts) == 1:
+        return layouts[0]
+    return layouts
+
+
+def parse_layout_template(text: str):
+    """
+    Parse a user-defined layout, as ``NAME=TEMPLATE`` (e.g.,
+    ``'TRS_paren={TR}: [{S} ({desc})]'``).
+    """
+    name, sep, template = text.partition('=')
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"Expected NAME=TEMPLATE, not {text!r}")
+    try:
+        return name, LayoutTemplate(template)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def resolve_layouts(layouts, templates: dict):
+    """
+    Resolve the parsed ``--layouts`` to ``LayoutTemplate`` objects
+    (which, unlike names, can be sent to worker processes).
+    :param templates: The available templates, by name.
+    """
+    resolved = []
+    for layout in layouts:
+        combo = [layout] if isinstance(layout, str) else layout
+        for lyt in combo:
+            if lyt not in templates:
+                raise ValueError(f"Unknown layout {lyt!r} (choose from {', '.join(templates)})")
+        if isinstance(layout, str):
+            resolved.append(templates[layout])
+        else:
+            resolved.append([templates[lyt] for lyt in layout])
+    return resolved
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='dataset_gen',
+        description='Generate a dataset of dummy PLSS land descriptions.',
+    )
+    parser.add_argument('-n', '--rows', type=int, required=True, help='number of descriptions to generate')
+    parser.add_argument(
+        '-o', '--output', required=True,
+        help='output file; format and compression are inferred from the extension (e.g., out.jsonl.gz)')
+    parser.add_argument('--format', choices=FORMATS, help='output format (overrides the extension)')
+    parser.add_argument(
+        '--compression',
+        help=f"output compression: {' or '.join(COMPRESSIONS)} (or a codec supported by pyarrow, for parquet)")
+    parser.add_argument('--level', type=int, help='compression level')
+    parser.add_argument(
+        '--seed', type=int,
+        help='master seed (the same seed gives the same output for any number of workers); random if omitted')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes (default: 1)')
+    parser.add_argument(
+        '--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+        help=f'rows generated per seeded shard (default: {DEFAULT_SHARD_SIZE})')
+    parser.add_argument(
+        '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+        help=f'rows written at a time (default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument(
+        '--layouts', nargs='+', type=parse_layout,
+        help=f"layouts to choose from for each row; join with '+' to combine (choices: {', '.join(LAYOUTS)})")
+    parser.add_argument('--layout-weights', nargs='+', type=float, help='weight of each of the --layouts')
+    parser.add_argument(
+        '--layout-template', action='append', type=parse_layout_template, default=[], metavar='NAME=TEMPLATE',
+        help="define a layout to use in --layouts (e.g., 'TRS_paren={TR}: [{S} ({desc})]'); may be repeated")
+    parser.add_argument('--labeled', action='store_true', help='also write the structured labels of each row')
+    parser.add_argument(
+        '--backend', choices=('python', 'numpy', 'auto'), default='python',
+        help="generation backend (default: python)")
+    parser.add_argument(
+        '--cache-misspellings', action='store_true',
+        help='draw misspellings from precomputed tables (faster, same distribution, different draws)')
+    parser.add_argument(
+        '--vocab', metavar='PATH',
+        help='vocabulary profile (.json or .toml) overriding the default vocabularies')
+    weights = parser.add_argument_group('generator weights')
+    for name, default in _weight_params().items():
+        weights.add_argument(f"--{name.replace('_', '-')}", type=float, default=default, help=f'(default: {default})')
+    avail = parser.add_argument_group('available numbers (e.g., 1-36 or 1,3,5-8)')
+    for name in _AVAIL_PARAMS:
+        avail.add_argument(f"--{name.replace('_', '-')}", type=parse_numbers)
+    unique = parser.add_argument_group('uniqueness')
+    unique.add_argument(
+        '--unique', action='store_true',
+        help='drop duplicate rows (generating more until there are --rows unique rows), and report the duplicate rate')
+    unique.add_argument(
+        '--dedup-method', choices=DEDUP_METHODS, default='bloom',
+        help="'bloom' (least memory) or 'hash' (64-bit hashes; almost no false positives) (default: bloom)")
+    unique.add_argument(
+        '--dedup-error-rate', type=float, default=1e-4,
+        help='false-positive rate of the bloom filter; each false positive drops a unique row (default: 1e-4)')
+    noise = parser.add_argument_group('metes-and-bounds / free-text noise')
+    noise.add_argument(
+        '--noise', action='store_true', help='mix descriptions with filler text, and add rows of filler only')
+    for name, default in _weight_params(NoiseGenerator).items():
+        noise.add_argument(f"--{name.replace('_', '-')}", type=float, default=default, help=f'(default: {default})')
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        fmt, compression = resolve_output(args.output, args.format, args.compression)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.layout_weights is not None and len(args.layout_weights) != len(args.layouts or LAYOUTS):
+        parser.error('--layout-weights must have one weight per layout')
+    layouts = args.layouts
+    if layouts is not None:
+        templates = dict(LAYOUT_TEMPLATES)
+        templates.update(args.layout_template)
+        try:
+            layouts = resolve_layouts(layouts, templates)
+        except ValueError as e:
+            parser.error(str(e))
+    vocab = None
+    if args.vocab is not None:
+        # Load the profile once; workers get the compiled ``Vocabulary``.
+        from .vocab import load_vocabulary
+        try:
+            vocab = load_vocabulary(args.vocab)
+        except (OSError, ValueError, ImportError) as e:
+            parser.error(f'--vocab: {e}')
+    seed = args.seed
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    generator_kwargs = {name: getattr(args, name) for name in _weight_params()}
+    for name in _AVAIL_PARAMS:
+        if getattr(args, name) is not None:
+            generator_kwargs[name] = getattr(args, name)
+    generator_kwargs['backend'] = args.backend
+    generator_kwargs['cache_misspellings'] = args.cache_misspellings
+    if vocab is not None:
+        generator_kwargs['vocab'] = vocab
+    noise_kwargs = None
+    if args.noise:
+        noise_kwargs = {name: getattr(args, name) for name in _weight_params(NoiseGenerator)}
+
+    dedup = None
+    if args.unique:
+        try:
+            dedup = Deduplicator(args.rows or 1, args.dedup_method, args.dedup_error_rate)
+        except ValueError as e:
+            parser.error(str(e))
+
+    start = time.perf_counter()
+    rows = generate_parallel(
+        args.rows,
+        seed=seed,
+        workers=args.workers,
+        layouts=layouts,
+        layout_weights=args.layout_weights,
+        generator_kwargs=generator_kwargs,
+        shard_size=args.shard_size,
+        labeled=args.labeled,
+        noise_kwargs=noise_kwargs,
+        dedup=dedup,
+    )
+    try:
+        count = write_rows(
+            rows,
+            args.output,
+            fmt=fmt,
+            compression=compression,
+            chunk_size=args.chunk_size,
+            level=args.level,
+        )
+    except (RuntimeError, ImportError) as e:
+        print(f"dataset_gen: error: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    megabytes = os.path.getsize(args.output) / 1e6
+    print(
+        f"Wrote {count:,} rows ({megabytes:,.1f} MB) to {args.output} in {elapsed:,.2f}s "
+        f"[{count / elapsed:,.0f} rows/sec, {megabytes / elapsed:,.2f} MB/sec] (seed={seed})",
+        file=sys.stderr,
+    )
+    if dedup is not None:
+        report = dedup.report()
+        print(
+            f"Dropped {report['duplicates']:,} duplicates of {report['rows']:,} rows generated "
+            f"({report['duplicate_rate']:.2%}); {report['method']} filter used "
+            f"{report['memory_bytes'] / 1e6:,.2f} MB (est. false-positive rate {report['false_positive_rate']:.2g})",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,375 @@
+"""
+A compact, columnar in-memory container for a generated corpus (e.g.,
+to shuffle and split it before training).
+
+The descriptions are stored as one contiguous UTF-8 buffer with an
+array of offsets, and their ``Tract`` labels as typed arrays (with the
+variable-length sections, lots and aliquots as flat arrays plus
+offsets), instead of a Python object per row. Slicing and shuffling
+make views that share the same storage, and a dataset can be dumped
+to a corpus file that is loaded back memory-mapped (see
+``dataset_gen.corpus``).
+
+Example:
+    dataset = ColumnarDataset.from_rows(generator.generate_many(10_000_000, labeled=True))
+    shuffled = dataset.shuffle(seed=0)
+    train, test = shuffled[:9_000_000], shuffled[9_000_000:]
+    train.dump('train.corpus')
+    train = ColumnarDataset.load('train.corpus')
+"""
+
+import random
+from array import array
+from collections.abc import Sequence
+
+from .labels import LabeledDescription, Tract
+
+# Column name --> ``array`` typecode.
+TEXT_COLUMNS = {
+    # Start of each row in the UTF-8 buffer (plus the end of the last).
+    'offsets': 'Q',
+}
+LABEL_COLUMNS = {
+    # Start of each row's tracts (plus the end of the last).
+    'tract_offsets': 'Q',
+    # Per tract: numbers are -1, and directions (as ``ord()``) are 0, for None.
+    'twp': 'i',
+    'ns': 'B',
+    'rge': 'i',
+    'ew': 'B',
+    # Index into the ``'pm'`` table (-1 for None).
+    'pm': 'i',
+    # Start of each tract's sections / lots / aliquots in the flat arrays.
+    'sec_offsets': 'Q',
+    'secs': 'i',
+    'lot_offsets': 'Q',
+    'lots': 'i',
+    'aliquot_offsets': 'Q',
+    # Index into the ``'aliquots'`` table.
+    'aliquots': 'I',
+    # Per tract: start and end of the Twp/Rge, section and description spans.
+    'spans': 'I',
+}
+# Per-tract columns with variable-length values: offsets --> values
+RAGGED_COLUMNS = {
+    'sec_offsets': 'secs',
+    'lot_offsets': 'lots',
+    'aliquot_offsets': 'aliquots',
+}
+SPANS_PER_TRACT = 6
+
+
+class _Storage:
+    """The buffer, columns and tables that datasets are views of."""
+
+    __slots__ = ('text', 'columns', 'tables', 'labeled')
+
+    def __init__(self, text, columns: dict, tables: dict, labeled: bool):
+        """
+        :param text: The UTF-8 buffer (any bytes-like object).
+        :param columns: ``{name: array or memoryview}`` for each of
+         ``TEXT_COLUMNS`` (and ``LABEL_COLUMNS``, if labeled).
+        :param tables: ``{'pm': [...], 'aliquots': [...]}`` (if labeled).
+        """
+        self.text = memoryview(text)
+        self.columns = columns
+        self.tables = tables
+        self.labeled = labeled
+
+    def __len__(self):
+        return len(self.columns['offsets']) - 1
+
+    def text_bytes(self, i: int):
+        offsets = self.columns['offsets']
+        return self.text[offsets[i]:offsets[i + 1]]
+
+    def row(self, i: int):
+        text = str(self.text_bytes(i), 'utf-8')
+        if not self.labeled:
+            return text
+        cols = self.columns
+        twps, nss, rges, ews, pms, spans = (cols[name] for name in ('twp', 'ns', 'rge', 'ew', 'pm', 'spans'))
+        sec_offsets, secs = cols['sec_offsets'], cols['secs']
+        lot_offsets, lots = cols['lot_offsets'], cols['lots']
+        aliquot_offsets, aliquots = cols['aliquot_offsets'], cols['aliquots']
+        pm_table = self.tables['pm']
+        aliquot_table = self.tables['aliquots']
+        tract_offsets = cols['tract_offsets']
+        tracts = []
+        for t in range(tract_offsets[i], tract_offsets[i + 1]):
+            twp, ns, rge, ew, pm = twps[t], nss[t], rges[t], ews[t], pms[t]
+            s = SPANS_PER_TRACT * t
+            tracts.append(Tract(
+                twp if twp >= 0 else None,
+                chr(ns) if ns else None,
+                rge if rge >= 0 else None,
+                chr(ew) if ew else None,
+                pm_table[pm] if pm >= 0 else None,
+                tuple(secs[sec_offsets[t]:sec_offsets[t + 1]]),
+                tuple(lots[lot_offsets[t]:lot_offsets[t + 1]]),
+                tuple(aliquot_table[a] for a in aliquots[aliquot_offsets[t]:aliquot_offsets[t + 1]]),
+                (spans[s], spans[s + 1]),
+                (spans[s + 2], spans[s + 3]),
+                (spans[s + 4], spans[s + 5]),
+            ))
+        return LabeledDescription(text, tuple(tracts))
+
+
+class _Builder:
+    """
+    Appends rows to new columns, to build a ``_Storage`` (or to write
+    out a piece at a time, with ``.drain()``).
+    """
+
+    def __init__(self, labeled: bool, tables: dict = None):
+        """
+        :param tables: The tables of the storage that rows will be
+         copied from (with ``.copy_row()``), if any.
+        """
+        self.labeled = labeled
+        self.text = bytearray()
+        names = {**TEXT_COLUMNS, **LABEL_COLUMNS} if labeled else TEXT_COLUMNS
+        self.columns = {name: array(typecode) for name, typecode in names.items()}
+        for name in names:
+            if name == 'offsets' or name == 'tract_offsets' or name in RAGGED_COLUMNS:
+                self.columns[name].append(0)
+        # Number of bytes of text (and of values in each column) drained so far.
+        self.text_base = 0
+        self.bases = dict.fromkeys(names, 0)
+        if tables is None:
+            tables = {'pm': [], 'aliquots': []} if labeled else {}
+        self.tables = {name: list(table) for name, table in tables.items()}
+        # value --> index, for each table
+        self._table_ids = {name: {value: i for i, value in enumerate(table)} for name, table in self.tables.items()}
+
+    def _table_id(self, name, value):
+        ids = self._table_ids[name]
+        i = ids.get(value)
+        if i is None:
+            i = ids[value] = len(ids)
+            self.tables[name].append(value)
+        return i
+
+    def add(self, row):
+        """Append a description string (or ``LabeledDescription``)."""
+        if self.labeled:
+            if not isinstance(row, LabeledDescription):
+                raise ValueError("Rows of a labeled dataset must be `LabeledDescription` objects")
+            self._add_tracts(row.tracts)
+            row = row.text
+        self.text += row.encode('utf-8')
+        self.columns['offsets'].append(self.text_base + len(self.text))
+
+    def _add_tracts(self, tracts):
+        cols = self.columns
+        bases = self.bases
+        secs, lots, aliquots = cols['secs'], cols['lots'], cols['aliquots']
+        for tract in tracts:
+            cols['twp'].append(-1 if tract.twp is None else tract.twp)
+            cols['ns'].append(ord(tract.ns) if tract.ns else 0)
+            cols['rge'].append(-1 if tract.rge is None else tract.rge)
+            cols['ew'].append(ord(tract.ew) if tract.ew else 0)
+            cols['pm'].append(-1 if tract.pm is None else self._table_id('pm', tract.pm))
+            secs.extend(tract.secs)
+            cols['sec_offsets'].append(bases['secs'] + len(secs))
+            lots.extend(tract.lots)
+            cols['lot_offsets'].append(bases['lots'] + len(lots))
+            aliquots.extend(self._table_id('aliquots', code) for code in tract.aliquots)
+            cols['aliquot_offsets'].append(bases['aliquots'] + len(aliquots))
+            cols['spans'].extend((*tract.twprge_span, *tract.sec_span, *tract.desc_span))
+        cols['tract_offsets'].append(bases['twp'] + len(cols['twp']))
+
+    def copy_row(self, storage: _Storage, i: int):
+        """
+        Append row ``i`` of the ``storage`` (whose tables this builder
+        was created with), without decoding it.
+        """
+        self.text += storage.text_bytes(i)
+        self.columns['offsets'].append(self.text_base + len(self.text))
+        if not self.labeled:
+            return
+        src = storage.columns
+        cols = self.columns
+        bases = self.bases
+        t0, t1 = src['tract_offsets'][i], src['tract_offsets'][i + 1]
+        for name in ('twp', 'ns', 'rge', 'ew', 'pm'):
+            cols[name].extend(src[name][t0:t1])
+        cols['spans'].extend(src['spans'][SPANS_PER_TRACT * t0:SPANS_PER_TRACT * t1])
+        for offsets_name, values_name in RAGGED_COLUMNS.items():
+            src_offsets = src[offsets_name]
+            values = cols[values_name]
+            offsets = cols[offsets_name]
+            base = bases[values_name]
+            for t in range(t0, t1):
+                values.extend(src[values_name][src_offsets[t]:src_offsets[t + 1]])
+                offsets.append(base + len(values))
+        cols['tract_offsets'].append(bases['twp'] + len(cols['twp']))
+
+    def drain(self):
+        """
+        Take the text and column values appended so far (e.g., to write
+        them out), and start new ones that continue the same offsets.
+        :return: A tuple of ``(text, {name: array})``.
+        """
+        text = self.text
+        columns = self.columns
+        self.text_base += len(text)
+        for name, column in columns.items():
+            self.bases[name] += len(column)
+        self.text = bytearray()
+        self.columns = {name: array(column.typecode) for name, column in columns.items()}
+        return text, columns
+
+    def build(self):
+        # (The buffer can no longer be resized once it is viewed.)
+        return _Storage(self.text, self.columns, self.tables, self.labeled)
+
+
+class ColumnarDataset(Sequence):
+    """
+    A sequence of descriptions (strings, or ``LabeledDescription``
+    objects) in columnar storage. Each row is decoded when it is
+    accessed.
+
+    Slices, ``.take()`` and ``.shuffle()`` are views of the same
+    storage, in which row ``i`` of the view is a row of the storage per
+    an index (a ``range``, or an array of row numbers). Use
+    ``.compact()`` to copy a view into its own contiguous storage.
+    """
+
+    def __init__(self, storage: _Storage, index=None):
+        """
+        (Use ``.from_rows()`` or ``.load()`` to create a dataset.)
+
+        :param storage: The storage.
+        :param index: The rows of the ``storage`` in this view (a
+         ``range``, or a ``memoryview`` of row numbers). Defaults to
+         all of them, in order.
+        """
+        if index is None:
+            index = range(len(storage))
+        self._storage = storage
+        self._index = index
+
+    @classmethod
+    def from_rows(cls, rows, labeled: bool = None):
+        """
+        Build a dataset from an iterable of description strings (or of
+        ``LabeledDescription`` objects).
+
+        :param labeled: Whether the rows are ``LabeledDescription``
+         objects. Defaults to whether the first row is.
+        """
+        rows = iter(rows)
+        first = next(rows, None)
+        if labeled is None:
+            labeled = isinstance(first, LabeledDescription)
+        builder = _Builder(labeled)
+        if first is not None:
+            builder.add(first)
+            for row in rows:
+                builder.add(row)
+        return cls(builder.build())
+
+    def __repr__(self):
+        kind = 'labeled ' if self.labeled else ''
+        return f"<ColumnarDataset of {len(self):,} {kind}rows>"
+
+    @property
+    def labeled(self):
+        return self._storage.labeled
+
+    def __len__(self):
+        return len(self._index)
+
+    def __getitem__(self, index):
+        """
+        Get row ``index``, or a view of the rows in a slice.
+        """
+        if isinstance(index, slice):
+            return ColumnarDataset(self._storage, self._index[index])
+        return self._storage.row(self._index[index])
+
+    def __iter__(self):
+        row = self._storage.row
+        for i in self._index:
+            yield row(i)
+
+    def text_bytes(self, index: int):
+        """Get the UTF-8 text of row ``index``, as a ``memoryview`` of the buffer."""
+        return self._storage.text_bytes(self._index[index])
+
+    def take(self, indices):
+        """
+        Get a view of the rows at ``indices`` (in that order).
+        """
+        index = self._index
+        return ColumnarDataset(self._storage, memoryview(array('Q', [index[i] for i in indices])))
+
+    def shuffle(self, seed=None):
+        """
+        Get a view of the rows in a random order.
+        :param seed: Seed for the permutation.
+        """
+        order = array('Q', self._index)
+        rand = random.Random(seed).random
+        # Fisher-Yates, in place in the array.
+        for i in range(len(order) - 1, 0, -1):
+            j = int(rand() * (i + 1))
+            order[i], order[j] = order[j], order[i]
+        return ColumnarDataset(self._storage, memoryview(order))
+
+    def compact(self):
+        """
+        Copy the rows of this view, in order, into a new dataset with
+        its own contiguous storage.
+        """
+        storage = self._storage
+        builder = _Builder(storage.labeled, storage.tables)
+        for i in self._index:
+            builder.copy_row(storage, i)
+        return ColumnarDataset(builder.build())
+
+    def _is_whole(self):
+        """Whether this view is all of its storage, in order."""
+        return self._index == range(len(self._storage))
+
+    @property
+    def nbytes(self):
+        """Bytes used by the buffer, columns and index (not counting shared storage twice)."""
+        storage = self._storage
+        total = storage.text.nbytes
+        for column in storage.columns.values():
+            total += len(column) * column.itemsize
+        if not isinstance(self._index, range):
+            total += self._index.nbytes
+        return total
+
+    def dump(self, path):
+        """
+        Write the rows of this dataset (in order) to a corpus file,
+        which ``.load()`` memory-maps (see ``dataset_gen.corpus``).
+        :return: The number of rows written.
+        """
+        from .corpus import CorpusWriter
+        storage = self._storage
+        with CorpusWriter(path, storage.labeled, storage.tables) as writer:
+            if self._is_whole():
+                writer.write_storage(storage)
+            else:
+                for i in self._index:
+                    writer.copy_row(storage, i)
+        return len(self)
+
+    @classmethod
+    def load(cls, path, use_mmap: bool = True):
+        """
+        Load a dataset from a corpus file (written by ``.dump()``, or by
+        ``dataset_gen.corpus.write_corpus()``).
+
+        :param use_mmap: If ``True``, memory-map the file (read-only)
+         instead of reading it into memory, so that rows are only read
+         from disk as they are accessed.
+        """
+        from .corpus import open_corpus
+        return open_corpus(path, use_mmap)
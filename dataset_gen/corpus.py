@@ -0,0 +1,259 @@
+"""
+A binary corpus format for generated datasets that are read many times
+(e.g., every epoch by a data loader): a file that is memory-mapped to
+read any row in O(1), or scanned front to back, without parsing CSV or
+JSON.
+
+A corpus file is::
+
+    header   ``HEADER``: magic, version, byte order, and where the footer is
+    text     The UTF-8 text of every row, back to back
+    columns  The columns of ``dataset_gen.columnar`` (``'offsets'``, plus
+             the label columns if labeled), each aligned to 8 bytes, in
+             the byte order of the machine that wrote them
+    footer   JSON: number of rows, where each column is, and the label tables
+
+``CorpusWriter`` streams the text to the file as rows arrive, and
+spills the columns to temporary files, so that memory use stays flat
+for a corpus of any size.
+
+Example:
+    with CorpusWriter('train.corpus', labeled=True) as writer:
+        writer.write_rows(generator.generate_many(100_000_000, labeled=True))
+    dataset = open_corpus('train.corpus')
+    row = dataset[12_345_678]
+"""
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+
+from .columnar import LABEL_COLUMNS, TEXT_COLUMNS, ColumnarDataset, _Builder, _Storage
+from .labels import LabeledDescription
+
+MAGIC = b'DGCORPUS'
+CORPUS_VERSION = 1
+# magic, version, big-endian, footer offset, footer length
+HEADER = struct.Struct('<8sHH4xQQ')
+ALIGNMENT = 8
+# Bytes of text to buffer before writing out (along with the columns).
+SPILL_BYTES = 16 << 20
+
+
+class CorpusWriter:
+    """
+    Writes rows to a corpus file as they are generated. Use as a
+    context manager (or call ``.close()``), which finishes the file.
+    """
+
+    def __init__(
+            self,
+            path,
+            labeled: bool = False,
+            tables: dict = None,
+            spill_bytes: int = SPILL_BYTES,
+            chunk_size: int = None,
+    ):
+        """
+        :param path: Output file path.
+        :param labeled: Whether the rows are ``LabeledDescription``
+         objects (whose labels are written too) or strings.
+        :param tables: (Internal) The label tables of a storage whose
+         rows will be copied.
+        :param spill_bytes: Bytes of text to buffer before writing out.
+        :param chunk_size: (Optional) Also write out every
+         ``chunk_size`` rows.
+        """
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("`chunk_size` must be >= 1")
+        self.path = path
+        self.labeled = labeled
+        self.spill_bytes = spill_bytes
+        self.chunk_size = chunk_size
+        self.rows = 0
+        # The number of rows at which to write out next.
+        self._next_drain = chunk_size
+        self._builder = _Builder(labeled, tables)
+        self._spills = {}
+        self._file = open(path, 'wb')
+        self._file.write(bytes(HEADER.size))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+
+    def write(self, row):
+        """Write a description string (or ``LabeledDescription``)."""
+        self._builder.add(row)
+        self.rows += 1
+        if len(self._builder.text) >= self.spill_bytes or self.rows == self._next_drain:
+            self._drain()
+
+    def write_rows(self, rows):
+        """
+        Write each of the ``rows``.
+        :return: The number of rows written.
+        """
+        builder = self._builder
+        spill_bytes = self.spill_bytes
+        start = self.rows
+        for row in rows:
+            builder.add(row)
+            self.rows += 1
+            if len(builder.text) >= spill_bytes or self.rows == self._next_drain:
+                self._drain()
+        return self.rows - start
+
+    def copy_row(self, storage: _Storage, i: int):
+        """Write row ``i`` of a ``_Storage`` (with the same tables), without decoding it."""
+        self._builder.copy_row(storage, i)
+        self.rows += 1
+        if len(self._builder.text) >= self.spill_bytes or self.rows == self._next_drain:
+            self._drain()
+
+    def write_storage(self, storage: _Storage):
+        """Write all the rows of a ``_Storage`` (with the same tables) at once, to an empty corpus."""
+        if self.rows:
+            raise ValueError("A whole storage can only be written to an empty corpus")
+        builder = self._builder
+        self._file.write(storage.text)
+        for name, column in storage.columns.items():
+            self._spill(name, column)
+        self.rows = len(storage)
+        if self.chunk_size is not None:
+            self._next_drain = self.rows + self.chunk_size
+        # Continue after its values (which include the leading offsets of 0).
+        builder.text_base = storage.text.nbytes
+        builder.bases = {name: len(column) for name, column in storage.columns.items()}
+        builder.columns = {name: array(column.typecode) for name, column in builder.columns.items()}
+
+    def _drain(self):
+        if self.chunk_size is not None:
+            self._next_drain = self.rows + self.chunk_size
+        text, columns = self._builder.drain()
+        self._file.write(text)
+        for name, column in columns.items():
+            self._spill(name, column)
+
+    def _spill(self, name, column):
+        spill = self._spills.get(name)
+        if spill is None:
+            spill = self._spills[name] = tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(self.path)))
+        spill.write(column)
+
+    def close(self):
+        """Write the columns and footer, and close the file."""
+        if self._file is None:
+            return
+        self._drain()
+        builder = self._builder
+        f = self._file
+        text_length = builder.text_base
+        meta_columns = {}
+        for name, typecode in ({**TEXT_COLUMNS, **LABEL_COLUMNS} if self.labeled else TEXT_COLUMNS).items():
+            _pad(f)
+            offset = f.tell()
+            spill = self._spills.pop(name)
+            spill.seek(0)
+            shutil.copyfileobj(spill, f)
+            spill.close()
+            itemsize = array(typecode).itemsize
+            meta_columns[name] = [typecode, itemsize, offset, (f.tell() - offset) // itemsize]
+        meta = {
+            'rows': self.rows,
+            'labeled': self.labeled,
+            'text': [HEADER.size, text_length],
+            'columns': meta_columns,
+            'tables': builder.tables,
+        }
+        footer = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+        footer_offset = f.tell()
+        f.write(footer)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, CORPUS_VERSION, sys.byteorder == 'big', footer_offset, len(footer)))
+        f.close()
+        self._file = None
+
+    def _discard(self):
+        """Close and delete the unfinished file."""
+        for spill in self._spills.values():
+            spill.close()
+        self._spills.clear()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            os.remove(self.path)
+
+
+def _pad(f):
+    """Pad the file to the next multiple of ``ALIGNMENT``."""
+    remainder = f.tell() % ALIGNMENT
+    if remainder:
+        f.write(bytes(ALIGNMENT - remainder))
+
+
+def write_corpus(rows, path, labeled: bool = None, chunk_size: int = None):
+    """
+    Write ``rows`` to a corpus file, as they are generated.
+
+    :param rows: An iterable of description strings or
+     ``LabeledDescription`` objects.
+    :param labeled: Whether the rows are ``LabeledDescription``
+     objects. Defaults to whether the first row is.
+    :param chunk_size: (Optional) Write out every ``chunk_size`` rows
+     (as well as every ``SPILL_BYTES`` of text).
+    :return: The number of rows written.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if labeled is None:
+        labeled = isinstance(first, LabeledDescription)
+    with CorpusWriter(path, labeled, chunk_size=chunk_size) as writer:
+        if first is not None:
+            writer.write(first)
+            writer.write_rows(rows)
+    return writer.rows
+
+
+def open_corpus(path, use_mmap: bool = True):
+    """
+    Open a corpus file as a ``ColumnarDataset``.
+
+    :param use_mmap: If ``True``, memory-map the file (read-only)
+     instead of reading it into memory, so that rows are only read from
+     disk as they are accessed.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a corpus file: {os.fspath(path)!r}")
+        _, version, big_endian, footer_offset, footer_length = HEADER.unpack(header)
+        if version != CORPUS_VERSION:
+            raise ValueError(f"Unsupported corpus version: {version}")
+        if big_endian != (sys.byteorder == 'big'):
+            raise ValueError("Corpus was written on a machine of the other byte order")
+        if use_mmap:
+            data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            f.seek(0)
+            data = memoryview(f.read())
+    meta = json.loads(str(data[footer_offset:footer_offset + footer_length], 'utf-8'))
+    text_offset, text_length = meta['text']
+    columns = {}
+    for name, (typecode, itemsize, offset, count) in meta['columns'].items():
+        if array(typecode).itemsize != itemsize:
+            raise ValueError(
+                f"Column {name!r} has items of {itemsize} bytes, but {typecode!r} is {array(typecode).itemsize} here")
+        columns[name] = data[offset:offset + count * itemsize].cast(typecode)
+    storage = _Storage(data[text_offset:text_offset + text_length], columns, meta['tables'], meta['labeled'])
+    return ColumnarDataset(storage)
@@ -1,21 +1,24 @@
-
 """
 Simulate PLSS land descriptions, optionally with intentional errors.
 """
 
 import random
+import re
+from functools import lru_cache, partial
+from itertools import accumulate, combinations, permutations
+from math import comb, log
 
-from ._lorem_ipsum import LOREM_IPSUM
-LOREM_IPSUM = LOREM_IPSUM.split()
+from ._weighted import WeightedDict
+from .labels import LabeledDescription, Tract
 
 # All floats are weights (out of 1.0) of how common they should appear.
 # (Approximates how commonly I see them in real data, or how I want to skew the dataset.)
 
-PM = {
+PM = WeightedDict({
     'principal meridian': 0.8,
     'p.m.': 1.0,
     'pm': 0.2,
-}
+})
 # Reference: https://en.wikipedia.org/wiki/List_of_principal_and_guide_meridians_and_base_lines_of_the_United_States
 PM_IDS = [
     '1st',
@@ -72,7 +75,7 @@ PM_IDS = [
     'washington',
     'wind river',
 ]
-TOWNSHIP = {
+TOWNSHIP = WeightedDict({
     'township': 1.0,
     'twp': 1.0,
     'twp.': 0.7,
@@ -80,8 +83,8 @@ TOWNSHIP = {
     't': 0.7,
     't.': 0.4,
     '': 0.1,
-}
-RANGE = {
+})
+RANGE = WeightedDict({
     'range': 1.0,
     'rnge': 0.02,
     'rng': 0.05,
@@ -90,7 +93,7 @@ RANGE = {
     'r': 0.7,
     'r.': 0.4,
     '': 0.1,
-}
+})
 TWPRGE_REQUIRE_SPACE = [
     'township',
     'twp',
@@ -102,20 +105,20 @@ TWPRGE_REQUIRE_SPACE = [
     'rge',
     'rge.'
 ]
-SECTION = {
+SECTION = WeightedDict({
     'section': 1.0,
     'sec': 1.0,
     'sec.': 0.3,
     'sect': 0.02,
     'sect.': 0.01,
     '§': 0.02,
-}
-LOT = {
+})
+LOT = WeightedDict({
     'lot': 1.0,
     # 'governmental lot': 0.04,
     'l': 0.2,
     'l.': 0.03
-}
+})
 SECTION_LOT_NOSPACE_OK = [
     '§',
     'l',
@@ -130,126 +133,103 @@ PLURAL_DISALLOWED = [
     'sec.',
     'sect.',
 ]
-NORTH_WORD = {
+NORTH_WORD = WeightedDict({
     'north': 1.0,
-}
-SOUTH_WORD = {
+})
+SOUTH_WORD = WeightedDict({
     'south': 1.0,
-}
-EAST_WORD = {
+})
+EAST_WORD = WeightedDict({
     'east': 1.0,
-}
-WEST_WORD = {
+})
+WEST_WORD = WeightedDict({
     'west': 1.0,
-}
-NORTH_ABBREV = {
+})
+NORTH_ABBREV = WeightedDict({
     'n': 0.8,
-}
-SOUTH_ABBREV = {
+})
+SOUTH_ABBREV = WeightedDict({
     's': 0.8,
-}
-EAST_ABBREV = {
+})
+EAST_ABBREV = WeightedDict({
     'e': 0.8,
-}
-WEST_ABBREV = {
+})
+WEST_ABBREV = WeightedDict({
     'w': 0.8,
-}
+})
 
-NORTH = {}
-NORTH.update(NORTH_WORD)
-NORTH.update(NORTH_ABBREV)
-SOUTH = {}
-SOUTH.update(SOUTH_WORD)
-SOUTH.update(SOUTH_ABBREV)
-EAST = {}
-EAST.update(EAST_WORD)
-EAST.update(EAST_ABBREV)
-WEST = {}
-WEST.update(WEST_WORD)
-WEST.update(WEST_ABBREV)
-
-NORTHEAST_WORD = {
+NORTHEAST_WORD = WeightedDict({
     'northeast': 1.0,
     # 'north-east': 0.05,
     'north east': 1.0,
-}
-NORTHWEST_WORD = {
+})
+NORTHWEST_WORD = WeightedDict({
     'northwest': 1.0,
     # 'north-west': 0.05,
     'north west': 1.0,
-}
-SOUTHEAST_WORD = {
+})
+SOUTHEAST_WORD = WeightedDict({
     'southeast': 1.0,
     # 'south-east': 0.05,
     'south east': 1.0,
-}
-SOUTHWEST_WORD = {
+})
+SOUTHWEST_WORD = WeightedDict({
     'southwest': 1.0,
     # 'south-west': 0.05,
     'south west': 1.0,
-}
-NORTHEAST_ABBREV = {
+})
+NORTHEAST_ABBREV = WeightedDict({
     'ne': 1.0,
     # 'n.e.': 0.02,
-}
-NORTHWEST_ABBREV = {
+})
+NORTHWEST_ABBREV = WeightedDict({
     'nw': 1.0,
     # 'n.w.': 0.02,
-}
-SOUTHEAST_ABBREV = {
+})
+SOUTHEAST_ABBREV = WeightedDict({
     'se': 1.0,
     # 's.e.': 0.02,
-}
-SOUTHWEST_ABBREV = {
+})
+SOUTHWEST_ABBREV = WeightedDict({
     'sw': 1.0,
     # 's.w.': 0.02,
-}
+})
 ALIQUOT_HALVES_WORD = [NORTH_WORD, SOUTH_WORD, EAST_WORD, WEST_WORD]
 ALIQUOT_HALVES_ABBREV = [NORTH_ABBREV, SOUTH_ABBREV, EAST_ABBREV, WEST_ABBREV]
-ALIQUOT_HALF_ELEMENTS = []
-for d in ALIQUOT_HALVES_WORD:
-    ALIQUOT_HALF_ELEMENTS.extend(d.keys())
-for d in ALIQUOT_HALVES_ABBREV:
-    ALIQUOT_HALF_ELEMENTS.extend(d.keys())
 
 ALIQUOT_QUARTERS_WORD = [NORTHEAST_WORD, NORTHWEST_WORD, SOUTHEAST_WORD, SOUTHWEST_WORD]
 ALIQUOT_QUARTERS_ABBREV = [NORTHEAST_ABBREV, NORTHWEST_ABBREV, SOUTHEAST_ABBREV, SOUTHWEST_ABBREV]
-ALIQUOT_QUARTER_ELEMENTS = []
-for d in ALIQUOT_QUARTERS_WORD:
-    ALIQUOT_QUARTER_ELEMENTS.extend(d.keys())
-for d in ALIQUOT_QUARTERS_ABBREV:
-    ALIQUOT_QUARTER_ELEMENTS.extend(d.keys())
 
 NS_COMPATIBLE_WORD = [NORTH_WORD, SOUTH_WORD]
 NS_COMPATIBLE_ABBREV = [NORTH_ABBREV, SOUTH_ABBREV]
 EW_COMPATIBLE_WORD = [EAST_WORD, WEST_WORD]
 EW_COMPATIBLE_ABBREV = [EAST_ABBREV, WEST_ABBREV]
 
-HALF_WORD = {
+HALF_WORD = WeightedDict({
     'half': 1.0,
     'one half': 0.1,
     '1/2': 0.4,  # compatible with un-abbreviated halves (e.g., "north 1/2")
-}
-HALF_FRAC = {
+})
+HALF_FRAC = WeightedDict({
     ' 1/2': 0.4,
     '1/2': 0.3,
     '/2': 0.8,
     '2': 0.8,
     '½': 0.8,
-}
-QUARTER_WORD = {
+})
+QUARTER_WORD = WeightedDict({
     'quarter': 1.0,
     'qrtr': 0.02,
     '1/4': 0.4,  # compatible with unabbreviated quarters (e.g., "northeast 1/4")
-}
-QUARTER_FRAC = {
+})
+QUARTER_FRAC = WeightedDict({
     ' 1/4': 0.4,
     '1/4': 0.3,
     '/4': 0.8,
     '4': 0.8,
     '¼': 0.8,
     # '': 0.1,  # 'clean_qq' config
-}
+})
 UNABBREVIATED_ILLEGAL_FRACS = [
     '2',
     '/2',
@@ -257,21 +237,21 @@ UNABBREVIATED_ILLEGAL_FRACS = [
     '/4',
 ]
 # N/2 of the NE/4
-OF_THE = {
+OF_THE = WeightedDict({
     '': 0.9,
     ' ': 0.1,
     ' of ': 0.03,
     ' of the ': 0.08,
-}
+})
 OF_THE_BLANK = [
     '', ' ',
 ]
 OF_THE_BLANK_DISALLOWED = [
     'half', 'qrtr', 'quarter'
 ]
-ALL = {
+ALL = WeightedDict({
     'all': 1.0,
-}
+})
 MB_MARKERS = [
     'of the',
     'in the',
@@ -311,18 +291,18 @@ MB_MARKERS = [
     'strip',
     'formerly',
 ]
-THROUGH = {
+THROUGH = WeightedDict({
     'through': 0.4,
     'thru': 0.1,
     '-': 1.0,
     '–': 1.0,
     '—': 0.1,
-}
-AND = {
+})
+AND = WeightedDict({
     'and': 1.0,
     '&': 0.2,
     '+': 0.003,
-}
+})
 REQUIRE_SPACE = [
     'through',
     'thru',
@@ -330,19 +310,19 @@ REQUIRE_SPACE = [
     '&',
     '+'
 ]
-QQ_COMMA = {
+QQ_COMMA = WeightedDict({
     ', ': 1.0,
     '; ': 0.02,
     ' and ': 0.02,
     ' & ': 0.005,
-}
-MULTISEC_COMMA = {
+})
+MULTISEC_COMMA = WeightedDict({
     ', ': 0.2,
     '; ': 0.02,
     ' and ': 1.0,
     ' & ': 0.4,
-}
-DESC_STR_OF_THE = {
+})
+DESC_STR_OF_THE = WeightedDict({
     'of': 1.0,
     'in': 0.8,
     'all in': 0.6,
@@ -351,8 +331,664 @@ DESC_STR_OF_THE = {
     'all lying in': 0.03,
     ',': 0.5,
     ';': 0.1,
+})
+
+# Layout name --> name of the ``DatasetGenerator`` method that generates it.
+LAYOUTS = {
+    'TRS_desc': 'gen_trs_desc',
+    'TR_desc_S': 'gen_tr_desc_s',
+    'desc_STR': 'gen_desc_str',
+    'S_desc_TR': 'gen_s_desc_tr',
 }
 
+# States of the aliquot grammar (see ``AliquotGrammar``).
+ALIQUOT_START = 0       # Any half, any quarter, or "ALL".
+ALIQUOT_NS = 1          # "North/South Half" or any quarter.
+ALIQUOT_EW = 2          # "East/West Half" or any quarter.
+ALIQUOT_QUARTERS = 3    # Any quarter (once a quarter is used, no more halves).
+ALIQUOT_CONTINUE = 4    # Any half or quarter (start of another aliquot, after the first).
+
+
+class AliquotGrammar:
+    """
+    The legal sequences of aliquot components for one abbreviation
+    mode of ``DatasetGenerator.gen_desc_qq()``, compiled into
+    transition tables.
+
+    ``.transitions[state]`` is a tuple of ``(group, next_state, is_half)``
+    for each aliquot group that may be chosen (with equal probability)
+    in that state, where ``group`` is the ``WeightedDict`` of elements
+    to draw from. (``ALL`` has a ``next_state`` of ``None``.)
+    """
+
+    __slots__ = ('quarter_fracs', 'half_fracs', 'no_blank_of_the', 'transitions')
+
+    def __init__(
+            self,
+            halves,
+            quarters,
+            ns_compatible,
+            ew_compatible,
+            quarter_fracs,
+            half_fracs,
+            spaced,
+            all_group=ALL,
+            of_the_blank_disallowed=OF_THE_BLANK_DISALLOWED,
+    ):
+        """
+        :param halves: The half groups (e.g., ``ALIQUOT_HALVES_WORD``).
+        :param quarters: The quarter groups.
+        :param ns_compatible: The North/South half groups.
+        :param ew_compatible: The East/West half groups.
+        :param quarter_fracs: The ``WeightedDict`` of quarter fractions.
+        :param half_fracs: The ``WeightedDict`` of half fractions.
+        :param spaced: Whether to put a space before the fractions
+         (i.e., for un-abbreviated words).
+        :param all_group: The ``WeightedDict`` for "ALL".
+        :param of_the_blank_disallowed: Fractions that may not be
+         joined by a blank "of the" (see ``OF_THE_BLANK_DISALLOWED``).
+        """
+        prefix = ' ' if spaced else ''
+        self.quarter_fracs = WeightedDict({prefix + k: v for k, v in quarter_fracs.items()})
+        self.half_fracs = WeightedDict({prefix + k: v for k, v in half_fracs.items()})
+        # (half, quarter) fraction pairs that may not be joined by a blank "of the".
+        self.no_blank_of_the = frozenset(
+            (half_wd, quarter_wd)
+            for half_wd in self.half_fracs
+            for quarter_wd in self.quarter_fracs
+            if half_wd in of_the_blank_disallowed and quarter_wd in of_the_blank_disallowed
+        )
+
+        def options(groups):
+            opts = []
+            for group in groups:
+                if any(group is q for q in quarters):
+                    # Once a quarter is used, halves are no longer allowed.
+                    opts.append((group, ALIQUOT_QUARTERS, False))
+                elif any(group is ns for ns in ns_compatible):
+                    # Do not cross "East/West Half" with "North/South Half"
+                    opts.append((group, ALIQUOT_NS, True))
+                elif any(group is ew for ew in ew_compatible):
+                    opts.append((group, ALIQUOT_EW, True))
+            return tuple(opts)
+
+        self.transitions = (
+            options(halves + quarters) + ((all_group, None, None),),
+            options(ns_compatible + quarters),
+            options(ew_compatible + quarters),
+            options(quarters),
+            options(halves + quarters),
+        )
+
+
+# The vocabularies that make up a ``Vocabulary``: those of
+# ``{element: weight}``, and those that are lists of elements.
+WEIGHTED_VOCABULARIES = (
+    'PM',
+    'TOWNSHIP',
+    'RANGE',
+    'SECTION',
+    'LOT',
+    'NORTH_WORD',
+    'SOUTH_WORD',
+    'EAST_WORD',
+    'WEST_WORD',
+    'NORTH_ABBREV',
+    'SOUTH_ABBREV',
+    'EAST_ABBREV',
+    'WEST_ABBREV',
+    'NORTHEAST_WORD',
+    'NORTHWEST_WORD',
+    'SOUTHEAST_WORD',
+    'SOUTHWEST_WORD',
+    'NORTHEAST_ABBREV',
+    'NORTHWEST_ABBREV',
+    'SOUTHEAST_ABBREV',
+    'SOUTHWEST_ABBREV',
+    'HALF_WORD',
+    'HALF_FRAC',
+    'QUARTER_WORD',
+    'QUARTER_FRAC',
+    'OF_THE',
+    'ALL',
+    'THROUGH',
+    'QQ_COMMA',
+    'MULTISEC_COMMA',
+    'DESC_STR_OF_THE',
+)
+LIST_VOCABULARIES = (
+    'PM_IDS',
+    'TWPRGE_REQUIRE_SPACE',
+    'SECTION_LOT_NOSPACE_OK',
+    'PLURAL_DISALLOWED',
+    'OF_THE_BLANK',
+    'OF_THE_BLANK_DISALLOWED',
+    'REQUIRE_SPACE',
+)
+
+
+class Vocabulary:
+    """
+    A complete, validated set of the vocabularies that a
+    ``DatasetGenerator`` draws from (see ``WEIGHTED_VOCABULARIES`` and
+    ``LIST_VOCABULARIES``), compiled into sampler tables. Each is an
+    attribute of the same name as the module-level default (e.g.,
+    ``.TOWNSHIP``).
+
+    Also compiles the vocabularies derived from them: ``.NORTH``,
+    ``.SOUTH``, ``.EAST``, ``.WEST``, ``.OF_THE_NONBLANK``,
+    ``.ALIQUOT_CODES`` and ``.ALIQUOT_GRAMMARS``.
+
+    To load one from a JSON or TOML file, see
+    ``dataset_gen.vocab.load_vocabulary()``.
+    """
+
+    def __init__(self, **vocabularies):
+        """
+        :param vocabularies: Every vocabulary, by name. Weighted
+         vocabularies are dicts of ``{element: weight}``; the others
+         are lists of elements.
+        """
+        missing = [name for name in WEIGHTED_VOCABULARIES + LIST_VOCABULARIES if name not in vocabularies]
+        if missing:
+            raise ValueError(f"Missing vocabularies: {', '.join(missing)}")
+        _check_vocabulary_names(vocabularies)
+        for name in WEIGHTED_VOCABULARIES:
+            setattr(self, name, _check_weighted(name, vocabularies[name]))
+        for name in LIST_VOCABULARIES:
+            setattr(self, name, _check_list(name, vocabularies[name]))
+        if not self.PM_IDS:
+            raise ValueError("Vocabulary 'PM_IDS' must not be empty")
+        self._compile()
+
+    def __repr__(self):
+        return f"<Vocabulary of {len(WEIGHTED_VOCABULARIES) + len(LIST_VOCABULARIES)} vocabularies>"
+
+    @classmethod
+    def from_dict(cls, vocabularies: dict, base=None):
+        """
+        Create a ``Vocabulary`` from a dict of vocabularies by name,
+        with any that are not specified taken from ``base``.
+
+        :param vocabularies: A dict of ``{name: vocabulary}``.
+        :param base: The ``Vocabulary`` to fill in from. Defaults to
+         ``DEFAULT_VOCABULARY``.
+        """
+        _check_vocabulary_names(vocabularies)
+        if base is None:
+            base = _default_vocabulary()
+        merged = base.to_dict()
+        merged.update(vocabularies)
+        return cls(**merged)
+
+    def to_dict(self):
+        """
+        Get the vocabularies (but not those derived from them) as a dict
+        of ``{name: vocabulary}``, with weighted vocabularies as
+        ``WeightedDict`` and the others as lists.
+        """
+        vocabularies = {name: getattr(self, name) for name in WEIGHTED_VOCABULARIES}
+        for name in LIST_VOCABULARIES:
+            vocabularies[name] = list(getattr(self, name))
+        return vocabularies
+
+    def _compile(self):
+        """Build the derived vocabularies and compile all sampler tables."""
+        self.NORTH = WeightedDict({**self.NORTH_WORD, **self.NORTH_ABBREV})
+        self.SOUTH = WeightedDict({**self.SOUTH_WORD, **self.SOUTH_ABBREV})
+        self.EAST = WeightedDict({**self.EAST_WORD, **self.EAST_ABBREV})
+        self.WEST = WeightedDict({**self.WEST_WORD, **self.WEST_ABBREV})
+        self.OF_THE_NONBLANK = WeightedDict(
+            {k: v for k, v in self.OF_THE.items() if k not in self.OF_THE_BLANK})
+        if not self.OF_THE_NONBLANK:
+            raise ValueError("Vocabulary 'OF_THE' must have an element that is not in 'OF_THE_BLANK'")
+
+        halves_word = [self.NORTH_WORD, self.SOUTH_WORD, self.EAST_WORD, self.WEST_WORD]
+        halves_abbrev = [self.NORTH_ABBREV, self.SOUTH_ABBREV, self.EAST_ABBREV, self.WEST_ABBREV]
+        quarters_word = [self.NORTHEAST_WORD, self.NORTHWEST_WORD, self.SOUTHEAST_WORD, self.SOUTHWEST_WORD]
+        quarters_abbrev = [
+            self.NORTHEAST_ABBREV, self.NORTHWEST_ABBREV, self.SOUTHEAST_ABBREV, self.SOUTHWEST_ABBREV]
+
+        # Canonical code of each aliquot element, for labels. A description's
+        # code is those of its components, in order (e.g., "N/2 of the NE/4" is 'N2NE').
+        self.ALIQUOT_CODES = {element: 'ALL' for element in self.ALL}
+        for codes, groups in (
+                (('N2', 'S2', 'E2', 'W2'), (halves_word, halves_abbrev)),
+                (('NE', 'NW', 'SE', 'SW'), (quarters_word, quarters_abbrev)),
+        ):
+            for group in groups:
+                for code, d in zip(codes, group):
+                    for element in d:
+                        if self.ALIQUOT_CODES.setdefault(element, code) != code:
+                            raise ValueError(f"Aliquot element {element!r} is in more than one direction")
+
+        grammar_kwargs = {
+            'all_group': self.ALL,
+            'of_the_blank_disallowed': self.OF_THE_BLANK_DISALLOWED,
+        }
+        abbrev = AliquotGrammar(
+            halves_abbrev, quarters_abbrev, halves_abbrev[:2], halves_abbrev[2:],
+            self.QUARTER_FRAC, self.HALF_FRAC, spaced=False, **grammar_kwargs)
+        # (abbrev_words, abbrev_frac) --> ``AliquotGrammar``
+        self.ALIQUOT_GRAMMARS = {
+            (False, False): AliquotGrammar(
+                halves_word, quarters_word, halves_word[:2], halves_word[2:],
+                self.QUARTER_WORD, self.HALF_WORD, spaced=True, **grammar_kwargs),
+            (True, False): abbrev,
+            (True, True): abbrev,
+        }
+        for value in vars(self).values():
+            if isinstance(value, WeightedDict):
+                value.compile()
+        for grammar in self.ALIQUOT_GRAMMARS.values():
+            grammar.quarter_fracs.compile()
+            grammar.half_fracs.compile()
+
+
+def _check_vocabulary_names(vocabularies: dict):
+    unknown = [name for name in vocabularies if name not in WEIGHTED_VOCABULARIES + LIST_VOCABULARIES]
+    if unknown:
+        raise ValueError(f"Unknown vocabularies: {', '.join(map(str, unknown))}")
+
+
+def _check_weighted(name, vocabulary):
+    """Validate a weighted vocabulary, and get it as a ``WeightedDict``."""
+    if not isinstance(vocabulary, dict):
+        raise ValueError(f"Vocabulary {name!r} must be a mapping of {{element: weight}}")
+    if not vocabulary:
+        raise ValueError(f"Vocabulary {name!r} must not be empty")
+    for element, weight in vocabulary.items():
+        if not isinstance(element, str):
+            raise ValueError(f"Vocabulary {name!r} has a non-string element: {element!r}")
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or not 0 <= weight < float('inf'):
+            raise ValueError(f"Vocabulary {name!r} has an invalid weight for {element!r}: {weight!r}")
+    if not sum(vocabulary.values()) > 0:
+        raise ValueError(f"Vocabulary {name!r} must have a positive total weight")
+    if isinstance(vocabulary, WeightedDict):
+        return vocabulary
+    return WeightedDict(vocabulary)
+
+
+def _check_list(name, vocabulary):
+    """Validate a list vocabulary, and get it as a tuple."""
+    if not isinstance(vocabulary, (list, tuple)):
+        raise ValueError(f"Vocabulary {name!r} must be a list of elements")
+    for element in vocabulary:
+        if not isinstance(element, str):
+            raise ValueError(f"Vocabulary {name!r} has a non-string element: {element!r}")
+    return tuple(vocabulary)
+
+
+def _default_vocabulary():
+    """
+    The vocabularies defined in this module (``DEFAULT_VOCABULARY``),
+    which generators use by default. Compiled on first use.
+    """
+    vocab = globals().get('DEFAULT_VOCABULARY')
+    if vocab is None:
+        vocab = Vocabulary(**{name: globals()[name] for name in WEIGHTED_VOCABULARIES + LIST_VOCABULARIES})
+        vocab = globals().setdefault('DEFAULT_VOCABULARY', vocab)
+    return vocab
+
+
+def _lorem_ipsum():
+    from ._lorem_ipsum import LOREM_IPSUM
+    return LOREM_IPSUM.split()
+
+
+def _elements(groups):
+    return [element for group in groups for element in group]
+
+
+# Module attributes that are only built when first accessed, so that
+# importing the module (e.g., in each worker process) stays cheap.
+# name --> function to build it
+_LAZY_ATTRIBUTES = {
+    'DEFAULT_VOCABULARY': _default_vocabulary,
+    'NORTH': lambda: _default_vocabulary().NORTH,
+    'SOUTH': lambda: _default_vocabulary().SOUTH,
+    'EAST': lambda: _default_vocabulary().EAST,
+    'WEST': lambda: _default_vocabulary().WEST,
+    'ALIQUOT_CODES': lambda: _default_vocabulary().ALIQUOT_CODES,
+    'OF_THE_NONBLANK': lambda: _default_vocabulary().OF_THE_NONBLANK,
+    'ALIQUOT_GRAMMARS': lambda: _default_vocabulary().ALIQUOT_GRAMMARS,
+    'ALIQUOT_HALF_ELEMENTS': lambda: _elements(ALIQUOT_HALVES_WORD + ALIQUOT_HALVES_ABBREV),
+    'ALIQUOT_QUARTER_ELEMENTS': lambda: _elements(ALIQUOT_QUARTERS_WORD + ALIQUOT_QUARTERS_ABBREV),
+    'LOREM_IPSUM': _lorem_ipsum,
+}
+
+
+def __getattr__(name):
+    build = _LAZY_ATTRIBUTES.get(name)
+    if build is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return globals().setdefault(name, build())
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+# Fields of a layout template.
+LAYOUT_TWPRGE = 'TR'
+LAYOUT_SEC = 'S'
+LAYOUT_DESC = 'desc'
+# Layout template draws --> name of the vocabulary drawn from (once per description).
+LAYOUT_DRAWS = {
+    'of_the': 'DESC_STR_OF_THE',
+}
+_LAYOUT_TEMPLATE_FIELD = re.compile(r'{(\w*)}')
+# Between Twp/Rge blocks, and between the sections in each block.
+LAYOUT_SEPARATOR = ', '
+
+
+class LayoutTemplate:
+    """
+    A description layout, compiled once from a template into a flat
+    sequence of slots for ``DatasetGenerator`` to fill.
+
+    The template is written for a single Twp/Rge, with the part that is
+    repeated for each of its sections in ``[...]``. Fields are
+    ``{TR}`` (the Twp/Rge), ``{S}`` (the section or multi-section) and
+    ``{desc}`` (the lots/aliquots), plus ``{of_the}`` for a word drawn
+    from ``DESC_STR_OF_THE`` (see ``LAYOUT_DRAWS``). Everything else is
+    literal text. For example, the ``'desc_STR'`` layout is::
+
+        '[{desc} {of_the} {S}] {of_the} {TR}'
+
+    Each draw field is drawn once per description. Repeated sections and
+    Twp/Rge blocks are separated by ``LAYOUT_SEPARATOR``.
+
+    Each Twp/Rge block compiles to ``L0 {TR} L1 [...] L2`` (or
+    ``L0 [...] L1 {TR} L2``), and each section to ``U0 F1 U1 F2 U2``
+    (where ``F1`` and ``F2`` are ``{S}`` and ``{desc}``, in either
+    order), with the literal text (and draws) in ``.literals``.
+    """
+
+    __slots__ = ('template', 'twprge_first', 'sec_first', 'literals', 'draws', '_binders', '_unbound')
+
+    def __init__(self, template: str):
+        """
+        :param template: The layout template. It must contain exactly
+         one ``[...]`` part, with one ``{S}`` and one ``{desc}`` in it
+         and one ``{TR}`` outside it.
+        """
+        self.template = template
+        if template.count('[') != 1 or template.count(']') != 1 or template.index('[') > template.index(']'):
+            raise ValueError(f"Layout template must contain exactly one '[...]' part: {template!r}")
+        head, rest = template.split('[')
+        unit, tail = rest.split(']')
+        draws = []
+        head = self._compile(head, draws)
+        unit = self._compile(unit, draws)
+        tail = self._compile(tail, draws)
+        # The name of the vocabulary for each draw, in the order they are drawn.
+        self.draws = tuple(draws)
+        if (head + tail).count(LAYOUT_TWPRGE) != 1 or len(head) + len(tail) != 4:
+            raise ValueError(f"Layout template must have one {{TR}}, outside the '[...]': {template!r}")
+        if tuple(unit[1::2]) not in ((LAYOUT_SEC, LAYOUT_DESC), (LAYOUT_DESC, LAYOUT_SEC)):
+            raise ValueError(f"Layout template must have one {{S}} and one {{desc}}, inside the '[...]': {template!r}")
+        self.twprge_first = len(head) == 3
+        self.sec_first = unit[1] == LAYOUT_SEC
+        if self.twprge_first:
+            outer = (head[0], head[2], tail[0])
+        else:
+            outer = (head[0], tail[0], tail[2])
+        self.literals = (*outer, unit[0], unit[2], unit[4])
+        # ``(index, prefix, vocab_name, suffix)`` for each draw, in the order
+        # they are drawn, where ``prefix`` and ``suffix`` are the text
+        # around the draw in that literal (up to the next draw).
+        binders = []
+        for i, literal in enumerate(self.literals):
+            pieces = _LAYOUT_TEMPLATE_FIELD.split(literal)
+            for k in range(1, len(pieces), 2):
+                prefix = pieces[k - 1] if k == 1 else ''
+                binders.append((int(pieces[k]), i, prefix, draws[int(pieces[k])], pieces[k + 1]))
+        binders.sort(key=lambda binder: binder[0])
+        self._binders = tuple(binder[1:] for binder in binders)
+        # The literals, with those that contain draws left empty to fill.
+        self._unbound = tuple('' if '{' in literal else literal for literal in self.literals)
+
+    def __repr__(self):
+        return f"LayoutTemplate({self.template!r})"
+
+    def __reduce__(self):
+        return LayoutTemplate, (self.template,)
+
+    @staticmethod
+    def _compile(text: str, draws: list):
+        """
+        Compile part of a template into a list that alternates literal
+        text and fields, starting and ending with literal text. Draws
+        are left in the literal text as ``str.format()`` fields,
+        numbered by their index in ``draws``.
+        """
+        out = []
+        literal = []
+        pos = 0
+        for match in _LAYOUT_TEMPLATE_FIELD.finditer(text):
+            literal.append(text[pos:match.start()])
+            pos = match.end()
+            name = match.group(1)
+            if name in LAYOUT_DRAWS:
+                literal.append(f"{{{len(draws)}}}")
+                draws.append(LAYOUT_DRAWS[name])
+            elif name in (LAYOUT_TWPRGE, LAYOUT_SEC, LAYOUT_DESC):
+                out.append(''.join(literal))
+                out.append(name)
+                literal = []
+            else:
+                raise ValueError(f"Unknown layout template field {{{name}}}")
+        literal.append(text[pos:])
+        out.append(''.join(literal))
+        for literal in out[::2]:
+            literal = _LAYOUT_TEMPLATE_FIELD.sub('', literal)
+            if '{' in literal or '}' in literal:
+                raise ValueError(f"Unmatched brace in layout template: {text!r}")
+        return out
+
+    def bind(self, choose_weighted, vocab):
+        """
+        Make this description's draws (with ``choose_weighted``, from
+        the ``Vocabulary``) and fill them into the literal text.
+        :return: The six literals ``(L0, L1, L2, U0, U1, U2)``.
+        """
+        binders = self._binders
+        if not binders:
+            return self.literals
+        literals = list(self._unbound)
+        for i, prefix, vocab_name, suffix in binders:
+            literals[i] += prefix + choose_weighted(getattr(vocab, vocab_name)) + suffix
+        return literals
+
+
+# Layout name --> ``LayoutTemplate``. (Add more with ``register_layout()``.)
+LAYOUT_TEMPLATES = {
+    'TRS_desc': LayoutTemplate('{TR}, [{S}: {desc}]'),
+    'TR_desc_S': LayoutTemplate('{TR}, [{desc} {of_the} {S}]'),
+    'desc_STR': LayoutTemplate('[{desc} {of_the} {S}] {of_the} {TR}'),
+    'S_desc_TR': LayoutTemplate('[{S}: {desc}] {of_the} {TR}'),
+}
+
+
+def register_layout(name: str, template):
+    """
+    Add a user-defined layout, which may then be used by name anywhere a
+    built-in layout can. (To use it in worker processes started with
+    ``'spawn'``, pass the ``LayoutTemplate`` itself instead of its name.)
+
+    :param name: Name of the layout.
+    :param template: A template string (see ``LayoutTemplate``) or a
+     compiled ``LayoutTemplate``.
+    :return: The ``LayoutTemplate``.
+    """
+    if name in LAYOUT_TEMPLATES:
+        raise ValueError(f"Layout {name!r} already exists")
+    if not isinstance(template, LayoutTemplate):
+        template = LayoutTemplate(template)
+    LAYOUT_TEMPLATES[name] = template
+    return template
+
+
+def _resolve_layout(layout):
+    """Get the ``LayoutTemplate`` for a layout name (or template)."""
+    if isinstance(layout, LayoutTemplate):
+        return layout
+    try:
+        return LAYOUT_TEMPLATES[layout]
+    except (KeyError, TypeError):
+        raise ValueError(f"Unknown layout {layout!r}")
+
+
+def _resolve_layouts(layouts):
+    """
+    Get the ``LayoutTemplate`` for each of a combination of layouts
+    (or a list of one, for a single layout).
+    """
+    if isinstance(layouts, (str, LayoutTemplate)):
+        layouts = [layouts]
+    return [_resolve_layout(layout) for layout in layouts]
+
+
+def _resolve_backend(backend: str):
+    """
+    Check the requested ``backend``, resolving ``'auto'`` to
+    ``'numpy'`` if NumPy is installed, else ``'python'``.
+    """
+    if backend not in ('python', 'numpy', 'auto'):
+        raise ValueError(f"Unknown backend {backend!r}")
+    if backend == 'python':
+        return backend
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        if backend == 'numpy':
+            raise ImportError("The 'numpy' backend requires NumPy (`pip install numpy`)")
+        return 'python'
+    return 'numpy'
+
+
+def _resolve_vocabulary(vocab):
+    """
+    Get the ``Vocabulary`` for a ``DatasetGenerator``'s ``vocab``
+    argument.
+    """
+    if vocab is None:
+        return _default_vocabulary()
+    if isinstance(vocab, Vocabulary):
+        return vocab
+    if isinstance(vocab, dict):
+        return Vocabulary.from_dict(vocab)
+    from .vocab import load_vocabulary
+    return load_vocabulary(vocab)
+
+
+def _distinct(elements):
+    """
+    Get a sequence of the distinct ``elements`` (in their original
+    order) to sample from. If they are already distinct, ``elements``
+    itself is returned.
+    """
+    if isinstance(elements, range) or len(set(elements)) == len(elements):
+        return elements
+    return tuple(dict.fromkeys(elements))
+
+
+def _distinct_pool(elements):
+    """Same as ``_distinct()``, but never returns a mutable sequence."""
+    elements = _distinct(elements)
+    if isinstance(elements, (range, tuple)):
+        return elements
+    return tuple(elements)
+
+
+# Max number of swapped characters for which ``misspellings()`` can
+# tabulate the variants. (The arrangements of ``k`` characters take
+# ``(k!) ** 2`` steps to tabulate: about 1 s for 6, and 1 min for 7.)
+MAX_TABULATED_SWAPS = 5
+
+
+@lru_cache(maxsize=None)
+def _swap_arrangements(k: int):
+    """
+    The distribution of the arrangements of ``k`` characters after the
+    swaps in ``DatasetGenerator.misspell()``, which swaps each of the
+    chosen characters (in a random order) with the one at the same
+    place in a random shuffle of them.
+
+    :return: A tuple of ``(arrangement, probability)``, where
+     ``arrangement[i]`` is which of the characters ends up at the
+     ``i``-th position.
+    """
+    counts = {}
+    for orig in permutations(range(k)):
+        for shuffled in permutations(orig):
+            chars = list(range(k))
+            for i, j in zip(orig, shuffled):
+                chars[i], chars[j] = chars[j], chars[i]
+            arrangement = tuple(chars)
+            counts[arrangement] = counts.get(arrangement, 0) + 1
+    total = sum(counts.values())
+    return tuple((arrangement, count / total) for arrangement, count in counts.items())
+
+
+@lru_cache(maxsize=None)
+def misspellings(word: str, a: int = 1, b: int = None, drop_chance=0.1):
+    """
+    Get every misspelling that ``DatasetGenerator.misspell()`` can make
+    of the ``word`` (with the same parameters), with its exact
+    probability. Computed once per word and parameters.
+
+    At most ``MAX_TABULATED_SWAPS`` characters can be swapped, i.e.,
+    ``b`` (or the length of the ``word``, if ``b`` is ``None``) must not
+    exceed it.
+
+    :return: A ``WeightedDict`` of ``{misspelling: probability}``.
+    """
+    n = len(word)
+    if not n:
+        return WeightedDict({word: 1.0})
+    if b is None:
+        b = n
+    lo, hi = min(a, n), min(b, n)
+    if lo > hi:
+        raise ValueError("`a` must be <= `b`")
+    if hi > MAX_TABULATED_SWAPS:
+        raise ValueError(
+            f"Cannot tabulate misspellings that swap more than {MAX_TABULATED_SWAPS} characters "
+            f"(up to {hi} requested)")
+    variants = {}
+    for k in range(lo, hi + 1):
+        # Each number of characters is equally likely, then each set of
+        # ``k`` of the ``n`` characters.
+        p_chosen = 1 / (hi - lo + 1) / comb(n, k)
+        # Which of the ``k`` characters are dropped (each independently).
+        drops = []
+        for mask in range(1 << k):
+            dropped = bin(mask).count('1')
+            drops.append((mask, drop_chance ** dropped * (1 - drop_chance) ** (k - dropped)))
+        for idxs in combinations(range(n), k):
+            for arrangement, p_arrangement in _swap_arrangements(k):
+                chars = list(word)
+                for i, src in zip(idxs, arrangement):
+                    chars[i] = word[idxs[src]]
+                for mask, p_drop in drops:
+                    p = p_chosen * p_arrangement * p_drop
+                    if not p:
+                        continue
+                    if mask:
+                        kept = chars.copy()
+                        for bit in range(k - 1, -1, -1):
+                            if mask >> bit & 1:
+                                kept.pop(idxs[bit])
+                        variant = ''.join(kept)
+                    else:
+                        variant = ''.join(chars)
+                    variants[variant] = variants.get(variant, 0.0) + p
+    variants = WeightedDict(variants)
+    variants.compile()
+    return variants
+
 
 class DatasetGenerator:
 
@@ -376,7 +1012,55 @@ class DatasetGenerator:
             avail_rge: list = None,
             avail_sec: list = None,
             avail_lots: list = None,
+            seed=None,
+            rng: random.Random = None,
+            backend: str = 'python',
+            vocab=None,
+            cache_misspellings=False,
+            component_cache_size=0,
     ):
+        """
+        :param seed: Seed for this generator's random number generator.
+         Two generators with the same seed and weights produce the same
+         output.
+        :param rng: Optional ``random.Random`` instance (or subclass,
+         e.g. ``dataset_gen.rng.NumpyRandom``) to draw from, instead of
+         a new ``random.Random``. If ``seed`` is also passed, the
+         ``rng`` is reseeded with it.
+        :param backend: ``'python'`` (the default) or ``'numpy'`` to
+         draw Townships, Ranges, Sections and principal meridians in
+         vectorized blocks with NumPy. ``'auto'`` uses NumPy if it is
+         installed, and otherwise falls back to ``'python'``.
+        :param vocab: The vocabularies to draw from: a ``Vocabulary``,
+         a dict of vocabularies to override (as in
+         ``Vocabulary.from_dict()``), or the path to a JSON or TOML
+         vocabulary profile (see ``dataset_gen.vocab``). Defaults to
+         ``DEFAULT_VOCABULARY``.
+        :param cache_misspellings: If ``True``, draw misspelled
+         Township and Range words from a precomputed table of each
+         word's misspellings (see ``.misspell_cached()``), which is much
+         faster at high ``misspell_*_wt`` but draws differently than
+         ``.misspell()`` (with the same distribution).
+        :param component_cache_size: If > 0, keep up to this many
+         recently rendered Townships, Ranges and sections (each) in a
+         ``ComponentCache``, so that each repeated one is the same
+         shared string. Off (0) by default, because it only saves
+         memory for callers that keep the components themselves (e.g.,
+         40k Townships plus 40k sections take 2.0 MiB instead of
+         5.1 MiB): rows are new strings either way (see
+         ``dataset_gen.columnar`` to keep rows compactly), so 40k rows
+         take 8.0 MiB instead of 6.0 MiB with the cache held, and
+         generation is up to ~20% slower. See
+         ``benchmarks/bench_component_cache.py`` and
+         ``.component_cache_stats()``. Does not apply to the
+         ``'numpy'`` backend.
+        """
+        if rng is None:
+            rng = random.Random(seed)
+        elif seed is not None:
+            rng.seed(seed)
+        self.rng = rng
+        self.vocab = _resolve_vocabulary(vocab)
         self.drop_twp_wt = drop_twp_wt
         self.drop_rge_wt = drop_rge_wt
         self.drop_sec_wt = drop_sec_wt
@@ -391,6 +1075,14 @@ class DatasetGenerator:
         self.desc_abbrev_wt = desc_abbrev_wt
         self.frac_abbrev_wt = frac_abbrev_wt
         self.pm_wt = pm_wt
+        self.cache_misspellings = cache_misspellings
+        self.component_cache_size = component_cache_size
+        self._twp_cache = self._rge_cache = self._sec_cache = None
+        if component_cache_size:
+            from ._cache import ComponentCache
+            self._twp_cache = ComponentCache(component_cache_size)
+            self._rge_cache = ComponentCache(component_cache_size)
+            self._sec_cache = ComponentCache(component_cache_size)
         if avail_twp is None:
             avail_twp = list(range(1, 160))
         if avail_rge is None:
@@ -403,23 +1095,105 @@ class DatasetGenerator:
         self.avail_rge = avail_rge
         self.avail_sec = avail_sec
         self.avail_lots = avail_lots
-    
-    @staticmethod
-    def choose_weighted(weight_dict: dict):
+        self.backend = _resolve_backend(backend)
+        self._columns = None
+        # (Internal) If set, the generator reports to it the draws from
+        # vocabularies that end up not being rendered (e.g., a
+        # ``THROUGH`` drawn for lots that are not a range), with
+        # ``.discard(vocabulary, element)`` for a single draw, or
+        # ``.discard_between(start, end)`` for the draws between two
+        # ``.mark()`` positions. Set by ``StratifiedSampler``, to count
+        # only rendered entries.
+        self._draw_log = None
+        self._init_backend()
+
+    @property
+    def avail_sec(self):
+        return self._avail_sec
+
+    @avail_sec.setter
+    def avail_sec(self, value):
+        # The distinct sections, for multi-sections. (Reassign
+        # ``.avail_sec`` rather than modifying it in place.)
+        self._avail_sec = value
+        self._sec_pool = _distinct_pool(value)
+
+    @property
+    def avail_lots(self):
+        return self._avail_lots
+
+    @avail_lots.setter
+    def avail_lots(self, value):
+        # The distinct lots. (Reassign ``.avail_lots`` rather than
+        # modifying it in place.)
+        self._avail_lots = value
+        self._lot_pool = _distinct_pool(value)
+
+    def _init_backend(self):
+        """(Re)initialize the pre-drawn columns for the NumPy backend."""
+        if self.backend == 'numpy':
+            from ._numpy_backend import NumpyColumns
+            self._columns = NumpyColumns(self)
+
+    def reseed(self, seed):
+        """Reseed this generator's random number generator."""
+        self.rng.seed(seed)
+        self._init_backend()
+
+    def profile(self):
+        """
+        Get a ``Profiler`` that counts calls, time, RNG draws and loop
+        iterations in this generator while it is enabled (e.g., as a
+        context manager). There is no overhead when it is not enabled.
+        """
+        from .profiling import Profiler
+        return Profiler(self)
+
+    def stratified(self, min_count=100, vocabularies: list = None, **kwargs):
+        """
+        Get a ``StratifiedSampler`` that generates rows from this
+        generator with rare vocabulary entries (and layouts) boosted
+        until each is in at least ``min_count`` rows, and reports each
+        row's importance weight (see ``dataset_gen.stratified``).
+
+        :param min_count: The number of rows to reach for each entry.
+        :param vocabularies: The names of the vocabularies whose entries
+         to count. Defaults to all.
+        :param kwargs: Other arguments for ``StratifiedSampler`` (e.g.,
+         ``layouts``, ``layout_min_count``, ``labeled``).
+        """
+        from .stratified import StratifiedSampler
+        return StratifiedSampler(self, min_count, vocabularies, **kwargs)
+
+    def component_cache_stats(self):
+        """
+        Get the lookups, hit rate and size of each component cache (see
+        ``component_cache_size``), as a dict of ``{component: stats}``.
+        """
+        caches = {
+            'twp': self._twp_cache,
+            'rge': self._rge_cache,
+            'sec': self._sec_cache,
+        }
+        return {name: cache.stats() for name, cache in caches.items() if cache is not None}
+
+    def choose_weighted(self, weight_dict: dict):
         """
         Choose 1 element from a dictionary of strings and their weights.
-        :param weight_dict: 
-        :return: 
+        :param weight_dict: A dict of ``{element: weight}``. If it is a
+         ``WeightedDict`` (as are all vocabularies in this module), its
+         precompiled cumulative-weight table is used.
+        :return:
         """
-        return random.choices(list(weight_dict.keys()), weights=list(weight_dict.values()), k=1)[0]
+        if isinstance(weight_dict, WeightedDict):
+            return weight_dict.sample(self.rng.random)
+        return self.rng.choices(list(weight_dict.keys()), weights=list(weight_dict.values()), k=1)[0]
     
-    @staticmethod
-    def roll(weight):
+    def roll(self, weight):
         """Roll a probability between 0 and 1. Return a bool."""
-        return random.uniform(0, 1) <= weight
-    
-    @classmethod
-    def misspell(cls, word: str, a: int = 1, b: int = None, drop_chance=0.1):
+        return self.rng.uniform(0, 1) <= weight
+
+    def misspell(self, word: str, a: int = 1, b: int = None, drop_chance=0.1):
         """
         Randomly shuffle and/or drop letters in the ``word``.
 
@@ -434,18 +1208,39 @@ class DatasetGenerator:
         n = len(word)
         if b is None:
             b = n
-        orig_idxs = random.sample(range(n), random.randint(min(a, n), min(b, n)))
+        orig_idxs = self.rng.sample(range(n), self.rng.randint(min(a, n), min(b, n)))
         shuffle_idxs = orig_idxs.copy()
-        random.shuffle(shuffle_idxs)
+        self.rng.shuffle(shuffle_idxs)
         chars = list(word)
         for i, j in zip(orig_idxs, shuffle_idxs):
             chars[i], chars[j] = chars[j], chars[i]
         # Iterate over the indexes (last to first).
         for i in sorted(orig_idxs, reverse=True):
-            if cls.roll(drop_chance):
+            if self.roll(drop_chance):
                 chars.pop(i)
         return ''.join(chars)
 
+    def misspell_cached(self, word: str, a: int = 1, b: int = None, drop_chance=0.1):
+        """
+        Misspell the ``word`` with the same distribution as
+        ``.misspell()``, but with a single draw from a table of all of
+        its misspellings (see ``misspellings()``), computed the first
+        time each word is misspelled.
+
+        Falls back to ``.misspell()`` if more than
+        ``MAX_TABULATED_SWAPS`` characters may be swapped (e.g., with
+        the default ``b=None`` for a word longer than that).
+        """
+        if min(len(word) if b is None else b, len(word)) > MAX_TABULATED_SWAPS:
+            return self.misspell(word, a, b, drop_chance)
+        return misspellings(word, a, b, drop_chance).sample(self.rng.random)
+
+    def _misspell(self, word: str, a: int, b: int, drop_chance):
+        """Misspell with ``.misspell_cached()`` or ``.misspell()``, per ``.cache_misspellings``."""
+        if self.cache_misspellings:
+            return self.misspell_cached(word, a, b, drop_chance)
+        return self.misspell(word, a, b, drop_chance)
+
     def gen_combo_desc(self, layouts: list):
         """
         Generate a combination of descriptions with multiple layouts.
@@ -456,85 +1251,219 @@ class DatasetGenerator:
          * ``'desc_STR'``
          * ``'TR_desc_S'``
          * ``'S_desc_TR'``
+         * the name of a layout added with ``register_layout()``
+         * a ``LayoutTemplate``
         :return:
         """
-        dispatch = {
-            'TRS_desc': self.gen_trs_desc,
-            'TR_desc_S': self.gen_tr_desc_s,
-            'desc_STR': self.gen_desc_str,
-            'S_desc_TR': self.gen_s_desc_tr,
-        }
-        descriptions = []
-        for layout in layouts:
-            gen_func = dispatch[layout]
-            desc = gen_func()
-            descriptions.append(desc)
-        return ', '.join(descriptions)
+        parts = []
+        self._render_layouts(layouts, parts)
+        return ''.join(parts)
+
+    def gen_labeled(self, layouts):
+        """
+        Generate a description (in one layout, or a combination of
+        layouts as in ``.gen_combo_desc()``), along with its structured
+        ground truth.
+
+        :param layouts: A single layout (e.g., ``'TRS_desc'``) or a
+         list of layouts.
+        :return: A ``LabeledDescription``, whose ``.tracts`` are a
+         ``Tract`` (with character spans) for each section or
+         multi-section in the text.
+        """
+        if isinstance(layouts, (str, LayoutTemplate)):
+            layouts = [layouts]
+        parts = []
+        tracts = []
+        self._render_layouts(layouts, parts, tracts)
+        return LabeledDescription(''.join(parts), tuple(tracts))
+
+    def generate_many(
+            self,
+            n: int,
+            layouts: list = None,
+            layout_weights: list = None,
+            chunk_size=4096,
+            labeled=False,
+    ):
+        """
+        Lazily generate ``n`` descriptions, one per row.
+
+        The layout of each row is drawn from ``layouts`` (per the
+        optional ``layout_weights``). Layout draws are made in bulk,
+        ``chunk_size`` at a time, so memory use stays flat regardless
+        of ``n``.
+
+        :param n: Number of descriptions to generate.
+        :param layouts: List of layouts to choose from for each row.
+         Each may be a single layout (e.g., ``'TRS_desc'``) or a list
+         of layouts to combine into one row, as in
+         ``.gen_combo_desc()``. Defaults to all layouts (equally
+         weighted).
+        :param layout_weights: Optional weights (one per element of
+         ``layouts``).
+        :param chunk_size: Number of rows whose layouts are drawn at
+         once.
+        :param labeled: If ``True``, yield a ``LabeledDescription`` for
+         each row (as with ``.gen_labeled()``) instead of a string.
+        :return: A generator of description strings (or
+         ``LabeledDescription`` objects).
+        """
+        layout_func = partial(self._layout_func, labeled=labeled)
+        return self._generate_rows(n, layouts, layout_weights, chunk_size, layout_func)
+
+    def _generate_rows(self, n, layouts, layout_weights, chunk_size, layout_func):
+        """
+        Check the arguments of ``.generate_many()`` (or of
+        ``NoiseGenerator.generate_many()``), and lazily generate ``n``
+        rows, each from the function ``layout_func(layout)`` for a
+        layout drawn from ``layouts`` (with this generator's RNG).
+        """
+        if n < 0:
+            raise ValueError("`n` must be >= 0")
+        if chunk_size < 1:
+            raise ValueError("`chunk_size` must be >= 1")
+        if layouts is None:
+            layouts = list(LAYOUTS)
+        if layout_weights is not None and len(layout_weights) != len(layouts):
+            raise ValueError("`layout_weights` must be the same length as `layouts`")
+        gen_funcs = [layout_func(layout) for layout in layouts]
+        cum_weights = None
+        if layout_weights is not None:
+            cum_weights = list(accumulate(layout_weights))
+        return self._generate_many(n, gen_funcs, cum_weights, chunk_size)
+
+    def _generate_many(self, n, gen_funcs, cum_weights, chunk_size):
+        """Generator body for ``.generate_many()``."""
+        while n > 0:
+            k = min(n, chunk_size)
+            n -= k
+            if len(gen_funcs) == 1:
+                chosen = gen_funcs * k
+            else:
+                chosen = self.rng.choices(gen_funcs, cum_weights=cum_weights, k=k)
+            for gen_func in chosen:
+                yield gen_func()
+
+    def _layout_func(self, layout, labeled=False):
+        """
+        Get the function that generates a row in the specified
+        ``layout``, or a list of layouts to combine.
+        """
+        templates = _resolve_layouts(layout)
+        if labeled:
+            return partial(self.gen_labeled, templates)
+        if len(layout) == 1 and layout[0] in LAYOUTS:
+            return getattr(self, LAYOUTS[layout[0]])
+        return partial(self.gen_combo_desc, templates)
 
     def gen_trs_desc(self):
         """
         Generate a PLSS description in the ``TRS_DESC`` layout.
         """
-        all_components = self.gen_all_description_components()
-        descriptions = []
-        for twprge, sec_desc in all_components.items():
-            compiled_sec_descs = []
-            for sec, desc in sec_desc.items():
-                compiled_sec_descs.append(f"{sec}: {desc}")
-            compiled = f"{twprge}, {', '.join(compiled_sec_descs)}"
-            descriptions.append(compiled)
-        return ', '.join(descriptions)
+        parts = []
+        self._render_layout(LAYOUT_TEMPLATES['TRS_desc'], parts)
+        return ''.join(parts)
 
     def gen_tr_desc_s(self):
         """
         Generate a PLSS description in the ``TR_DESC_S`` layout.
         """
-        all_components = self.gen_all_description_components()
-        descriptions = []
-        of_the = self.choose_weighted(DESC_STR_OF_THE)
-        of_the = f" {of_the} "
-        for twprge, sec_desc in all_components.items():
-            compiled_sec_descs = []
-            for sec, desc in sec_desc.items():
-                compiled_sec_descs.append(f"{desc}{of_the}{sec}")
-            compiled = f"{twprge}, {', '.join(compiled_sec_descs)}"
-            descriptions.append(compiled)
-        return ', '.join(descriptions)
+        parts = []
+        self._render_layout(LAYOUT_TEMPLATES['TR_desc_S'], parts)
+        return ''.join(parts)
 
     def gen_desc_str(self):
         """
         Generate a PLSS description in the ``DESC_STR`` layout.
         """
-        all_components = self.gen_all_description_components()
-        descriptions = []
-        of_the1 = self.choose_weighted(DESC_STR_OF_THE)
-        of_the1 = f" {of_the1} "
-        of_the2 = self.choose_weighted(DESC_STR_OF_THE)
-        of_the2 = f" {of_the2} "
-        for twprge, sec_desc in all_components.items():
-            compiled_sec_descs = []
-            for sec, desc in sec_desc.items():
-                compiled_sec_descs.append(f"{desc}{of_the1}{sec}")
-            compiled = f"{', '.join(compiled_sec_descs)}{of_the2}{twprge}"
-            descriptions.append(compiled)
-        return ', '.join(descriptions)
+        parts = []
+        self._render_layout(LAYOUT_TEMPLATES['desc_STR'], parts)
+        return ''.join(parts)
 
     def gen_s_desc_tr(self):
         """
         Generate a PLSS description in the ``S_DESC_TR`` layout.
         (This is not a commonly seen layout in real data.)
         """
-        all_components = self.gen_all_description_components()
-        descriptions = []
-        of_the = self.choose_weighted(DESC_STR_OF_THE)
-        of_the = f" {of_the} "
-        for twprge, sec_desc in all_components.items():
-            compiled_sec_descs = []
-            for sec, desc in sec_desc.items():
-                compiled_sec_descs.append(f"{sec}: {desc}")
-            compiled = f"{', '.join(compiled_sec_descs)}{of_the}{twprge}"
-            descriptions.append(compiled)
-        return ', '.join(descriptions)
+        parts = []
+        self._render_layout(LAYOUT_TEMPLATES['S_desc_TR'], parts)
+        return ''.join(parts)
+
+    def _render_layouts(self, layouts: list, parts: list, tracts: list = None):
+        """
+        Generate descriptions in each of the ``layouts``, appending
+        their text to ``parts`` (separated by commas).
+        :param tracts: If given, a ``Tract`` label for each section is
+         appended to this list.
+        """
+        pos = 0
+        for i, layout in enumerate(layouts):
+            if i:
+                parts.append(LAYOUT_SEPARATOR)
+                pos += len(LAYOUT_SEPARATOR)
+            pos = self._render_layout(layout, parts, pos, tracts)
+
+    def _render_layout(self, layout, parts: list, pos: int = 0, tracts: list = None):
+        """
+        Generate a description in the ``layout``, appending its text to
+        ``parts``.
+
+        :param layout: A layout name, or a ``LayoutTemplate``.
+        :param pos: The position in the full text at which this
+         description begins (for the spans in ``tracts``).
+        :param tracts: If given, a ``Tract`` label for each section is
+         appended to this list.
+        :return: The position in the full text after this description.
+        """
+        template = layout if layout.__class__ is LayoutTemplate else _resolve_layout(layout)
+        all_components = self._gen_all_components()
+        o0, o1, o2, u0, u1, u2 = template.bind(self.choose_weighted, self.vocab)
+        twprge_first = template.twprge_first
+        sec_first = template.sec_first
+        extend = parts.extend
+        for i, (twprge, sec_desc) in enumerate(all_components.values()):
+            if i:
+                parts.append(LAYOUT_SEPARATOR)
+                pos += len(LAYOUT_SEPARATOR)
+            twprge_txt = twprge[0]
+            if twprge_first:
+                start = pos + len(o0)
+                twprge_span = (start, start + len(twprge_txt))
+                extend((o0, twprge_txt, o1))
+                pos = twprge_span[1] + len(o1)
+            else:
+                parts.append(o0)
+                pos += len(o0)
+            tract_spans = []
+            for j, (sec, desc) in enumerate(sec_desc.values()):
+                if j:
+                    parts.append(LAYOUT_SEPARATOR)
+                    pos += len(LAYOUT_SEPARATOR)
+                first, second = (sec, desc) if sec_first else (desc, sec)
+                start = pos + len(u0)
+                first_span = (start, start + len(first[0]))
+                start = first_span[1] + len(u1)
+                second_span = (start, start + len(second[0]))
+                extend((u0, first[0], u1, second[0], u2))
+                pos = second_span[1] + len(u2)
+                if tracts is not None:
+                    spans = (first_span, second_span) if sec_first else (second_span, first_span)
+                    tract_spans.append((sec, desc, *spans))
+            if twprge_first:
+                parts.append(o2)
+                pos += len(o2)
+            else:
+                start = pos + len(o1)
+                twprge_span = (start, start + len(twprge_txt))
+                extend((o1, twprge_txt, o2))
+                pos = twprge_span[1] + len(o2)
+            if tracts is not None:
+                _, twp, ns, rge, ew, pm = twprge
+                for sec, desc, sec_span, desc_span in tract_spans:
+                    tracts.append(Tract(
+                        twp, ns, rge, ew, pm, sec[1], desc[1], desc[2], twprge_span, sec_span, desc_span))
+        return pos
 
     def gen_all_description_components(
             self,
@@ -559,30 +1488,93 @@ class DatasetGenerator:
          additional section beyond the minimum (up to the max).
         :return: A nested dict of components.
         """
+        all_components = self._gen_all_components(
+            min_twprge_ct, max_twprge_ct, min_sec_ct, max_sec_ct, twprge_continue_wt, sec_continue_wt)
+        return {
+            twprge[0]: {sec[0]: desc[0] for sec, desc in sec_desc.values()}
+            for twprge, sec_desc in all_components.values()
+        }
+
+    def _gen_all_components(
+            self,
+            min_twprge_ct=1,
+            max_twprge_ct=1,
+            min_sec_ct=1,
+            max_sec_ct=4,
+            twprge_continue_wt=0.1,
+            sec_continue_wt=0.3
+    ):
+        """
+        Structured version of ``.gen_all_description_components()``.
+        :return: A nested dict of
+         ``{twprge_text: (twprge, {sec_text: (sec, desc)})}``, where
+         ``twprge``, ``sec`` and ``desc`` are the tuples returned by
+         ``._gen_twprge()``, ``._gen_sec_or_multisec()`` and
+         ``._gen_desc()``.
+        """
+        # With a ``._draw_log``, report the draws of any Twp/Rge or
+        # section (and its description) that is replaced by a later one
+        # with the same text: ``{text: (start, end)}`` of its draws.
+        log = self._draw_log
+        drawn = {}
         twprges = {}
         while (len(twprges) < max_twprge_ct) and ((len(twprges) < min_twprge_ct) or self.roll(twprge_continue_wt)):
-            twprges[self.gen_twprge()] = {}
-        for twprge, desc_dict in twprges.items():
+            if log is not None:
+                start = log.mark()
+            twprge = self._gen_twprge()
+            if log is not None:
+                self._log_replaced(drawn, twprge[0], start)
+            twprges[twprge[0]] = (twprge, {})
+        for _, desc_dict in twprges.values():
+            drawn = {}
             while (len(desc_dict) < max_sec_ct) and ((len(desc_dict) < min_sec_ct) or self.roll(sec_continue_wt)):
-                sec = self.gen_sec_or_multisec()
-                desc_dict[sec] = self.gen_desc()
+                if log is not None:
+                    start = log.mark()
+                sec = self._gen_sec_or_multisec()
+                desc = self._gen_desc()
+                if log is not None:
+                    self._log_replaced(drawn, sec[0], start)
+                desc_dict[sec[0]] = (sec, desc)
         return twprges
 
+    def _log_replaced(self, drawn: dict, text: str, start):
+        """
+        Record that the component with this ``text`` was drawn since the
+        ``start`` mark of ``._draw_log``, and report the draws of any
+        earlier one with the same ``text`` that it replaces.
+        """
+        log = self._draw_log
+        if text in drawn:
+            log.discard_between(*drawn[text])
+        drawn[text] = (start, log.mark())
+
     def gen_twp(self):
         """
         Generate a Township (not including its range).
         :return:
         """
-        twp_wd = self.choose_weighted(TOWNSHIP)
-        space_req = twp_wd in TWPRGE_REQUIRE_SPACE
+        return self._gen_twp()[0]
+
+    def _gen_twp(self):
+        """
+        Structured version of ``.gen_twp()``.
+        :return: A tuple of ``(text, twp_num, 'N' or 'S')``.
+        """
+        if self._columns is not None:
+            return self._columns.twp()
+        vocab = self.vocab
+        twp_wd = self.choose_weighted(vocab.TOWNSHIP)
+        space_req = twp_wd in vocab.TWPRGE_REQUIRE_SPACE
         if self.roll(self.misspell_twp_wt):
-            twp_wd = self.misspell(twp_wd, a=2, b=4, drop_chance=0.1)
+            if self._draw_log is not None:
+                self._draw_log.discard(vocab.TOWNSHIP, twp_wd)
+            twp_wd = self._misspell(twp_wd, a=2, b=4, drop_chance=0.1)
         if space_req:
             twp_wd = f"{twp_wd} "
-        twp_num = random.choice(self.avail_twp)
-        draw_from = NORTH
-        if random.choice([0, 1]) == 0:
-            draw_from = SOUTH
+        twp_num = self.rng.choice(self.avail_twp)
+        draw_from = vocab.NORTH
+        if self.rng.choice([0, 1]) == 0:
+            draw_from = vocab.SOUTH
         ns = self.choose_weighted(draw_from)
         space1 = ' '
         if self.roll(0.9):
@@ -590,23 +1582,38 @@ class DatasetGenerator:
         space2 = ' '
         if ns in ('n', 's') and self.roll(0.9):
             space2 = ''
-        return f"{twp_wd}{space1}{twp_num}{space2}{ns}"
+        cache = self._twp_cache
+        if cache is not None:
+            return cache.get_or_render((twp_wd, space1, twp_num, space2, ns)), twp_num, ns[0].upper()
+        return f"{twp_wd}{space1}{twp_num}{space2}{ns}", twp_num, ns[0].upper()
 
     def gen_rge(self):
         """
         Generate a Range.
         :return:
         """
-        rge_wd = self.choose_weighted(RANGE)
-        space_req = rge_wd in TWPRGE_REQUIRE_SPACE
+        return self._gen_rge()[0]
+
+    def _gen_rge(self):
+        """
+        Structured version of ``.gen_rge()``.
+        :return: A tuple of ``(text, rge_num, 'E' or 'W')``.
+        """
+        if self._columns is not None:
+            return self._columns.rge()
+        vocab = self.vocab
+        rge_wd = self.choose_weighted(vocab.RANGE)
+        space_req = rge_wd in vocab.TWPRGE_REQUIRE_SPACE
         if self.roll(self.misspell_rge_wt):
-            rge_wd = self.misspell(rge_wd, a=1, b=3, drop_chance=0.1)
+            if self._draw_log is not None:
+                self._draw_log.discard(vocab.RANGE, rge_wd)
+            rge_wd = self._misspell(rge_wd, a=1, b=3, drop_chance=0.1)
         if space_req:
             rge_wd = f"{rge_wd} "
-        rge_num = random.choice(list(self.avail_rge))
-        draw_from = WEST
-        if random.choice([0, 1]) == 0:
-            draw_from = EAST
+        rge_num = self.rng.choice(self.avail_rge)
+        draw_from = vocab.WEST
+        if self.rng.choice([0, 1]) == 0:
+            draw_from = vocab.EAST
         ew = self.choose_weighted(draw_from)
         space1 = ' '
         if rge_wd == 'r' and self.roll(0.9):
@@ -614,19 +1621,34 @@ class DatasetGenerator:
         space2 = ' '
         if ew in ('e', 'w') and self.roll(0.9):
             space2 = ''
-        return f"{rge_wd}{space1}{rge_num}{space2}{ew}"
+        cache = self._rge_cache
+        if cache is not None:
+            return cache.get_or_render((rge_wd, space1, rge_num, space2, ew)), rge_num, ew[0].upper()
+        return f"{rge_wd}{space1}{rge_num}{space2}{ew}", rge_num, ew[0].upper()
 
     def gen_sec(self):
         """
         Generate a single section.
         Ex: ``'section 4'``
         """
-        sec_wd = self.choose_weighted(SECTION)
-        sec_num = random.choice(self.avail_sec)
+        return self._gen_sec()[0]
+
+    def _gen_sec(self):
+        """
+        Structured version of ``.gen_sec()``.
+        :return: A tuple of ``(text, (sec_num,))``.
+        """
+        if self._columns is not None:
+            return self._columns.sec()
+        sec_wd = self.choose_weighted(self.vocab.SECTION)
+        sec_num = self.rng.choice(self.avail_sec)
         space = ' '
         if sec_wd == '§':
             space = ''
-        return f"{sec_wd}{space}{sec_num}"
+        cache = self._sec_cache
+        if cache is not None:
+            return cache.get_or_render((sec_wd, space, sec_num)), (sec_num,)
+        return f"{sec_wd}{space}{sec_num}", (sec_num,)
 
     def gen_sec_or_multisec(self):
         """
@@ -636,12 +1658,18 @@ class DatasetGenerator:
         Ex1:    ``'section 4'``
         Ex2:    ``'sections 4 - 6'``
         """
+        return self._gen_sec_or_multisec()[0]
+
+    def _gen_sec_or_multisec(self):
+        """
+        Structured version of ``.gen_sec_or_multisec()``.
+        :return: A tuple of ``(text, (sec_num, ...))``.
+        """
         if self.roll(self.multi_sec_wt):
-            return self.gen_multisec()
-        return self.gen_sec()
+            return self._gen_multisec()
+        return self._gen_sec()
 
-    @classmethod
-    def choose_multiple(cls, choose_from: list, min_count=2, repeat_wt=0.01, reverse=False):
+    def choose_multiple(self, choose_from: list, min_count=2, repeat_wt=0.01, reverse=False):
         """
         Generate a sorted list of elements.
 
@@ -653,128 +1681,157 @@ class DatasetGenerator:
         """
         if len(choose_from) < min_count:
             raise ValueError("length of `choose_from` must be >= `min_count`")
-        chosen = set()
-        avail = set(choose_from)
-        new_choice = random.sample(list(avail), min_count)
-        chosen.update(new_choice)
-        avail -= chosen
-        while (len(chosen) < min_count or cls.roll(repeat_wt)) and avail:
-            new_choice = random.choice(list(avail))
-            chosen.add(new_choice)
-            avail.remove(new_choice)
-        return sorted(chosen, reverse=reverse)
+        return self._choose_multiple(_distinct(choose_from), min_count, repeat_wt, reverse)
+
+    def _choose_multiple(self, pool, min_count=2, repeat_wt=0.01, reverse=False):
+        """
+        Same as ``.choose_multiple()``, but ``pool`` must be a sequence
+        of distinct elements.
+
+        Equivalent to drawing ``min_count`` elements and then each
+        additional element one at a time (while the rolls succeed), but
+        with the final count drawn up front and a single sample.
+        """
+        count = min_count + self._count_successes(repeat_wt, len(pool) - min_count)
+        return sorted(self.rng.sample(pool, count), reverse=reverse)
+
+    def _count_successes(self, weight, limit):
+        """
+        Count how many consecutive rolls of ``weight`` would succeed
+        (as with ``.roll()``), up to ``limit``, with a single draw from
+        the geometric distribution.
+        """
+        if limit <= 0 or weight <= 0:
+            return 0
+        if weight >= 1:
+            return limit
+        return min(limit, int(log(1.0 - self.rng.random()) / log(weight)))
 
     def gen_pm(self):
         "Generate a principal meridian."
-        pm_wd = self.choose_weighted(PM)
-        pm_selection = random.choice(list(PM_IDS))
-        return f"{pm_selection} {pm_wd}"
-    
+        return self._gen_pm()[0]
+
+    def _gen_pm(self):
+        """
+        Structured version of ``.gen_pm()``.
+        :return: A tuple of ``(text, pm_id)``.
+        """
+        pm_wd = self.choose_weighted(self.vocab.PM)
+        pm_selection = self.rng.choice(self.vocab.PM_IDS)
+        return f"{pm_selection} {pm_wd}", pm_selection
+
     def gen_twprge(self):
         """
         Generate a Township and Range, including possibly the
         principal meridian.
         :return:
         """
-        twp = ''
-        rge = ''
+        return self._gen_twprge()[0]
+
+    def _gen_twprge(self):
+        """
+        Structured version of ``.gen_twprge()``.
+        :return: A tuple of ``(text, twp_num, ns, rge_num, ew, pm_id)``,
+         with ``None`` for any element that was dropped.
+        """
+        if self._columns is not None:
+            return self._columns.twprge()
+        twp = rge = pm = ''
+        twp_num = ns = rge_num = ew = pm_id = None
         if not self.roll(self.drop_twp_wt):
-            twp = self.gen_twp()
+            twp, twp_num, ns = self._gen_twp()
         if not self.roll(self.drop_rge_wt):
-            rge = self.gen_rge()
+            rge, rge_num, ew = self._gen_rge()
         twprge_connector = ''
         if twp and rge:
-            twprge_connector = random.choice([', ', ' - ', '-'])
-        pm = ''
+            twprge_connector = self.rng.choice([', ', ' - ', '-'])
         if self.roll(self.pm_wt):
-            pm = self.gen_pm()
+            pm, pm_id = self._gen_pm()
         pm_connector = ''
         if (twp or rge) and pm:
-            pm_connector = random.choice([', ', ' of the '])
-        return f"{twp}{twprge_connector}{rge}{pm_connector}{pm}"
-    
+            pm_connector = self.rng.choice([', ', ' of the '])
+        return f"{twp}{twprge_connector}{rge}{pm_connector}{pm}", twp_num, ns, rge_num, ew, pm_id
+
     def gen_desc_qq(self):
         """
         Generate a simple aliquot description.
         :return:
         """
+        return self._gen_desc_qq()[0]
+
+    def _gen_desc_qq(self):
+        """
+        Structured version of ``.gen_desc_qq()``.
+        :return: A tuple of ``(text, aliquots)``, where ``aliquots`` is
+         a tuple of canonical aliquot codes (see ``ALIQUOT_CODES``),
+         one per comma-separated aliquot group.
+        """
         abbrev_words = self.roll(self.desc_abbrev_wt)
         abbrev_frac = False
         if abbrev_words and self.roll(self.frac_abbrev_wt):
             abbrev_frac = True
+        vocab = self.vocab
+        grammar = vocab.ALIQUOT_GRAMMARS[abbrev_words, abbrev_frac]
+        rand = self.rng.random
+        choice = self.rng.choice
 
-        # Default to un-abbreviated versions of "North", "East", etc.
-        quarter__ = QUARTER_WORD
-        half__ = HALF_WORD
-        ns_compatible__ = NS_COMPATIBLE_WORD
-        ew_compatible__ = EW_COMPATIBLE_WORD
-        aliquot_halves__ = ALIQUOT_HALVES_WORD
-        aliquot_quarters__ = ALIQUOT_QUARTERS_WORD
-
-        if abbrev_words:
-            quarter__ = QUARTER_FRAC
-            half__ = HALF_FRAC
-            ns_compatible__ = NS_COMPATIBLE_ABBREV
-            ew_compatible__ = EW_COMPATIBLE_ABBREV
-            aliquot_halves__ = ALIQUOT_HALVES_ABBREV
-            aliquot_quarters__ = ALIQUOT_QUARTERS_ABBREV
-        if abbrev_frac:
-            aliquot_halves__ = ALIQUOT_HALVES_ABBREV
-            aliquot_quarters__ = ALIQUOT_QUARTERS_ABBREV
-
-        quarter_wd = self.choose_weighted(quarter__)
-        half_wd = self.choose_weighted(half__)
-        if not abbrev_words:
-            quarter_wd = ' ' + quarter_wd
-            half_wd = ' ' + half_wd
-
-        while True:
-            of_the = self.choose_weighted(OF_THE)
-            if not (half_wd in OF_THE_BLANK_DISALLOWED
-                    and quarter_wd in OF_THE_BLANK_DISALLOWED
-                    and of_the in OF_THE_BLANK):
-                # If not illegal combination, break out and use it.
-                break
+        quarter_wd = grammar.quarter_fracs.sample(rand)
+        half_wd = grammar.half_fracs.sample(rand)
+        of_the_options = vocab.OF_THE
+        if (half_wd, quarter_wd) in grammar.no_blank_of_the:
+            of_the_options = vocab.OF_THE_NONBLANK
+        of_the = of_the_drawn = of_the_options.sample(rand)
         if of_the == '' and not abbrev_words:
             of_the = ' '
+        fracs = (quarter_wd, half_wd)
+        transitions = grammar.transitions
+        aliquot_codes = vocab.ALIQUOT_CODES
         desc_list = []
-        available_aliquot_groups = aliquot_halves__ + aliquot_quarters__ + [ALL]
-        components = []
+        codes_list = []
+        # Whether the quarter / half fraction, and "of the", are rendered.
+        fracs_used = [False, False]
+        of_the_used = False
+        state = ALIQUOT_START
         while True:
+            components = []
+            codes = []
             while True:
-                chosen_group = random.choice(available_aliquot_groups)
-                if chosen_group == ALL:
-                    components = [self.choose_weighted(chosen_group)]
-                    return components[0]
-                if chosen_group in aliquot_quarters__:
-                    # If we've encountered aliquot_quarters__, then aliquot_halves__ are no longer allowed.
-                    available_aliquot_groups = aliquot_quarters__
-                elif chosen_group in ns_compatible__:
-                    # Do not cross "East/West Half" with "North/South Half"
-                    available_aliquot_groups = ns_compatible__ + aliquot_quarters__
-                elif chosen_group in ew_compatible__:
-                    # Do not cross "East/West Half" with "North/South Half"
-                    available_aliquot_groups = ew_compatible__ + aliquot_quarters__
-                aliquot_component = self.choose_weighted(chosen_group)
-                frac = ''  # Default "ALL"
-                if aliquot_component in ALIQUOT_HALF_ELEMENTS:
-                    frac = half_wd
-                elif aliquot_component in ALIQUOT_QUARTER_ELEMENTS:
-                    frac = quarter_wd
-                components.append(aliquot_component + frac)
+                group, state, is_half = choice(transitions[state])
+                if state is None:
+                    # The "ALL" group.
+                    text = group.sample(rand)
+                    if self._draw_log is not None:
+                        self._discard_aliquot_draws(grammar, fracs, of_the_options, of_the_drawn, (False, False), False)
+                    return text, ('ALL',)
+                aliquot_component = group.sample(rand)
+                components.append(aliquot_component + fracs[is_half])
+                codes.append(aliquot_codes[aliquot_component])
+                fracs_used[is_half] = True
                 if not self.roll(self.qq_continue_wt):
                     break
-            desc_list.append(components)
-            components = []
+            if len(components) > 1:
+                of_the_used = True
+            desc_list.append(of_the.join(components))
+            codes_list.append(''.join(codes))
             if not self.roll(self.desc_continue_wt):
                 break
             # Can't have "ALL" anymore.
-            available_aliquot_groups = aliquot_halves__ + aliquot_quarters__
-        joined_components = []
-        for component_list in desc_list:
-            joined_components.append(of_the.join(component_list))
-        comma = self.choose_weighted(QQ_COMMA)
-        return comma.join(joined_components)
+            state = ALIQUOT_CONTINUE
+        comma = self.choose_weighted(vocab.QQ_COMMA)
+        if self._draw_log is not None:
+            self._discard_aliquot_draws(grammar, fracs, of_the_options, of_the_drawn, fracs_used, of_the_used)
+            if len(desc_list) == 1:
+                self._draw_log.discard(vocab.QQ_COMMA, comma)
+        return comma.join(desc_list), tuple(codes_list)
+
+    def _discard_aliquot_draws(self, grammar, fracs, of_the_options, of_the, fracs_used, of_the_used):
+        """Report the fractions and "of the" of an aliquot description that were not rendered."""
+        if not fracs_used[0]:
+            self._draw_log.discard(grammar.quarter_fracs, fracs[0])
+        if not fracs_used[1]:
+            self._draw_log.discard(grammar.half_fracs, fracs[1])
+        if not of_the_used:
+            self._draw_log.discard(of_the_options, of_the)
 
     def gen_desc(self, lots_wt=0.2, both_wt=0.8):
         """
@@ -784,17 +1841,28 @@ class DatasetGenerator:
          will definitely generate aliquots.)
         :return:
         """
+        return self._gen_desc(lots_wt, both_wt)[0]
+
+    def _gen_desc(self, lots_wt=0.2, both_wt=0.8):
+        """
+        Structured version of ``.gen_desc()``.
+        :return: A tuple of ``(text, lots, aliquots)``.
+        """
         lots_needed = self.roll(lots_wt)
         desc_needed = (not lots_needed) or self.roll(both_wt)
         components = []
+        lots = ()
+        aliquots = ()
         if lots_needed:
-            components.append(self.gen_lots())
+            lots_txt, lots = self._gen_lots()
+            components.append(lots_txt)
         if desc_needed:
-            components.append(self.gen_desc_qq())
+            qq_txt, aliquots = self._gen_desc_qq()
+            components.append(qq_txt)
         # Favor putting lots first, which happens more often than not in real data.
         if self.roll(0.8):
             components.reverse()
-        return ', '.join(components)
+        return ', '.join(components), lots, aliquots
 
     def gen_lots(self, lot_continue_wt=0.6):
         """
@@ -802,19 +1870,34 @@ class DatasetGenerator:
          additional lot. (Will always generate at least 1.)
         :return:
         """
-        lot_wd = self.choose_weighted(LOT)
-        lots = self.choose_multiple(self.avail_lots, min_count=1, repeat_wt=lot_continue_wt)
-        and_wd = self.choose_weighted(QQ_COMMA)
-        thru_wd = self.choose_weighted(THROUGH)
-        return self._elements_to_str_list(
+        return self._gen_lots(lot_continue_wt)[0]
+
+    def _gen_lots(self, lot_continue_wt=0.6):
+        """
+        Structured version of ``.gen_lots()``.
+        :return: A tuple of ``(text, (lot_num, ...))``, including any
+         lots implied by ``'through'``.
+        """
+        lot_wd = self.choose_weighted(self.vocab.LOT)
+        lots = self._choose_multiple(self._lot_pool, min_count=1, repeat_wt=lot_continue_wt)
+        and_wd = self.choose_weighted(self.vocab.QQ_COMMA)
+        thru_wd = self.choose_weighted(self.vocab.THROUGH)
+        covered = []
+        connectors = None if self._draw_log is None else []
+        text = self._elements_to_str_list(
             elements=lots,
             thru_wd=thru_wd,
             and_wd=and_wd,
             thru_wt=0.4,
             type_word=lot_wd,
             plural_s_wt=0.9,
-            allow_type_word_everytime=True
+            allow_type_word_everytime=True,
+            covered=covered,
+            connectors=connectors,
         )
+        if connectors is not None:
+            self._discard_connectors(connectors, self.vocab.THROUGH, thru_wd, self.vocab.QQ_COMMA, and_wd)
+        return text, tuple(covered)
 
     def gen_multisec(self, thru_wt=0.02, repeat_wt=0.01):
         """
@@ -823,24 +1906,49 @@ class DatasetGenerator:
         :param repeat_wt: Likelihood of adding a 3rd (or 4th, etc.) section.
         :return:
         """
+        return self._gen_multisec(thru_wt, repeat_wt)[0]
+
+    def _gen_multisec(self, thru_wt=0.02, repeat_wt=0.01):
+        """
+        Structured version of ``.gen_multisec()``.
+        :return: A tuple of ``(text, (sec_num, ...))``, including any
+         sections implied by ``'through'``.
+        """
         while True:
-            out = self.choose_weighted(SECTION)
+            out = self.choose_weighted(self.vocab.SECTION)
+            # (This draw is not used.)
+            if self._draw_log is not None:
+                self._draw_log.discard(self.vocab.SECTION, out)
             # Disallow '§' symbol for multi-sec.
             if out != '§':
                 break
-        sections = self.choose_multiple(self.avail_sec, min_count=2, repeat_wt=repeat_wt)
-        sec_wd = self.choose_weighted(SECTION)
-        thru_wd = self.choose_weighted(THROUGH)
-        and_wd = self.choose_weighted(MULTISEC_COMMA)
-        return self._elements_to_str_list(
+        sections = self._choose_multiple(self._sec_pool, min_count=2, repeat_wt=repeat_wt)
+        sec_wd = self.choose_weighted(self.vocab.SECTION)
+        thru_wd = self.choose_weighted(self.vocab.THROUGH)
+        and_wd = self.choose_weighted(self.vocab.MULTISEC_COMMA)
+        covered = []
+        connectors = None if self._draw_log is None else []
+        text = self._elements_to_str_list(
             elements=sections,
             thru_wd=thru_wd,
             and_wd=and_wd,
             thru_wt=thru_wt,
             type_word=sec_wd,
             plural_s_wt=0.5,
-            allow_type_word_everytime=True
+            allow_type_word_everytime=True,
+            covered=covered,
+            connectors=connectors,
         )
+        if connectors is not None:
+            self._discard_connectors(connectors, self.vocab.THROUGH, thru_wd, self.vocab.MULTISEC_COMMA, and_wd)
+        return text, tuple(covered)
+
+    def _discard_connectors(self, connectors: list, thru_vocab, thru_wd: str, and_vocab, and_wd: str):
+        """Report the ``thru_wd`` and/or ``and_wd`` of a list that were not among its ``connectors``."""
+        if thru_wd not in connectors:
+            self._draw_log.discard(thru_vocab, thru_wd)
+        if and_wd not in connectors:
+            self._draw_log.discard(and_vocab, and_wd)
 
     def _elements_to_str_list(
             self,
@@ -850,7 +1958,9 @@ class DatasetGenerator:
             thru_wt: float,
             type_word: str,
             plural_s_wt: float,
-            allow_type_word_everytime: bool = True):
+            allow_type_word_everytime: bool = True,
+            covered: list = None,
+            connectors: list = None):
         """
         Convert a list of `elements` into an appropriate string,
         using the specified words/symbols for 'through' or 'and'.
@@ -872,15 +1982,24 @@ class DatasetGenerator:
         :param allow_type_word_everytime: Whether to allow the function
          the chance to put the type word before all elements.
          (e.g., ``"lot 1, lot 2, lot 5"`` if the ``type_word`` is ``'lot'``).
+        :param covered: (Optional) A list to fill with every element the
+         output refers to, including those implied by ``'through'``
+         (e.g., ``[1, 2, 3, 5, 6]`` for ``"sections 1 - 3, 5, 6"``).
+        :param connectors: (Optional) A list to fill with the connector
+         between each pair of elements (``thru_wd`` or ``and_wd``, as
+         given).
         """
+        vocab = self.vocab
+        if connectors is not None:
+            given_thru_wd, given_and_wd = thru_wd, and_wd
         plural_ok = False
-        if type_word not in PLURAL_DISALLOWED and self.roll(plural_s_wt):
+        if type_word not in vocab.PLURAL_DISALLOWED and self.roll(plural_s_wt):
             plural_ok = True
         elements = sorted(elements)
         elems_str = [str(elem) for elem in elements]
-        if thru_wd in REQUIRE_SPACE or self.roll(0.2):
+        if thru_wd in vocab.REQUIRE_SPACE or self.roll(0.2):
             thru_wd = f" {thru_wd} "
-        if and_wd in REQUIRE_SPACE:
+        if and_wd in vocab.REQUIRE_SPACE:
             and_wd = f" {and_wd} "
 
         # Figure out what goes between each pair of [lots/sections]:
@@ -899,16 +2018,24 @@ class DatasetGenerator:
                 throughs_ands.append(thru_wd)
             else:
                 throughs_ands.append(and_wd)
+        if covered is not None:
+            covered.extend(elements[:1])
+            for connector, l_i, l_j in zip(throughs_ands, elements, elements[1:]):
+                if connector == thru_wd:
+                    covered.extend(range(l_i + 1, l_j))
+                covered.append(l_j)
+        if connectors is not None:
+            connectors.extend(given_thru_wd if connector == thru_wd else given_and_wd for connector in throughs_ands)
 
         plural_s = ''
         if len(elements) > 1 and plural_ok:
             plural_s = 's'
         type_word_everytime = False
-        if allow_type_word_everytime and (type_word in PLURAL_DISALLOWED or not plural_ok) and self.roll(0.9):
+        if allow_type_word_everytime and (type_word in vocab.PLURAL_DISALLOWED or not plural_ok) and self.roll(0.9):
             # For example, to render "L.3, L.5-L.7" or "L3, L5-L7"
             type_word_everytime = True
         space = ' '
-        if type_word in SECTION_LOT_NOSPACE_OK and self.roll(0.95):
+        if type_word in vocab.SECTION_LOT_NOSPACE_OK and self.roll(0.95):
             # 'L1' vs 'L 1', etc.
             space = ''
         if type_word_everytime:
@@ -916,7 +2043,8 @@ class DatasetGenerator:
         else:
             # Remember `elements` is in sorted order.
             elems_str[0] = f"{type_word}{plural_s}{space}{elems_str[0]}"
-        out = elems_str.pop(0)  # Start with first element.
-        for connector, elem in zip(throughs_ands, elems_str):
-            out += f'{connector}{elem}'
-        return out
+        parts = [elems_str[0]]  # Start with first element.
+        for connector, elem in zip(throughs_ands, elems_str[1:]):
+            parts.append(connector)
+            parts.append(elem)
+        return ''.join(parts)
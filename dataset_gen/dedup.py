@@ -0,0 +1,216 @@
+"""
+Filter duplicate rows out of large generated corpora, in bounded
+memory.
+
+A row is identified by a 128-bit hash of its text. Seen hashes are
+kept either in a ``BloomFilter`` (a fixed number of bits per row, with
+a configurable false-positive rate), or in a ``HashSet64`` (64 bits per
+slot; false positives only on 64-bit hash collisions). A false
+positive drops a row that was actually unique; duplicates are never let
+through.
+
+Example:
+    dedup = Deduplicator(capacity=50_000_000, method='bloom', error_rate=1e-4)
+    for row in dedup.filter(generator.generate_many(60_000_000)):
+        ...
+    print(dedup.report())
+"""
+
+from array import array
+from hashlib import blake2b
+from math import ceil, exp, log
+
+DEDUP_METHODS = ('bloom', 'hash')
+
+
+def _hash128(text: str):
+    """A stable 128-bit hash of ``text``, as two 64-bit ints."""
+    digest = blake2b(text.encode('utf-8'), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+
+
+class BloomFilter:
+    """
+    A Bloom filter of 64-bit hash pairs, sized for ``capacity``
+    elements at a false-positive rate of ``error_rate``.
+    """
+
+    def __init__(self, capacity: int, error_rate=1e-4):
+        """
+        :param capacity: Expected number of elements. (More can be
+         added, at a higher false-positive rate.)
+        :param error_rate: Target false-positive rate at ``capacity``.
+        """
+        if capacity < 1:
+            raise ValueError("`capacity` must be >= 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("`error_rate` must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, ceil(-capacity * log(error_rate) / log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * log(2)))
+        self._probes = range(self.num_hashes)
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+    def false_positive_rate(self):
+        """The expected false-positive rate, at the current count."""
+        return (1 - exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def add(self, h1: int, h2: int):
+        """
+        Add an element, by its hash pair.
+        :return: ``True`` if it was not (probably) already present.
+        """
+        bits = self.bits
+        num_bits = self.num_bits
+        new = False
+        # Double hashing: the i-th bit is ``h1 + i * h2`` (mod the number of bits).
+        pos = h1 % num_bits
+        step = h2 % num_bits or 1
+        for _ in self._probes:
+            if not bits[pos >> 3] >> (pos & 7) & 1:
+                bits[pos >> 3] |= 1 << (pos & 7)
+                new = True
+            pos += step
+            if pos >= num_bits:
+                pos -= num_bits
+        if new:
+            self.count += 1
+        return new
+
+
+class HashSet64:
+    """
+    An open-addressing set of 64-bit hashes in a flat array (8 bytes
+    per slot), kept at most half full. Grows if more than ``capacity``
+    elements are added.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        :param capacity: Expected number of elements.
+        """
+        if capacity < 1:
+            raise ValueError("`capacity` must be >= 1")
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        size = 1 << max(4, (2 * capacity - 1).bit_length())
+        self.table = array('Q', bytes(8 * size))
+        self.mask = size - 1
+        self.max_count = size // 2
+
+    @property
+    def nbytes(self):
+        return len(self.table) * self.table.itemsize
+
+    def false_positive_rate(self):
+        """The chance that a new element collides with one already added."""
+        return self.count / 2 ** 64
+
+    def add(self, h: int):
+        """
+        Add a 64-bit hash.
+        :return: ``True`` if it was not already present.
+        """
+        # (0 marks an empty slot.)
+        h = h or 1
+        table = self.table
+        mask = self.mask
+        i = h & mask
+        while True:
+            slot = table[i]
+            if not slot:
+                break
+            if slot == h:
+                return False
+            i = (i + 1) & mask
+        table[i] = h
+        self.count += 1
+        if self.count > self.max_count:
+            self._grow()
+        return True
+
+    def _grow(self):
+        old = self.table
+        self._allocate(2 * self.max_count)
+        self.count = 0
+        for h in old:
+            if h:
+                self.add(h)
+
+
+class Deduplicator:
+    """
+    Tracks the rows seen so far, to filter out duplicates and report
+    the duplicate rate. Rows may be strings or ``LabeledDescription``
+    objects (which are compared by their text).
+    """
+
+    def __init__(self, capacity: int, method='bloom', error_rate=1e-4):
+        """
+        :param capacity: Expected number of unique rows.
+        :param method: ``'bloom'`` (for a ``BloomFilter``; the least
+         memory) or ``'hash'`` (for a ``HashSet64``; almost no false
+         positives).
+        :param error_rate: Target false-positive rate, for ``'bloom'``.
+        """
+        if method == 'bloom':
+            self._seen = BloomFilter(capacity, error_rate)
+        elif method == 'hash':
+            self._seen = HashSet64(capacity)
+        else:
+            raise ValueError(f"`method` must be one of {DEDUP_METHODS}")
+        self.method = method
+        self.rows = 0
+        self.duplicates = 0
+
+    def add(self, row):
+        """
+        Record a row.
+        :return: ``True`` if it is new (i.e., not a duplicate).
+        """
+        h1, h2 = _hash128(row if isinstance(row, str) else row.text)
+        if self.method == 'bloom':
+            new = self._seen.add(h1, h2)
+        else:
+            new = self._seen.add(h1)
+        self.rows += 1
+        if not new:
+            self.duplicates += 1
+        return new
+
+    def filter(self, rows):
+        """Yield only the new ``rows``."""
+        add = self.add
+        for row in rows:
+            if add(row):
+                yield row
+
+    @property
+    def unique(self):
+        return self.rows - self.duplicates
+
+    def duplicate_rate(self):
+        """The share of rows seen that were duplicates."""
+        return self.duplicates / self.rows if self.rows else 0.0
+
+    def report(self):
+        """
+        Get the duplicate rate and memory use as a dict.
+        """
+        return {
+            'method': self.method,
+            'rows': self.rows,
+            'unique': self.unique,
+            'duplicates': self.duplicates,
+            'duplicate_rate': self.duplicate_rate(),
+            'false_positive_rate': self._seen.false_positive_rate(),
+            'memory_bytes': self._seen.nbytes,
+        }
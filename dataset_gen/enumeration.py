@@ -0,0 +1,349 @@
+"""
+Enumerate every surface form of the aliquot grammar (of
+``DatasetGenerator.gen_desc_qq()``) and of lot / multi-section lists
+(of ``DatasetGenerator._elements_to_str_list()``), e.g., for parser
+regression tests that need rare forms like ``'qrtr'`` or ``'—'``.
+
+Forms are generated lazily, so the complete space (within the depth
+limits) can be streamed without holding it in memory. Each form comes
+with its probability under a generator's vocabularies and weights, for
+``stratified_sample()``.
+
+Example:
+    for form in enumerate_aliquots(DatasetGenerator(), max_components=2, max_groups=1):
+        assert parse(form.text) == form.label
+"""
+
+import heapq
+import random
+from itertools import combinations, product
+from typing import NamedTuple
+
+from .dataset_gen import ALIQUOT_CONTINUE, ALIQUOT_START, DatasetGenerator
+
+
+class SurfaceForm(NamedTuple):
+    """One surface form, and its ground truth."""
+    text: str
+    # The probability of this exact form (with the same structure, for
+    # element lists) under the generator's vocabularies and weights.
+    weight: float
+    # Aliquot codes (as in ``Tract.aliquots``), or the covered lots /
+    # sections (as in ``Tract.lots`` / ``Tract.secs``).
+    label: tuple
+
+
+def _probabilities(weight_dict: dict):
+    """Get ``(element, probability)`` for each element of a weighted vocabulary."""
+    total = sum(weight_dict.values())
+    return [(element, weight / total) for element, weight in weight_dict.items()]
+
+
+def _aliquot_modes(generator):
+    """
+    The distinct ``(abbrev_words, grammar, probability)`` of each
+    abbreviation mode.
+    """
+    abbrev_wt = generator.desc_abbrev_wt
+    frac_wt = generator.frac_abbrev_wt
+    modes = {}
+    for abbrev_words, abbrev_frac, p in (
+            (False, False, 1 - abbrev_wt),
+            (True, False, abbrev_wt * (1 - frac_wt)),
+            (True, True, abbrev_wt * frac_wt),
+    ):
+        grammar = generator.vocab.ALIQUOT_GRAMMARS[abbrev_words, abbrev_frac]
+        key = (abbrev_words, id(grammar))
+        if key in modes:
+            modes[key][2] += p
+        else:
+            modes[key] = [abbrev_words, grammar, p]
+    return [tuple(mode) for mode in modes.values()]
+
+
+def _aliquot_structures(transitions, qq_continue_wt, desc_continue_wt, max_components, max_groups):
+    """
+    Walk the grammar's states.
+    :return: A generator of ``(groups, probability)``, where ``groups``
+     is a tuple of the aliquot groups, each a tuple of ``(group,
+     is_half)`` for each of its components.
+    """
+    def walk(state, done, current, p):
+        options = transitions[state]
+        for group, next_state, is_half in options:
+            if next_state is None:
+                # "ALL" (see ``enumerate_aliquots()``).
+                continue
+            p_comp = p / len(options)
+            components = current + ((group, is_half),)
+            # End the aliquot group here...
+            p_end = p_comp * (1 - qq_continue_wt)
+            groups = done + (components,)
+            yield groups, p_end * (1 - desc_continue_wt)
+            if len(groups) < max_groups:
+                yield from walk(ALIQUOT_CONTINUE, groups, (), p_end * desc_continue_wt)
+            # ...or continue it.
+            if len(components) < max_components:
+                yield from walk(next_state, done, components, p_comp * qq_continue_wt)
+
+    return walk(ALIQUOT_START, (), (), 1.0)
+
+
+def enumerate_aliquots(generator: DatasetGenerator = None, max_components: int = 2, max_groups: int = 2):
+    """
+    Lazily enumerate every aliquot description that
+    ``generator.gen_desc_qq()`` can produce (each spelling, fraction
+    style, "of the" connector and comma), within the limits.
+
+    :param generator: The ``DatasetGenerator`` whose vocabularies and
+     weights to use. Defaults to one with default settings.
+    :param max_components: Max number of components in each aliquot
+     group (e.g., 2 for ``'N/2 of the NE/4'``).
+    :param max_groups: Max number of comma-separated aliquot groups.
+    :return: A generator of ``SurfaceForm``, labeled with aliquot codes.
+    """
+    if max_components < 1 or max_groups < 1:
+        raise ValueError("`max_components` and `max_groups` must be >= 1")
+    if generator is None:
+        generator = DatasetGenerator()
+    vocab = generator.vocab
+    modes = _aliquot_modes(generator)
+
+    # "ALL" (the same in every mode).
+    all_forms = {}
+    for _, grammar, p_mode in modes:
+        options = grammar.transitions[ALIQUOT_START]
+        for group, next_state, _ in options:
+            if next_state is None:
+                for element, p in _probabilities(group):
+                    all_forms[element] = all_forms.get(element, 0.0) + p_mode / len(options) * p
+    for element, p in all_forms.items():
+        yield SurfaceForm(element, p, ('ALL',))
+
+    commas = _probabilities(vocab.QQ_COMMA)
+    for abbrev_words, grammar, p_mode in modes:
+        quarter_fracs = _probabilities(grammar.quarter_fracs)
+        half_fracs = _probabilities(grammar.half_fracs)
+        structures = _aliquot_structures(
+            grammar.transitions, generator.qq_continue_wt, generator.desc_continue_wt, max_components, max_groups)
+        for groups, p_structure in structures:
+            components = [component for group in groups for component in group]
+            # Fractions that are not used do not change the text (but
+            # may change which "of the" connectors are allowed).
+            used_quarters = quarter_fracs if any(not is_half for _, is_half in components) else [(None, 1.0)]
+            used_halves = half_fracs if any(is_half for _, is_half in components) else [(None, 1.0)]
+            uses_of_the = any(len(group) > 1 for group in groups)
+            group_commas = commas if len(groups) > 1 else [(None, 1.0)]
+            element_choices = [_probabilities(group) for group, _ in components]
+            for quarter_wd, p_quarter in used_quarters:
+                for half_wd, p_half in used_halves:
+                    of_thes = [(None, 1.0)]
+                    if uses_of_the:
+                        of_thes = _of_the_probabilities(
+                            vocab, grammar, abbrev_words, quarter_wd, half_wd, quarter_fracs, half_fracs)
+                    p_fracs = p_mode * p_structure * p_quarter * p_half
+                    fracs = (quarter_wd, half_wd)
+                    for of_the, p_of_the in of_thes:
+                        for comma, p_comma in group_commas:
+                            for elements in product(*element_choices):
+                                p = p_fracs * p_of_the * p_comma
+                                texts = []
+                                codes = []
+                                i = 0
+                                for group in groups:
+                                    group_texts = []
+                                    group_codes = []
+                                    for _, is_half in group:
+                                        element, p_element = elements[i]
+                                        i += 1
+                                        p *= p_element
+                                        group_texts.append(element + fracs[is_half])
+                                        group_codes.append(vocab.ALIQUOT_CODES[element])
+                                    texts.append(of_the.join(group_texts) if of_the is not None else group_texts[0])
+                                    codes.append(''.join(group_codes))
+                                text = comma.join(texts) if comma is not None else texts[0]
+                                yield SurfaceForm(text, p, tuple(codes))
+
+
+def _of_the_probabilities(vocab, grammar, abbrev_words, quarter_wd, half_wd, quarter_fracs, half_fracs):
+    """
+    The probability of each "of the" connector, given the fractions
+    (where ``None`` is a fraction that is drawn but not used).
+    """
+    quarters = quarter_fracs if quarter_wd is None else [(quarter_wd, 1.0)]
+    halves = half_fracs if half_wd is None else [(half_wd, 1.0)]
+    dist = {}
+    for q_wd, p_q in quarters:
+        for h_wd, p_h in halves:
+            options = vocab.OF_THE
+            if (h_wd, q_wd) in grammar.no_blank_of_the:
+                options = vocab.OF_THE_NONBLANK
+            for of_the, p in _probabilities(options):
+                if of_the == '' and not abbrev_words:
+                    of_the = ' '
+                dist[of_the] = dist.get(of_the, 0.0) + p_q * p_h * p
+    return list(dist.items())
+
+
+# The arguments that ``DatasetGenerator`` uses to render each kind of list.
+# kind --> (type word vocabulary, "and" vocabulary, thru_wt, plural_s_wt, min_count)
+_LIST_KINDS = {
+    'lots': ('LOT', 'QQ_COMMA', 0.4, 0.9, 1),
+    'sections': ('SECTION', 'MULTISEC_COMMA', 0.02, 0.5, 2),
+}
+
+
+def enumerate_element_lists(
+        generator: DatasetGenerator = None,
+        kind: str = 'lots',
+        element_lists=None,
+        max_count: int = 3,
+):
+    """
+    Lazily enumerate every way that a ``DatasetGenerator`` can render
+    each list of lots (as in ``.gen_lots()``) or of sections (as in
+    ``.gen_multisec()``): each type word, plural, "through" and "and"
+    word (and spacing), and where "through" is used.
+
+    :param generator: The ``DatasetGenerator`` whose vocabularies to
+     use. Defaults to one with default settings.
+    :param kind: ``'lots'`` or ``'sections'``.
+    :param element_lists: The lists of numbers to render. Defaults to
+     every combination of the generator's ``.avail_lots`` (or
+     ``.avail_sec``), of up to ``max_count`` numbers.
+    :param max_count: Max number of numbers in each list (for the
+     default ``element_lists``).
+    :return: A generator of ``SurfaceForm``, labeled with the covered
+     numbers. Each form's weight is its probability given its list of
+     numbers.
+    """
+    if kind not in _LIST_KINDS:
+        raise ValueError(f"`kind` must be one of {tuple(_LIST_KINDS)}")
+    if generator is None:
+        generator = DatasetGenerator()
+    type_vocab, and_vocab, thru_wt, plural_s_wt, min_count = _LIST_KINDS[kind]
+    vocab = generator.vocab
+    if element_lists is None:
+        pool = sorted(generator._lot_pool if kind == 'lots' else generator._sec_pool)
+        element_lists = (
+            elements
+            for count in range(min_count, max_count + 1)
+            for elements in combinations(pool, count)
+        )
+    type_words = _probabilities(getattr(vocab, type_vocab))
+    thru_words = _probabilities(vocab.THROUGH)
+    and_words = _probabilities(getattr(vocab, and_vocab))
+    for elements in element_lists:
+        forms = _element_list_forms(vocab, sorted(elements), type_words, thru_words, and_words, thru_wt, plural_s_wt)
+        for text, (p, covered) in forms.items():
+            yield SurfaceForm(text, p, covered)
+
+
+def _element_list_forms(vocab, elements, type_words, thru_words, and_words, thru_wt, plural_s_wt):
+    """
+    Every rendering of one sorted list of ``elements``, per
+    ``DatasetGenerator._elements_to_str_list()``.
+    :return: A dict of ``{text: (probability, covered)}``.
+    """
+    forms = {}
+    elems_str = [str(elem) for elem in elements]
+    for type_word, p_type in type_words:
+        plurals = [(False, 1.0)]
+        if type_word not in vocab.PLURAL_DISALLOWED:
+            plurals = [(True, plural_s_wt), (False, 1 - plural_s_wt)]
+        for thru_wd, p_thru in thru_words:
+            thrus = [(f" {thru_wd} ", 1.0)]
+            if thru_wd not in vocab.REQUIRE_SPACE:
+                thrus = [(f" {thru_wd} ", 0.2), (thru_wd, 0.8)]
+            for and_wd, p_and in and_words:
+                if and_wd in vocab.REQUIRE_SPACE:
+                    and_wd = f" {and_wd} "
+                for (plural_ok, p_plural), (thru, p_spaced) in product(plurals, thrus):
+                    p = p_type * p_thru * p_and * p_plural * p_spaced
+                    for connectors, p_connectors in _connector_patterns(elements, thru, and_wd, thru_wt):
+                        covered = list(elements[:1])
+                        for connector, l_i, l_j in zip(connectors, elements, elements[1:]):
+                            if connector == thru:
+                                covered.extend(range(l_i + 1, l_j))
+                            covered.append(l_j)
+                        covered = tuple(covered)
+                        plural_s = 's' if len(elements) > 1 and plural_ok else ''
+                        everytimes = [(False, 1.0)]
+                        if type_word in vocab.PLURAL_DISALLOWED or not plural_ok:
+                            everytimes = [(True, 0.9), (False, 0.1)]
+                        spaces = [(' ', 1.0)]
+                        if type_word in vocab.SECTION_LOT_NOSPACE_OK:
+                            spaces = [('', 0.95), (' ', 0.05)]
+                        for (everytime, p_everytime), (space, p_space) in product(everytimes, spaces):
+                            if everytime:
+                                strs = [f"{type_word}{plural_s}{space}{elem}" for elem in elems_str]
+                            else:
+                                strs = [f"{type_word}{plural_s}{space}{elems_str[0]}", *elems_str[1:]]
+                            parts = [strs[0]]
+                            for connector, elem in zip(connectors, strs[1:]):
+                                parts.append(connector)
+                                parts.append(elem)
+                            text = ''.join(parts)
+                            p_form = p * p_connectors * p_everytime * p_space
+                            if text in forms:
+                                p_form += forms[text][0]
+                            forms[text] = (p_form, covered)
+    return forms
+
+
+def _connector_patterns(elements, thru_wd, and_wd, thru_wt):
+    """
+    Every sequence of connectors between the ``elements`` (with
+    "through" only across gaps, and never twice in a row).
+    :return: A generator of ``(connectors, probability)``.
+    """
+    def walk(i, connectors, p):
+        if i == len(elements) - 1:
+            yield connectors, p
+            return
+        through_was_last = bool(connectors) and connectors[-1] == thru_wd
+        if elements[i + 1] - elements[i] > 1 and not through_was_last:
+            yield from walk(i + 1, connectors + (thru_wd,), p * thru_wt)
+            yield from walk(i + 1, connectors + (and_wd,), p * (1 - thru_wt))
+        else:
+            yield from walk(i + 1, connectors + (and_wd,), p)
+
+    return walk(0, (), 1.0)
+
+
+def stratified_sample(forms, k: int, key=None, seed=None):
+    """
+    Sample up to ``k`` forms from each stratum of ``forms`` (without
+    replacement, in proportion to their weights), in one pass over a
+    stream of any length (e.g., from ``enumerate_aliquots()``).
+
+    :param forms: An iterable of ``SurfaceForm`` (or of anything with a
+     ``.weight``).
+    :param k: Max number of forms per stratum.
+    :param key: (Optional) Function to get a form's stratum (e.g.,
+     ``lambda form: form.label``). Defaults to a single stratum.
+    :param seed: (Optional) Seed for the sample.
+    :return: A dict of ``{stratum: [form, ...]}``.
+    """
+    if k < 1:
+        raise ValueError("`k` must be >= 1")
+    expovariate = random.Random(seed).expovariate
+    # Weighted reservoir sampling (Efraimidis-Spirakis): keep the ``k``
+    # forms with the greatest ``u ** (1 / weight)``, compared by its log,
+    # ``log(u) / weight`` (i.e., ``-Exp(1) / weight``), because the power
+    # underflows to 0.0 for the tiny weights of most forms.
+    reservoirs = {}
+    for i, form in enumerate(forms):
+        if form.weight <= 0:
+            continue
+        stratum = key(form) if key is not None else None
+        entry = (-expovariate(1.0) / form.weight, i, form)
+        reservoir = reservoirs.setdefault(stratum, [])
+        if len(reservoir) < k:
+            heapq.heappush(reservoir, entry)
+        elif entry[0] > reservoir[0][0]:
+            heapq.heapreplace(reservoir, entry)
+    return {
+        stratum: [form for _, _, form in sorted(reservoir, reverse=True)]
+        for stratum, reservoir in reservoirs.items()
+    }
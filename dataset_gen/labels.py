@@ -0,0 +1,36 @@
+"""
+Structured ground-truth labels for generated descriptions.
+"""
+
+from typing import NamedTuple, Optional
+
+
+class Tract(NamedTuple):
+    """
+    The ground truth for one section (or multi-section) description,
+    and where each of its parts appears in the description's text.
+
+    Numbers are ints. Directions are canonical uppercase letters
+    (``'N'``, ``'S'``, ``'E'``, ``'W'``). Aliquots are canonical codes,
+    one per aliquot group in the description, read in order (e.g.,
+    ``"N/2 of the NE/4"`` is ``'N2NE'``, and ``"all"`` is ``'ALL'``).
+    Any element dropped from the text is ``None``. Spans are
+    ``(start, end)`` indexes into the text.
+    """
+    twp: Optional[int]
+    ns: Optional[str]
+    rge: Optional[int]
+    ew: Optional[str]
+    pm: Optional[str]
+    secs: tuple
+    lots: tuple
+    aliquots: tuple
+    twprge_span: tuple
+    sec_span: tuple
+    desc_span: tuple
+
+
+class LabeledDescription(NamedTuple):
+    """A generated description and the ``Tract`` labels within it."""
+    text: str
+    tracts: tuple
@@ -0,0 +1,251 @@
+"""
+Mix generated PLSS descriptions with metes-and-bounds / free-text
+filler (drawn from ``MB_MARKERS`` and ``LOREM_IPSUM``), for hard and
+negative examples.
+
+The filler corpus is indexed once (as a ``TokenIndex``), so that a run
+of any number of words is a single string slice, and adding filler to a
+row costs a handful of RNG draws.
+
+Example:
+    noisy = NoiseGenerator(DatasetGenerator(seed=42), negative_wt=0.2)
+    for row in noisy.generate_many(1_000_000, labeled=True):
+        ...
+"""
+
+from functools import partial
+
+from . import dataset_gen as _dg
+from ._weighted import WeightedDict
+from .dataset_gen import DatasetGenerator, LAYOUT_SEPARATOR, _resolve_layouts
+from .labels import LabeledDescription
+
+# Stripped from the end of a run of filler.
+TRAILING_PUNCTUATION = '.,;:'
+
+# Between filler and a description.
+FILLER_JOINER = WeightedDict({
+    ' ': 1.0,
+    ', ': 0.5,
+    '; ': 0.3,
+    '. ': 0.2,
+})
+
+
+class TokenIndex:
+    """
+    A corpus of tokens, joined into one string, with the offsets of
+    each token, so that any run of consecutive tokens is a single slice
+    of the string. (A run ends before any trailing punctuation of its
+    last token, so that it can be followed by a comma, etc.)
+    """
+
+    __slots__ = ('text', 'starts', 'ends')
+
+    def __init__(self, tokens):
+        """
+        :param tokens: The tokens (e.g., words), in order.
+        """
+        tokens = [token for token in tokens if token]
+        if not tokens:
+            raise ValueError("`tokens` must not be empty")
+        self.text = ' '.join(tokens)
+        starts = []
+        ends = []
+        pos = 0
+        for token in tokens:
+            starts.append(pos)
+            ends.append(pos + (len(token.rstrip(TRAILING_PUNCTUATION)) or len(token)))
+            pos += len(token) + 1
+        self.starts = tuple(starts)
+        self.ends = tuple(ends)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def run(self, start: int, count: int):
+        """Get the ``count`` tokens beginning at token ``start``, space-separated."""
+        return self.text[self.starts[start]:self.ends[start + count - 1]]
+
+
+class NoiseGenerator:
+    """
+    Generate rows that mix the descriptions of a ``DatasetGenerator``
+    with filler text: filler before and/or after a description, between
+    the descriptions combined into one row, and rows of filler alone
+    (negative examples, with no ``Tract`` labels).
+
+    Filler is a run of words from the corpus, with a marker (e.g.,
+    ``'thence'``, ``'right of way'``) and another run appended any
+    number of times. All draws are made from the generator's ``.rng``,
+    so a seeded generator gives the same rows.
+    """
+
+    def __init__(
+            self,
+            generator: DatasetGenerator = None,
+            negative_wt=0.1,
+            prefix_wt=0.4,
+            suffix_wt=0.4,
+            interleave_wt=0.5,
+            marker_wt=0.5,
+            min_words=2,
+            max_words=12,
+            max_markers=4,
+            corpus: list = None,
+            markers: list = None,
+            lowercase=True,
+    ):
+        """
+        :param generator: The ``DatasetGenerator`` for the descriptions
+         (and the RNG). Defaults to a new one with default settings.
+        :param negative_wt: Chance that a row is only filler.
+        :param prefix_wt: Chance of filler before the description(s).
+        :param suffix_wt: Chance of filler after the description(s).
+        :param interleave_wt: Chance of filler (instead of a comma)
+         between each of the descriptions combined into a row.
+        :param marker_wt: Chance to append a marker and another run of
+         words to the filler (repeatedly, up to ``max_markers``).
+        :param min_words: Min number of words in each run.
+        :param max_words: Max number of words in each run.
+        :param max_markers: Max number of markers in each filler.
+        :param corpus: The words to draw runs from. Defaults to
+         ``LOREM_IPSUM``.
+        :param markers: The markers to draw from. Defaults to
+         ``MB_MARKERS``.
+        :param lowercase: Whether to lowercase the corpus (as are the
+         generated descriptions).
+        """
+        if generator is None:
+            generator = DatasetGenerator()
+        if corpus is None:
+            corpus = _dg.LOREM_IPSUM
+        if markers is None:
+            markers = _dg.MB_MARKERS
+        if lowercase:
+            corpus = [word.lower() for word in corpus]
+        self.generator = generator
+        self.index = TokenIndex(corpus)
+        self.markers = tuple(markers)
+        if not self.markers:
+            raise ValueError("`markers` must not be empty")
+        if not 1 <= min_words <= max_words <= len(self.index):
+            raise ValueError("Must have 1 <= `min_words` <= `max_words` <= number of words in `corpus`")
+        self.negative_wt = negative_wt
+        self.prefix_wt = prefix_wt
+        self.suffix_wt = suffix_wt
+        self.interleave_wt = interleave_wt
+        self.marker_wt = marker_wt
+        self.min_words = min_words
+        self.max_words = max_words
+        self.max_markers = max_markers
+
+    def gen_filler(self):
+        """Generate filler text, with no PLSS description."""
+        parts = []
+        self._filler(parts)
+        return ''.join(parts)
+
+    def _filler(self, parts: list):
+        """
+        Append filler text to ``parts``.
+        :return: The length of the filler.
+        """
+        random = self.generator.rng.random
+        index = self.index
+        markers = self.markers
+        min_words = self.min_words
+        word_choices = self.max_words - min_words + 1
+        # A run of ``count`` words can begin at any of ``n_starts - count`` words.
+        n_starts = len(index) + 1
+
+        count = min_words + int(random() * word_choices)
+        run = index.run(int(random() * (n_starts - count)), count)
+        parts.append(run)
+        length = len(run)
+        for _ in range(self.max_markers):
+            if random() >= self.marker_wt:
+                break
+            marker = markers[int(random() * len(markers))]
+            count = min_words + int(random() * word_choices)
+            run = index.run(int(random() * (n_starts - count)), count)
+            parts.extend((' ', marker, ' ', run))
+            length += len(marker) + len(run) + 2
+        return length
+
+    def _joiner(self, parts: list):
+        """
+        Append the text between filler and a description to ``parts``.
+        :return: Its length.
+        """
+        joiner = self.generator.choose_weighted(FILLER_JOINER)
+        parts.append(joiner)
+        return len(joiner)
+
+    def gen_noisy(self, layouts, labeled=False):
+        """
+        Generate a row of filler and descriptions (in one layout, or a
+        combination of layouts as in
+        ``DatasetGenerator.gen_combo_desc()``).
+
+        :param layouts: A single layout (e.g., ``'TRS_desc'``) or a
+         list of layouts.
+        :param labeled: If ``True``, return a ``LabeledDescription``
+         (whose spans account for the filler) instead of a string.
+        """
+        return self._gen_row(_resolve_layouts(layouts), labeled)
+
+    def _gen_row(self, templates: list, labeled: bool):
+        gen = self.generator
+        random = gen.rng.random
+        parts = []
+        tracts = [] if labeled else None
+        if random() < self.negative_wt:
+            self._filler(parts)
+        else:
+            pos = 0
+            if random() < self.prefix_wt:
+                pos += self._filler(parts)
+                pos += self._joiner(parts)
+            for i, template in enumerate(templates):
+                if i and random() < self.interleave_wt:
+                    pos += self._joiner(parts)
+                    pos += self._filler(parts)
+                    pos += self._joiner(parts)
+                elif i:
+                    parts.append(LAYOUT_SEPARATOR)
+                    pos += len(LAYOUT_SEPARATOR)
+                pos = gen._render_layout(template, parts, pos, tracts)
+            if random() < self.suffix_wt:
+                self._joiner(parts)
+                self._filler(parts)
+        text = ''.join(parts)
+        if labeled:
+            return LabeledDescription(text, tuple(tracts))
+        return text
+
+    def generate_many(
+            self,
+            n: int,
+            layouts: list = None,
+            layout_weights: list = None,
+            chunk_size=4096,
+            labeled=False,
+    ):
+        """
+        Lazily generate ``n`` rows of filler and descriptions. The
+        parameters are as in ``DatasetGenerator.generate_many()``.
+
+        :return: A generator of strings (or ``LabeledDescription``
+         objects).
+        """
+        layout_func = partial(self._layout_func, labeled=labeled)
+        return self.generator._generate_rows(n, layouts, layout_weights, chunk_size, layout_func)
+
+    def _layout_func(self, layout, labeled=False):
+        """
+        Get the function that generates a row of filler and
+        descriptions in the specified ``layout``, or a list of layouts
+        to combine (as in ``DatasetGenerator._layout_func()``).
+        """
+        return partial(self._gen_row, _resolve_layouts(layout), labeled)
@@ -0,0 +1,223 @@
+"""
+Generate large datasets across a pool of worker processes.
+
+The ``n`` requested rows are split into fixed-size shards, and each
+shard is generated from its own random stream, seeded from the master
+seed and the shard's index. Because the shards (and their seeds) do not
+depend on how many workers there are, the output is identical for any
+worker count.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+from itertools import count as count_from
+
+from .dataset_gen import DatasetGenerator
+
+DEFAULT_SHARD_SIZE = 10_000
+
+
+def derive_seed(master_seed: int, index: int) -> int:
+    """
+    Derive a 64-bit seed for a shard (or row, etc.) from the master
+    seed and its index. Stable across processes and Python versions.
+    """
+    digest = blake2b(f"{master_seed}:{index}".encode('ascii'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def iter_shards(n: int, shard_size: int = DEFAULT_SHARD_SIZE):
+    """
+    Split ``n`` rows into shards.
+    :return: A generator of ``(shard_index, start_row, row_count)``.
+    """
+    if n < 0:
+        raise ValueError("`n` must be >= 0")
+    if shard_size < 1:
+        raise ValueError("`shard_size` must be >= 1")
+    for shard_index, start in enumerate(range(0, n, shard_size)):
+        yield shard_index, start, min(shard_size, n - start)
+
+
+def generate_shard(
+        seed: int,
+        count: int,
+        layouts: list = None,
+        layout_weights: list = None,
+        generator_kwargs: dict = None,
+        labeled: bool = False,
+        noise_kwargs: dict = None,
+):
+    """
+    Generate a single shard of ``count`` descriptions from the given
+    ``seed``.
+
+    :param noise_kwargs: If given, mix the descriptions with filler
+     text, per a ``NoiseGenerator`` with these keyword arguments.
+    :return: A list of description strings (or ``LabeledDescription``
+     objects, if ``labeled=True``).
+    """
+    generator = DatasetGenerator(**(generator_kwargs or {}))
+    generator.reseed(seed)
+    if noise_kwargs is not None:
+        from .noise import NoiseGenerator
+        generator = NoiseGenerator(generator, **noise_kwargs)
+    return list(generator.generate_many(count, layouts=layouts, layout_weights=layout_weights, labeled=labeled))
+
+
+def _write_shard(path, seed, count, layouts, layout_weights, generator_kwargs, noise_kwargs):
+    """Generate a shard and write it to ``path``, one row per line."""
+    rows = generate_shard(seed, count, layouts, layout_weights, generator_kwargs, noise_kwargs=noise_kwargs)
+    with open(path, 'w', encoding='utf-8', newline='\n') as file:
+        for row in rows:
+            file.write(row)
+            file.write('\n')
+    return path
+
+
+def _run_ordered(func, tasks, workers, mp_context):
+    """
+    Run ``func(*task)`` for each task, yielding results in task order.
+    No more than ``2 * workers`` tasks are in flight at once, so a slow
+    consumer does not let finished shards pile up in memory.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for task in tasks:
+            yield func(*task)
+        return
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+        in_flight = deque()
+        for task in tasks:
+            in_flight.append(pool.submit(func, *task))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def generate_parallel(
+        n: int,
+        seed: int = 0,
+        workers: int = None,
+        layouts: list = None,
+        layout_weights: list = None,
+        generator_kwargs: dict = None,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        mp_context=None,
+        labeled: bool = False,
+        noise_kwargs: dict = None,
+        dedup=None,
+):
+    """
+    Generate ``n`` descriptions across a process pool, yielding them
+    in order.
+
+    :param n: Number of descriptions to generate.
+    :param seed: Master seed. The same seed (and ``shard_size``)
+     always produces the same output, regardless of ``workers``.
+    :param workers: Number of worker processes. Defaults to the number
+     of CPUs. If 1 (or fewer), generates in the current process.
+    :param layouts: Layouts to choose from for each row (see
+     ``DatasetGenerator.generate_many()``).
+    :param layout_weights: Optional weights for ``layouts``.
+    :param generator_kwargs: Keyword arguments for constructing the
+     ``DatasetGenerator`` in each worker.
+    :param shard_size: Number of rows per shard.
+    :param mp_context: Optional ``multiprocessing`` context (e.g., for
+     ``'spawn'``).
+    :param labeled: If ``True``, yield ``LabeledDescription`` objects
+     instead of strings.
+    :param noise_kwargs: If given, mix the descriptions with filler
+     text, per a ``NoiseGenerator`` with these keyword arguments (see
+     ``dataset_gen.noise``).
+    :param dedup: (Optional) A ``dataset_gen.dedup.Deduplicator``.
+     If given, duplicate rows are dropped, and more shards are
+     generated until ``n`` unique rows are yielded. (Rows are filtered
+     in order, so the output is still the same for any number of
+     workers.) Raises a ``RuntimeError`` if a whole shard's worth of
+     rows in a row are duplicates.
+    :return: A generator of description strings (or
+     ``LabeledDescription`` objects).
+    """
+    if dedup is None:
+        shards = iter_shards(n, shard_size)
+    else:
+        if shard_size < 1:
+            raise ValueError("`shard_size` must be >= 1")
+        shards = ((shard_index, None, shard_size) for shard_index in count_from())
+    tasks = (
+        (derive_seed(seed, shard_index), count, layouts, layout_weights, generator_kwargs, labeled, noise_kwargs)
+        for shard_index, _, count in shards
+    )
+    results = _run_ordered(generate_shard, tasks, workers, mp_context)
+    if dedup is None:
+        for rows in results:
+            yield from rows
+    elif n > 0:
+        yield from _unique_rows(n, results, dedup, shard_size)
+
+
+def _unique_rows(n, results, dedup, shard_size):
+    """Yield the first ``n`` unique rows from the shards in ``results``."""
+    in_a_row = 0
+    for rows in results:
+        for row in rows:
+            if dedup.add(row):
+                yield row
+                n -= 1
+                if not n:
+                    results.close()
+                    return
+                in_a_row = 0
+            else:
+                in_a_row += 1
+                if in_a_row >= shard_size:
+                    results.close()
+                    raise RuntimeError(
+                        f"{in_a_row:,} duplicate rows in a row; too few unique descriptions are possible "
+                        f"with these settings")
+
+
+def generate_to_files(
+        n: int,
+        out_dir,
+        seed: int = 0,
+        workers: int = None,
+        layouts: list = None,
+        layout_weights: list = None,
+        generator_kwargs: dict = None,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        filename_template: str = 'shard_{:05d}.txt',
+        mp_context=None,
+        noise_kwargs: dict = None,
+):
+    """
+    Generate ``n`` descriptions across a process pool, with each
+    worker writing its shards directly to its own file in ``out_dir``
+    (one description per line). See ``generate_parallel()`` for the
+    other parameters.
+
+    :param out_dir: Directory to write the shard files to. Will be
+     created if it does not exist.
+    :param filename_template: Format string for each shard's filename,
+     given the shard index.
+    :return: A list of the paths written, in shard order.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = (
+        (
+            os.path.join(out_dir, filename_template.format(shard_index)),
+            derive_seed(seed, shard_index),
+            count,
+            layouts,
+            layout_weights,
+            generator_kwargs,
+            noise_kwargs,
+        )
+        for shard_index, _, count in iter_shards(n, shard_size)
+    )
+    return list(_run_ordered(_write_shard, tasks, workers, mp_context))
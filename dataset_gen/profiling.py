@@ -0,0 +1,361 @@
+"""
+Opt-in instrumentation for ``DatasetGenerator``, to see where
+generation time goes under a given weight configuration.
+
+While a ``Profiler`` is enabled, it shadows the generator's methods
+with timing wrappers (on the instance only), swaps its ``.rng`` for a
+proxy that counts draws, and swaps its ``.vocab`` for a copy whose
+weighted vocabularies (including those in the aliquot grammars) count
+each element drawn from them. Disabling it removes them again, so a
+generator that is not being profiled runs exactly as if this module
+did not exist.
+
+Example:
+    gen = DatasetGenerator(misspell_twp_wt=0.5)
+    with gen.profile() as prof:
+        for _ in gen.generate_many(10_000):
+            pass
+    print(prof.report())
+"""
+
+import copy
+import random
+import time
+from functools import wraps
+
+from . import dataset_gen as _dg
+from ._weighted import WeightedDict
+from .stratified import GRAMMAR_FRACTIONS
+
+# Methods of ``DatasetGenerator`` to time, besides every ``gen_*`` and
+# ``_gen_*`` method.
+PROFILED_HELPERS = (
+    'choose_weighted',
+    'choose_multiple',
+    '_choose_multiple',
+    'roll',
+    'misspell',
+    'misspell_cached',
+    '_elements_to_str_list',
+    '_render_layouts',
+    '_render_layout',
+)
+
+# Methods of ``random.Random`` counted as RNG draws.
+RNG_DRAW_METHODS = (
+    'random',
+    'uniform',
+    'randint',
+    'randrange',
+    'choice',
+    'choices',
+    'sample',
+    'shuffle',
+    'getrandbits',
+)
+
+
+def _profiled_method_names():
+    names = [
+        name for name in vars(_dg.DatasetGenerator)
+        if name.startswith(('gen_', '_gen_'))
+    ]
+    names.extend(PROFILED_HELPERS)
+    return names
+
+
+def _vocabulary_names(vocab):
+    """Map the id of each weighted vocabulary in a ``Vocabulary`` to its name."""
+    return {
+        id(value): name
+        for name, value in vars(vocab).items()
+        if isinstance(value, WeightedDict)
+    }
+
+
+class CountingDict(WeightedDict):
+    """
+    A copy of a ``WeightedDict`` (sharing its compiled table) that
+    counts each element drawn from it, in ``counts[name]`` (and in
+    ``loops[loop]``, if ``loop`` is specified).
+    """
+
+    __slots__ = ('name', 'counts', 'loops', 'loop')
+
+    def __init__(self, weight_dict: WeightedDict, name: str, counts: dict, loops: dict = None, loop: str = None):
+        super().__init__(weight_dict)
+        self._table = weight_dict.table
+        self.name = name
+        self.counts = counts
+        self.loops = loops
+        self.loop = loop
+
+    def sample(self, rand=random.random):
+        counts = self.counts
+        counts[self.name] = counts.get(self.name, 0) + 1
+        if self.loop is not None:
+            self.loops[self.loop] += 1
+        return super().sample(rand)
+
+
+class MethodStats:
+    """Calls and time spent in one method."""
+
+    __slots__ = ('calls', 'cumulative', 'own')
+
+    def __init__(self):
+        self.calls = 0
+        # Total time in the method, including the methods it called.
+        self.cumulative = 0.0
+        # Time in the method itself, excluding profiled methods it called.
+        self.own = 0.0
+
+
+class CountingRandom:
+    """
+    Proxy for a ``random.Random`` that counts calls to its drawing
+    methods (see ``RNG_DRAW_METHODS``), and otherwise defers to it.
+    """
+
+    def __init__(self, rng, counts: dict):
+        self._rng = rng
+        self._counts = counts
+
+    def __getattr__(self, name):
+        attr = getattr(self._rng, name)
+        if name not in RNG_DRAW_METHODS:
+            return attr
+        counts = self._counts
+
+        @wraps(attr)
+        def counted(*args, **kwargs):
+            counts[name] = counts.get(name, 0) + 1
+            return attr(*args, **kwargs)
+
+        # Cache the wrapper so later lookups skip ``__getattr__``.
+        self.__dict__[name] = counted
+        return counted
+
+
+class Profiler:
+    """
+    Counts calls and time per method of a ``DatasetGenerator``, RNG
+    draws, vocabulary draws, and iterations of the generator's loops.
+    Use as a context manager, or call ``.enable()`` and
+    ``.disable()``.
+
+    Draws made in blocks by the NumPy backend are not counted
+    individually.
+    """
+
+    def __init__(self, generator):
+        """
+        :param generator: The ``DatasetGenerator`` to profile.
+        """
+        self.generator = generator
+        self.enabled = False
+        self._orig_rng = None
+        self._orig_vocab = None
+        self.reset()
+
+    def reset(self):
+        """Clear all counts and timings."""
+        self.methods = {}
+        self.rng_draws = {}
+        self.vocab_draws = {}
+        self.loops = {
+            # Iterations of the outer and inner loops of
+            # ``._gen_desc_qq()`` (aliquot groups and components).
+            'gen_desc_qq.groups': 0,
+            'gen_desc_qq.components': 0,
+            # Section words rejected (as ``'§'``) and redrawn by the
+            # rejection loop in ``._gen_multisec()``.
+            'gen_multisec.section_word_redraws': 0,
+        }
+        self.elapsed = 0.0
+        self._started = None
+        # Time spent in the profiled methods called by each active method.
+        self._child_time = []
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disable()
+
+    def enable(self):
+        """Start instrumenting the generator."""
+        if self.enabled:
+            return
+        gen = self.generator
+        for name in _profiled_method_names():
+            setattr(gen, name, self._wrap(name, getattr(gen, name)))
+        self._wrap_loops()
+        self._orig_rng = gen.rng
+        gen.rng = CountingRandom(gen.rng, self.rng_draws)
+        self._orig_vocab = gen.vocab
+        gen.vocab = self._counting_vocabulary(gen.vocab)
+        self._started = time.perf_counter()
+        self.enabled = True
+
+    def disable(self):
+        """Stop instrumenting the generator, and remove all wrappers."""
+        if not self.enabled:
+            return
+        gen = self.generator
+        for name in _profiled_method_names():
+            gen.__dict__.pop(name, None)
+        gen.rng = self._orig_rng
+        self._orig_rng = None
+        gen.vocab = self._orig_vocab
+        self._orig_vocab = None
+        self.elapsed += time.perf_counter() - self._started
+        self._started = None
+        self.enabled = False
+
+    def _wrap(self, name, method):
+        stats = self.methods.setdefault(name, MethodStats())
+        child_time = self._child_time
+        perf_counter = time.perf_counter
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            child_time.append(0.0)
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                own = elapsed - child_time.pop()
+                if child_time:
+                    child_time[-1] += elapsed
+                stats.calls += 1
+                stats.cumulative += elapsed
+                stats.own += own
+
+        return timed
+
+    def _counting_vocabulary(self, vocab):
+        """
+        Copy a ``Vocabulary``, with each weighted vocabulary replaced by
+        a ``CountingDict`` (by its name in ``.vocab_draws``). Draws of
+        aliquot components from the grammars are also counted as
+        ``'gen_desc_qq.components'``.
+        """
+        vocab_draws = self.vocab_draws
+        vocab_names = _vocabulary_names(vocab)
+        counting = copy.copy(vocab)
+        for name, value in vars(vocab).items():
+            if isinstance(value, WeightedDict):
+                setattr(counting, name, CountingDict(value, name, vocab_draws))
+
+        def component(group):
+            name = vocab_names.get(id(group), '<other>')
+            return CountingDict(group, name, vocab_draws, self.loops, 'gen_desc_qq.components')
+
+        grammars = {}
+        counting.ALIQUOT_GRAMMARS = {}
+        for (abbrev_words, abbrev_frac), grammar in vocab.ALIQUOT_GRAMMARS.items():
+            # (Modes may share a grammar.)
+            if id(grammar) not in grammars:
+                quarter_name, half_name, _ = GRAMMAR_FRACTIONS[abbrev_words]
+                counting_grammar = copy.copy(grammar)
+                counting_grammar.quarter_fracs = CountingDict(grammar.quarter_fracs, quarter_name, vocab_draws)
+                counting_grammar.half_fracs = CountingDict(grammar.half_fracs, half_name, vocab_draws)
+                counting_grammar.transitions = tuple(
+                    tuple((component(group), next_state, is_half) for group, next_state, is_half in options)
+                    for options in grammar.transitions
+                )
+                grammars[id(grammar)] = counting_grammar
+            counting.ALIQUOT_GRAMMARS[abbrev_words, abbrev_frac] = grammars[id(grammar)]
+        return counting
+
+    def _wrap_loops(self):
+        """
+        Count loop iterations from the outside of the methods, so that
+        the methods themselves carry no instrumentation.
+        """
+        gen = self.generator
+        loops = self.loops
+        vocab_draws = self.vocab_draws
+
+        choose_weighted = gen.choose_weighted
+
+        def counted_choose_weighted(weight_dict):
+            # (Draws from the vocabulary are counted by its ``CountingDict``.)
+            if not isinstance(weight_dict, CountingDict):
+                vocab_draws['<other>'] = vocab_draws.get('<other>', 0) + 1
+            return choose_weighted(weight_dict)
+
+        gen.choose_weighted = counted_choose_weighted
+
+        gen_desc_qq = gen._gen_desc_qq
+
+        def counted_gen_desc_qq():
+            text, aliquots = gen_desc_qq()
+            loops['gen_desc_qq.groups'] += len(aliquots)
+            return text, aliquots
+
+        gen._gen_desc_qq = counted_gen_desc_qq
+
+        gen_multisec = gen._gen_multisec
+
+        def counted_gen_multisec(*args, **kwargs):
+            before = vocab_draws.get('SECTION', 0)
+            out = gen_multisec(*args, **kwargs)
+            # Every draw of a section word, except the one accepted by the
+            # rejection loop and the one for the type word (``sec_wd``).
+            loops['gen_multisec.section_word_redraws'] += vocab_draws.get('SECTION', 0) - before - 2
+            return out
+
+        gen._gen_multisec = counted_gen_multisec
+
+    def summary(self):
+        """
+        Get the counts and timings as a dict (e.g., to serialize).
+        """
+        elapsed = self.elapsed
+        if self.enabled:
+            elapsed += time.perf_counter() - self._started
+        return {
+            'elapsed': elapsed,
+            'methods': {
+                name: {'calls': stats.calls, 'cumulative': stats.cumulative, 'own': stats.own}
+                for name, stats in self.methods.items()
+                if stats.calls
+            },
+            'rng_draws': dict(self.rng_draws),
+            'vocab_draws': dict(self.vocab_draws),
+            'loops': dict(self.loops),
+        }
+
+    def report(self, sort_by='own', limit: int = None):
+        """
+        Get a plain-text report of the counts and timings.
+
+        :param sort_by: Sort the methods by ``'own'`` time,
+         ``'cumulative'`` time, or ``'calls'``.
+        :param limit: (Optional) Max number of methods to list.
+        """
+        if sort_by not in ('own', 'cumulative', 'calls'):
+            raise ValueError("`sort_by` must be 'own', 'cumulative' or 'calls'")
+        summary = self.summary()
+        methods = sorted(summary['methods'].items(), key=lambda item: item[1][sort_by], reverse=True)
+        lines = [
+            f"Profiled {summary['elapsed']:.3f}s",
+            '',
+            f"{'method':<32} {'calls':>10} {'own s':>9} {'cum s':>9} {'own us/call':>12}",
+        ]
+        for name, stats in methods[:limit]:
+            lines.append(
+                f"{name:<32} {stats['calls']:>10,} {stats['own']:>9.3f} {stats['cumulative']:>9.3f} "
+                f"{stats['own'] / stats['calls'] * 1e6:>12.2f}")
+        for title, counts in (
+                ('RNG draws', summary['rng_draws']),
+                ('Vocabulary draws', summary['vocab_draws']),
+                ('Loop iterations', summary['loops'])):
+            lines.extend(['', f"{title}:"])
+            for name, count in sorted(counts.items(), key=lambda item: item[1], reverse=True):
+                lines.append(f"  {name:<30} {count:>12,}")
+        return '\n'.join(lines)
@@ -0,0 +1,87 @@
+"""
+Alternative random number generators that can be passed to
+``DatasetGenerator(rng=...)``.
+"""
+
+import random
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+class NumpyRandom(random.Random):
+    """
+    A ``random.Random`` drawing from a NumPy bit generator (``PCG64``
+    by default). Floats and 64-bit words are drawn from NumPy in bulk
+    and buffered, and every method of ``random.Random`` (``choice()``,
+    ``sample()``, ``shuffle()``, etc.) is built on top of them.
+
+    Requires NumPy.
+    """
+
+    def __init__(self, seed=None, bit_generator: str = 'PCG64', buffer_size: int = 4096):
+        """
+        :param seed: Seed for the bit generator (an int or ``None``).
+        :param bit_generator: Name of the bit generator class in
+         ``numpy.random`` (e.g., ``'PCG64'``, ``'PCG64DXSM'``,
+         ``'Philox'``, ``'SFC64'``, ``'MT19937'``).
+        :param buffer_size: Number of values to draw from NumPy at a
+         time.
+        """
+        if np is None:
+            raise ImportError("NumpyRandom requires NumPy (`pip install numpy`)")
+        if buffer_size < 1:
+            raise ValueError("`buffer_size` must be >= 1")
+        self.bit_generator = bit_generator
+        self.buffer_size = buffer_size
+        super().__init__(seed)
+
+    def seed(self, a=None, version=2):
+        self._generator = np.random.Generator(getattr(np.random, self.bit_generator)(a))
+        self._floats = []
+        self._words = []
+        self.gauss_next = None
+
+    def random(self):
+        floats = self._floats
+        if not floats:
+            floats.extend(self._generator.random(self.buffer_size).tolist())
+        return floats.pop()
+
+    def _word(self):
+        """Get a random 64-bit int."""
+        words = self._words
+        if not words:
+            words.extend(self._generator.integers(0, 2 ** 64, self.buffer_size, dtype=np.uint64, endpoint=False).tolist())
+        return words.pop()
+
+    def getrandbits(self, k):
+        if k < 0:
+            raise ValueError('number of bits must be non-negative')
+        if k <= 64:
+            return self._word() >> (64 - k)
+        out = 0
+        bits = 0
+        while bits < k:
+            out = (out << 64) | self._word()
+            bits += 64
+        return out >> (bits - k)
+
+    def getstate(self):
+        return (
+            self.bit_generator,
+            self.buffer_size,
+            self._generator.bit_generator.state,
+            list(self._floats),
+            list(self._words),
+            self.gauss_next,
+        )
+
+    def setstate(self, state):
+        self.bit_generator, self.buffer_size, bitgen_state, floats, words, self.gauss_next = state
+        self.seed()
+        self._generator.bit_generator.state = bitgen_state
+        self._floats = list(floats)
+        self._words = list(words)
@@ -0,0 +1,345 @@
+"""
+Stratified generation, to reach a minimum count of rows with each
+vocabulary entry (e.g., the rare ``'tw.'``, ``'sect.'`` or ``'§'``) or
+each layout, in far fewer rows than plain sampling.
+
+Rows are drawn from a *proposal* in which each entry (or layout) that
+has not yet reached its ``min_count`` is drawn as often as the most
+common entry of its vocabulary, and then reverts to its own weight.
+Each row comes with its importance weight: its probability under the
+generator's own weights over its probability under the proposal. So
+weighted statistics of the rows estimate those of plain sampling.
+
+An entry is counted in a row only if it is rendered in its text; draws
+that the generator throws away (e.g., a ``THROUGH`` for lots that are
+not a range) are not counted. (Their importance ratios are still part
+of the row's weight, since they were drawn from the proposal.)
+
+Only the vocabulary draws and the layout are tilted. The generator's
+other rolls (e.g., ``multi_sec_wt``) are not, so an entry drawn only
+after a rare roll is still only reached at that roll's rate.
+
+Example:
+    sampler = DatasetGenerator(seed=42).stratified(min_count=100)
+    for row, weight in sampler.generate():
+        ...
+    print(sampler.report())
+"""
+
+import copy
+import random
+from itertools import accumulate
+
+from ._weighted import WeightedDict
+from .dataset_gen import LAYOUTS, LIST_VOCABULARIES, WEIGHTED_VOCABULARIES, DatasetGenerator, Vocabulary
+
+# Vocabularies that ``Vocabulary`` derives from others (as in
+# ``Vocabulary._compile()``): name --> names of its sources
+DERIVED_VOCABULARIES = {
+    'NORTH': ('NORTH_WORD', 'NORTH_ABBREV'),
+    'SOUTH': ('SOUTH_WORD', 'SOUTH_ABBREV'),
+    'EAST': ('EAST_WORD', 'EAST_ABBREV'),
+    'WEST': ('WEST_WORD', 'WEST_ABBREV'),
+    'OF_THE_NONBLANK': ('OF_THE',),
+}
+# The fractions of each ``AliquotGrammar``:
+# abbrev_words --> (quarter vocabulary, half vocabulary, prefix)
+GRAMMAR_FRACTIONS = {
+    False: ('QUARTER_WORD', 'HALF_WORD', ' '),
+    True: ('QUARTER_FRAC', 'HALF_FRAC', ''),
+}
+
+
+class _ProposalDict(WeightedDict):
+    """
+    A vocabulary of the proposal, which reports each element it draws
+    (and that draw's importance ratio) to its ``StratifiedSampler``.
+    """
+
+    __slots__ = ('true_weights', 'entries', 'ratios', 'sampler')
+
+    def __init__(self, true_weights: dict, entries: dict, sampler):
+        """
+        :param true_weights: The generator's own ``{element: weight}``.
+        :param entries: ``{element: entry}``, where ``entry`` is the
+         ``(vocabulary name, element)`` that a draw counts toward (or
+         ``None`` if it is not counted).
+        :param sampler: The ``StratifiedSampler``.
+        """
+        super().__init__(true_weights)
+        self.true_weights = dict(true_weights)
+        self.entries = entries
+        self.sampler = sampler
+        self.ratios = None
+
+    def tilt(self, unmet: set):
+        """Set the proposal weights, boosting the ``unmet`` entries."""
+        true_weights = self.true_weights
+        boost = max(true_weights.values())
+        entries = self.entries
+        weights = {
+            element: boost if weight and entries[element] in unmet else weight
+            for element, weight in true_weights.items()
+        }
+        self.update(weights)
+        self.ratios = _ratios(true_weights.values(), weights.values(), true_weights)
+        self.compile()
+
+    def sample(self, rand=random.random):
+        element = super().sample(rand)
+        self.sampler._record(self.entries[element], self.ratios[element])
+        return element
+
+
+def _ratios(true_weights, weights, keys):
+    """Get ``{key: true probability / proposal probability}``."""
+    true_weights = list(true_weights)
+    weights = list(weights)
+    true_total = sum(true_weights)
+    total = sum(weights)
+    return {
+        key: (true_weight / true_total) / (weight / total) if weight else 0.0
+        for key, true_weight, weight in zip(keys, true_weights, weights)
+    }
+
+
+class _DrawLog:
+    """
+    The entries drawn in the current row, to which the generator reports
+    the draws that it does not render (see ``DatasetGenerator._draw_log``).
+    """
+
+    __slots__ = ('drawn',)
+
+    def __init__(self):
+        # Entries in the order drawn, with ``None`` for those discarded.
+        self.drawn = []
+
+    def mark(self):
+        """Get the position of the next draw."""
+        return len(self.drawn)
+
+    def discard(self, vocabulary, element):
+        """Discard the latest draw of the ``element`` from the ``vocabulary``."""
+        entries = getattr(vocabulary, 'entries', None)
+        entry = entries[element] if entries is not None else None
+        if entry is None:
+            return
+        drawn = self.drawn
+        for i in range(len(drawn) - 1, -1, -1):
+            if drawn[i] == entry:
+                drawn[i] = None
+                return
+
+    def discard_between(self, start: int, end: int):
+        """Discard the draws between two ``.mark()`` positions."""
+        self.drawn[start:end] = [None] * (end - start)
+
+    def rendered(self):
+        """Get the set of entries that were drawn and not discarded."""
+        rendered = set(self.drawn)
+        rendered.discard(None)
+        return rendered
+
+
+class StratifiedSampler:
+    """
+    Generates rows from a ``DatasetGenerator``, with the draws of rare
+    vocabulary entries and layouts boosted until each is in at least
+    ``min_count`` rows, along with each row's importance weight.
+
+    Entries are ``(vocabulary name, element)``. Entries with a weight of
+    0 are never drawn, and so are not counted.
+    """
+
+    def __init__(
+            self,
+            generator: DatasetGenerator = None,
+            min_count: int = 100,
+            vocabularies: list = None,
+            layouts: list = None,
+            layout_weights: list = None,
+            layout_min_count: int = 0,
+            labeled: bool = False,
+    ):
+        """
+        :param generator: The ``DatasetGenerator`` whose settings,
+         vocabularies and RNG to use. Must use the ``'python'`` backend.
+         Defaults to one with default settings.
+        :param min_count: The number of rows to reach for each entry.
+        :param vocabularies: The names of the vocabularies whose entries
+         to count (see ``WEIGHTED_VOCABULARIES``). Defaults to all.
+        :param layouts: Layouts to choose from for each row (see
+         ``DatasetGenerator.generate_many()``). Defaults to all layouts.
+        :param layout_weights: Optional weights for ``layouts``.
+        :param layout_min_count: The number of rows to reach for each
+         layout.
+        :param labeled: If ``True``, rows are ``LabeledDescription``
+         objects instead of strings.
+        """
+        if generator is None:
+            generator = DatasetGenerator()
+        if generator.backend != 'python':
+            raise ValueError("Stratified sampling requires the 'python' backend")
+        if vocabularies is None:
+            vocabularies = WEIGHTED_VOCABULARIES
+        unknown = [name for name in vocabularies if name not in WEIGHTED_VOCABULARIES]
+        if unknown:
+            raise ValueError(f"Unknown vocabularies: {', '.join(map(str, unknown))}")
+        if layouts is None:
+            layouts = list(LAYOUTS)
+        if layout_weights is None:
+            layout_weights = [1.0] * len(layouts)
+        elif len(layout_weights) != len(layouts):
+            raise ValueError("`layout_weights` must be the same length as `layouts`")
+        if min_count < 0 or layout_min_count < 0:
+            raise ValueError("`min_count` and `layout_min_count` must be >= 0")
+        self.min_count = min_count
+        self.layout_min_count = layout_min_count
+        self.layouts = layouts
+        self.layout_weights = list(layout_weights)
+        self.rows = 0
+        self._weight_sum = 0.0
+        self._weight_sq_sum = 0.0
+        self._weight = 1.0
+        self._log = _DrawLog()
+
+        true_vocab = generator.vocab
+        # entry --> number of rows it was rendered in
+        self.counts = {
+            (name, element): 0
+            for name in vocabularies
+            for element, weight in getattr(true_vocab, name).items()
+            if weight > 0
+        }
+        self._unmet = set(self.counts) if min_count else set()
+        self.layout_counts = [0] * len(layouts)
+
+        self._dicts = []
+        vocabularies = {}
+        for name in WEIGHTED_VOCABULARIES:
+            true_weights = getattr(true_vocab, name)
+            vocabularies[name] = self._proposal(true_weights, {e: (name, e) for e in true_weights})
+        for name in LIST_VOCABULARIES:
+            vocabularies[name] = getattr(true_vocab, name)
+        proposal = Vocabulary(**vocabularies)
+        for name, sources in DERIVED_VOCABULARIES.items():
+            entries = {}
+            for source in sources:
+                entries.update((e, (source, e)) for e in getattr(true_vocab, source))
+            setattr(proposal, name, self._proposal(getattr(true_vocab, name), entries))
+        tilted_grammars = set()
+        for (abbrev_words, abbrev_frac), grammar in proposal.ALIQUOT_GRAMMARS.items():
+            # (Modes may share a grammar.)
+            if id(grammar) in tilted_grammars:
+                continue
+            tilted_grammars.add(id(grammar))
+            true_grammar = true_vocab.ALIQUOT_GRAMMARS[abbrev_words, abbrev_frac]
+            quarter_name, half_name, prefix = GRAMMAR_FRACTIONS[abbrev_words]
+            grammar.quarter_fracs = self._proposal(
+                true_grammar.quarter_fracs, {prefix + e: (quarter_name, e) for e in getattr(true_vocab, quarter_name)})
+            grammar.half_fracs = self._proposal(
+                true_grammar.half_fracs, {prefix + e: (half_name, e) for e in getattr(true_vocab, half_name)})
+        self._tilt()
+
+        self.generator = copy.copy(generator)
+        self.generator.vocab = proposal
+        self.generator._draw_log = self._log
+        self._row_funcs = [self.generator._layout_func(layout, labeled) for layout in layouts]
+        self._tilt_layouts()
+
+    def _proposal(self, true_weights: dict, entries: dict):
+        """Make a ``_ProposalDict``, counting only the draws of counted entries."""
+        counts = self.counts
+        entries = {element: entry if entry in counts else None for element, entry in entries.items()}
+        proposal = _ProposalDict(true_weights, entries, self)
+        self._dicts.append(proposal)
+        return proposal
+
+    def _tilt(self):
+        unmet = self._unmet
+        for proposal in self._dicts:
+            proposal.tilt(unmet)
+
+    def _tilt_layouts(self):
+        true_weights = self.layout_weights
+        layout_min_count = self.layout_min_count
+        boost = max(true_weights)
+        weights = [
+            boost if weight and count < layout_min_count else weight
+            for weight, count in zip(true_weights, self.layout_counts)
+        ]
+        self._layout_cum_weights = list(accumulate(weights))
+        ratios = _ratios(true_weights, weights, range(len(weights)))
+        self._layout_ratios = [ratios[i] for i in range(len(weights))]
+
+    def _record(self, entry, ratio):
+        """Record a draw (from a ``_ProposalDict``) in the current row."""
+        self._weight *= ratio
+        if entry is not None:
+            self._log.drawn.append(entry)
+
+    def done(self):
+        """Whether every entry and layout has reached its target count."""
+        return not self._unmet and all(count >= self.layout_min_count for count in self.layout_counts)
+
+    def unmet(self):
+        """The entries that have not yet reached ``min_count``."""
+        return sorted(self._unmet)
+
+    def generate(self, n: int = None):
+        """
+        Lazily generate rows, with their importance weights.
+
+        :param n: Number of rows to generate. Defaults to as many as it
+         takes for every entry and layout to reach its target count.
+         (Entries that the generator never draws, e.g., from layouts
+         that are not used, will never reach it.)
+        :return: A generator of ``(row, weight)``.
+        """
+        if n is None:
+            while not self.done():
+                yield self._row()
+        else:
+            for _ in range(n):
+                yield self._row()
+
+    def _row(self):
+        self._weight = 1.0
+        log = self._log
+        log.drawn.clear()
+        i = self.generator.rng.choices(range(len(self._row_funcs)), cum_weights=self._layout_cum_weights)[0]
+        row = self._row_funcs[i]()
+        weight = self._weight * self._layout_ratios[i]
+
+        self.rows += 1
+        self._weight_sum += weight
+        self._weight_sq_sum += weight * weight
+        counts = self.counts
+        min_count = self.min_count
+        newly_met = False
+        for entry in log.rendered():
+            counts[entry] += 1
+            if counts[entry] == min_count:
+                self._unmet.discard(entry)
+                newly_met = True
+        if newly_met:
+            self._tilt()
+        self.layout_counts[i] += 1
+        if self.layout_counts[i] == self.layout_min_count:
+            self._tilt_layouts()
+        return row, weight
+
+    def report(self):
+        """
+        Get the progress toward the target counts, and the effective
+        sample size of the weighted rows, as a dict.
+        """
+        return {
+            'rows': self.rows,
+            'entries': len(self.counts),
+            'entries_unmet': len(self._unmet),
+            'layouts_unmet': sum(count < self.layout_min_count for count in self.layout_counts),
+            'mean_weight': self._weight_sum / self.rows if self.rows else 0.0,
+            'effective_sample_size': self._weight_sum ** 2 / self._weight_sq_sum if self.rows else 0.0,
+        }
@@ -0,0 +1,129 @@
+"""
+A virtual dataset of descriptions, in which any row (or range of rows)
+can be generated on its own, without generating the rows before it.
+
+Row ``i`` is generated from a seed derived from the master seed and
+``i`` (see ``dataset_gen.parallel.derive_seed()``), so it is always the
+same, in any process, regardless of which other rows were generated.
+
+Example:
+    dataset = VirtualDataset(100_000_000, seed=42)
+    rows = dataset[5_000_000:5_010_000]
+"""
+
+from collections.abc import Sequence
+from itertools import accumulate
+
+from .dataset_gen import DatasetGenerator, LAYOUTS
+from .parallel import derive_seed
+
+
+class VirtualDataset(Sequence):
+    """
+    A sequence of ``n`` descriptions, each generated when it is
+    accessed (by index, slice or iteration). Nothing is stored, so
+    accessing a row again regenerates it (identically).
+
+    Can be pickled (e.g., to send to data-loader workers).
+    """
+
+    def __init__(
+            self,
+            n: int,
+            seed: int = 0,
+            layouts: list = None,
+            layout_weights: list = None,
+            generator_kwargs: dict = None,
+            labeled: bool = False,
+            noise_kwargs: dict = None,
+    ):
+        """
+        :param n: Number of rows.
+        :param seed: Master seed, from which each row's seed is derived.
+        :param layouts: Layouts to choose from for each row (see
+         ``DatasetGenerator.generate_many()``). Defaults to all layouts.
+        :param layout_weights: Optional weights for ``layouts``.
+        :param generator_kwargs: Keyword arguments for constructing the
+         ``DatasetGenerator``. Rows are always generated with the
+         ``'python'`` backend (``'auto'`` resolves to it): the
+         ``'numpy'`` backend draws in blocks, which reseeding for each
+         row would throw away (at ~0.4 s per row).
+        :param labeled: If ``True``, rows are ``LabeledDescription``
+         objects instead of strings.
+        :param noise_kwargs: If given, mix the descriptions with filler
+         text, per a ``NoiseGenerator`` with these keyword arguments
+         (see ``dataset_gen.noise``).
+        """
+        if n < 0:
+            raise ValueError("`n` must be >= 0")
+        if layouts is None:
+            layouts = list(LAYOUTS)
+        if layout_weights is not None and len(layout_weights) != len(layouts):
+            raise ValueError("`layout_weights` must be the same length as `layouts`")
+        self.n = n
+        self.seed = seed
+        self.layouts = layouts
+        self.layout_weights = layout_weights
+        self.generator_kwargs = generator_kwargs
+        self.labeled = labeled
+        self.noise_kwargs = noise_kwargs
+
+        generator_kwargs = dict(generator_kwargs or {})
+        backend = generator_kwargs.pop('backend', 'python')
+        if backend not in ('python', 'auto'):
+            raise ValueError(f"VirtualDataset requires the 'python' backend, not {backend!r}")
+        self.generator = DatasetGenerator(backend='python', **generator_kwargs)
+        row_source = self.generator
+        if noise_kwargs is not None:
+            from .noise import NoiseGenerator
+            row_source = NoiseGenerator(self.generator, **noise_kwargs)
+        self._row_funcs = [row_source._layout_func(layout, labeled) for layout in layouts]
+        self._cum_weights = None
+        if layout_weights is not None:
+            self._cum_weights = list(accumulate(layout_weights))
+
+    def __reduce__(self):
+        return VirtualDataset, (
+            self.n, self.seed, self.layouts, self.layout_weights, self.generator_kwargs, self.labeled,
+            self.noise_kwargs)
+
+    def __repr__(self):
+        return f"<VirtualDataset of {self.n:,} rows (seed={self.seed})>"
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, index):
+        """
+        Get row ``index``, or a list of the rows in a slice.
+        """
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self.n))]
+        n = self.n
+        i = index.__index__()
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('VirtualDataset index out of range')
+        return self._row(i)
+
+    def __iter__(self):
+        for i in range(self.n):
+            yield self._row(i)
+
+    def iter_range(self, start: int, stop: int):
+        """
+        Lazily generate rows ``start`` through ``stop - 1`` (e.g., for
+        a worker's share of the dataset).
+        """
+        for i in range(*slice(start, stop).indices(self.n)):
+            yield self._row(i)
+
+    def _row(self, i: int):
+        """Generate row ``i`` (which must be in range)."""
+        generator = self.generator
+        generator.reseed(derive_seed(self.seed, i))
+        row_funcs = self._row_funcs
+        if len(row_funcs) == 1:
+            return row_funcs[0]()
+        return generator.rng.choices(row_funcs, cum_weights=self._cum_weights)[0]()
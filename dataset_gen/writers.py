@@ -0,0 +1,277 @@
+"""
+Stream generated descriptions to CSV, JSONL, Parquet or corpus files
+(see ``dataset_gen.corpus``) in fixed-size chunks, so that datasets of
+any size can be written with constant memory.
+
+Rows may be description strings, or ``LabeledDescription`` objects (as
+from ``DatasetGenerator.generate_many(labeled=True)``), in which case
+their ``Tract`` labels are written too.
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+from itertools import islice
+
+from .labels import LabeledDescription
+
+DEFAULT_CHUNK_SIZE = 10_000
+BUFFER_SIZE = 1 << 20
+
+FORMATS = ('csv', 'jsonl', 'parquet', 'corpus')
+COMPRESSIONS = ('gzip', 'zstd')
+_COMPRESSION_EXTS = {
+    '.gz': 'gzip',
+    '.zst': 'zstd',
+}
+
+
+def infer_compression(path):
+    """
+    Infer the compression from the extension of the ``path`` (e.g.,
+    ``'out.jsonl.gz'`` --> ``'gzip'``), or get ``None``.
+    """
+    return _COMPRESSION_EXTS.get(os.path.splitext(os.fspath(path).lower())[1])
+
+
+def infer_format(path):
+    """
+    Infer the output format and compression from the ``path``
+    (e.g., ``'out.jsonl.gz'`` --> ``('jsonl', 'gzip')``).
+    """
+    root, ext = os.path.splitext(os.fspath(path).lower())
+    compression = _COMPRESSION_EXTS.get(ext)
+    if compression is not None:
+        root, ext = os.path.splitext(root)
+    fmt = ext.lstrip('.')
+    if fmt not in FORMATS:
+        raise ValueError(f"Cannot infer output format from {os.fspath(path)!r}")
+    return fmt, compression
+
+
+def open_text(path, compression: str = None, level: int = None):
+    """
+    Open a text file for writing, with large buffered writes and
+    optional ``'gzip'`` or ``'zstd'`` compression. (Zstandard requires
+    the ``zstandard`` package.)
+    """
+    if compression is None:
+        return open(path, 'w', encoding='utf-8', newline='', buffering=BUFFER_SIZE)
+    if compression == 'gzip':
+        raw = gzip.open(path, 'wb', compresslevel=6 if level is None else level)
+    elif compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd compression requires the `zstandard` package")
+        cctx = zstandard.ZstdCompressor(level=3 if level is None else level)
+        raw = cctx.stream_writer(open(path, 'wb'), closefd=True)
+    else:
+        raise ValueError(f"Unknown compression {compression!r}")
+    return io.TextIOWrapper(io.BufferedWriter(raw, BUFFER_SIZE), encoding='utf-8', newline='')
+
+
+def iter_chunks(rows, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Group an iterable of ``rows`` into lists of ``chunk_size``."""
+    if chunk_size < 1:
+        raise ValueError("`chunk_size` must be >= 1")
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def tracts_to_dicts(labeled: LabeledDescription):
+    """Convert the ``Tract`` labels of a ``LabeledDescription`` to dicts."""
+    return [tract._asdict() for tract in labeled.tracts]
+
+
+def write_csv(rows, path, compression: str = None, chunk_size: int = DEFAULT_CHUNK_SIZE, level: int = None):
+    """
+    Write ``rows`` to a CSV file with a ``text`` column (plus a
+    ``tracts`` column of JSON-encoded labels, if the rows are labeled).
+    :return: The number of rows written.
+    """
+    count = 0
+    with open_text(path, compression, level) as file:
+        writer = csv.writer(file)
+        header_written = False
+        for chunk in iter_chunks(rows, chunk_size):
+            labeled = isinstance(chunk[0], LabeledDescription)
+            if not header_written:
+                writer.writerow(['text', 'tracts'] if labeled else ['text'])
+                header_written = True
+            if labeled:
+                writer.writerows(
+                    (row.text, json.dumps(tracts_to_dicts(row), ensure_ascii=False)) for row in chunk)
+            else:
+                writer.writerows((row,) for row in chunk)
+            count += len(chunk)
+        if not header_written:
+            # (No rows, so no labels.)
+            writer.writerow(['text'])
+    return count
+
+
+def write_jsonl(rows, path, compression: str = None, chunk_size: int = DEFAULT_CHUNK_SIZE, level: int = None):
+    """
+    Write ``rows`` to a JSON Lines file, as ``{"text": ...}`` objects
+    (plus ``"tracts"``, if the rows are labeled).
+    :return: The number of rows written.
+    """
+    count = 0
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    with open_text(path, compression, level) as file:
+        for chunk in iter_chunks(rows, chunk_size):
+            if isinstance(chunk[0], LabeledDescription):
+                lines = [dumps({'text': row.text, 'tracts': tracts_to_dicts(row)}) for row in chunk]
+            else:
+                lines = [dumps({'text': row}) for row in chunk]
+            lines.append('')
+            file.write('\n'.join(lines))
+            count += len(chunk)
+    return count
+
+
+def _parquet_schema(pa, labeled: bool):
+    """The Parquet schema for labeled or unlabeled rows."""
+    if not labeled:
+        return pa.schema([('text', pa.string())])
+    span = pa.list_(pa.int64(), 2)
+    tract = pa.struct([
+        ('twp', pa.int64()),
+        ('ns', pa.string()),
+        ('rge', pa.int64()),
+        ('ew', pa.string()),
+        ('pm', pa.string()),
+        ('secs', pa.list_(pa.int64())),
+        ('lots', pa.list_(pa.int64())),
+        ('aliquots', pa.list_(pa.string())),
+        ('twprge_span', span),
+        ('sec_span', span),
+        ('desc_span', span),
+    ])
+    return pa.schema([('text', pa.string()), ('tracts', pa.list_(tract))])
+
+
+def write_parquet(rows, path, compression: str = None, chunk_size: int = DEFAULT_CHUNK_SIZE, level: int = None):
+    """
+    Write ``rows`` to a Parquet file, one row group per chunk, with a
+    ``text`` column (plus a ``tracts`` column of structs, if the rows
+    are labeled). Requires ``pyarrow``.
+
+    :param compression: Parquet column compression (e.g.,
+     ``'snappy'``, ``'gzip'``, ``'zstd'``). Defaults to ``'snappy'``.
+    :return: The number of rows written.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet output requires the `pyarrow` package")
+    count = 0
+    writer = None
+    try:
+        for chunk in iter_chunks(rows, chunk_size):
+            if isinstance(chunk[0], LabeledDescription):
+                columns = {
+                    'text': [row.text for row in chunk],
+                    'tracts': [tracts_to_dicts(row) for row in chunk],
+                }
+                schema = _parquet_schema(pa, labeled=True)
+            else:
+                columns = {'text': chunk}
+                schema = _parquet_schema(pa, labeled=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, schema, compression=compression or 'snappy', compression_level=level)
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            count += len(chunk)
+        if writer is None:
+            # (No rows, so no labels.) Still write a valid, empty file.
+            writer = pq.ParquetWriter(
+                path, _parquet_schema(pa, labeled=False), compression=compression or 'snappy',
+                compression_level=level)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def write_corpus(rows, path, compression: str = None, chunk_size: int = DEFAULT_CHUNK_SIZE, level: int = None):
+    """
+    Write ``rows`` to a memory-mappable corpus file (see
+    ``dataset_gen.corpus``), which has no compression.
+    :return: The number of rows written.
+    """
+    if compression is not None:
+        raise ValueError("The corpus format does not support compression")
+    from . import corpus
+    return corpus.write_corpus(rows, path, chunk_size=chunk_size)
+
+
+_WRITERS = {
+    'csv': write_csv,
+    'jsonl': write_jsonl,
+    'parquet': write_parquet,
+    'corpus': write_corpus,
+}
+
+
+def resolve_output(path, fmt: str = None, compression: str = None):
+    """
+    Get the format and compression to write ``path`` with (checking
+    that they are supported), inferring either that is not specified
+    from the ``path``. The compression is inferred from the extension
+    even if the format is specified (e.g., ``'out.gz'`` with
+    ``fmt='jsonl'`` is gzipped JSON Lines).
+
+    :return: A tuple of ``(fmt, compression)``.
+    """
+    if fmt is None:
+        fmt, inferred_compression = infer_format(path)
+    else:
+        inferred_compression = infer_compression(path)
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown format {fmt!r}")
+    if compression is None:
+        compression = inferred_compression
+    if compression is not None:
+        if fmt == 'corpus':
+            raise ValueError("The corpus format does not support compression")
+        if fmt != 'parquet' and compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression {compression!r}")
+    return fmt, compression
+
+
+def write_rows(
+        rows,
+        path,
+        fmt: str = None,
+        compression: str = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        level: int = None,
+):
+    """
+    Write ``rows`` to ``path`` in chunks of ``chunk_size``, as they
+    are generated.
+
+    :param rows: An iterable of description strings or
+     ``LabeledDescription`` objects (e.g., from
+     ``DatasetGenerator.generate_many()``).
+    :param path: Output file path.
+    :param fmt: ``'csv'``, ``'jsonl'``, ``'parquet'`` or ``'corpus'``.
+     If not specified, inferred from the ``path`` (e.g.,
+     ``'out.csv.gz'``).
+    :param compression: ``'gzip'`` or ``'zstd'`` (or, for Parquet, any
+     codec that ``pyarrow`` supports). If not specified, inferred from
+     the ``path``.
+    :param chunk_size: Number of rows to write at a time.
+    :param level: Optional compression level.
+    :return: The number of rows written.
+    """
+    fmt, compression = resolve_output(path, fmt, compression)
+    return _WRITERS[fmt](rows, path, compression=compression, chunk_size=chunk_size, level=level)
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from dataset_gen.aio import agenerate, agenerate_parallel
+from dataset_gen.dataset_gen import DatasetGenerator
+from dataset_gen.parallel import generate_parallel
+
+
+async def collect(batches):
+    return [batch async for batch in batches]
+
+
+def test_agenerate_matches_generate_many():
+    batches = asyncio.run(collect(agenerate(DatasetGenerator(seed=4), 103, batch_size=10, labeled=True)))
+    assert [len(batch) for batch in batches] == [10] * 10 + [3]
+    rows = [row for batch in batches for row in batch]
+    assert rows == list(DatasetGenerator(seed=4).generate_many(103, labeled=True))
+
+
+def test_agenerate_parallel_matches_generate_parallel():
+    batches = asyncio.run(collect(agenerate_parallel(45, seed=6, workers=2, batch_size=20)))
+    assert [len(batch) for batch in batches] == [20, 20, 5]
+    rows = [row for batch in batches for row in batch]
+    assert rows == list(generate_parallel(45, seed=6, workers=1, shard_size=20))
+
+
+def test_agenerate_zero_rows():
+    assert asyncio.run(collect(agenerate(DatasetGenerator(seed=4), 0))) == []
+
+
+class SlowGenerator(DatasetGenerator):
+    """Generates a row every millisecond, recording how many it has generated."""
+
+    drawn = 0
+
+    def generate_many(self, n, **kwargs):
+        for row in super().generate_many(n, **kwargs):
+            time.sleep(0.001)
+            self.drawn += 1
+            yield row
+
+
+def test_break_stops_generating():
+    generator = SlowGenerator(seed=1)
+
+    async def consume():
+        batches = agenerate(generator, 10_000, batch_size=50, max_pending=3)
+        async for _ in batches:
+            break
+        await batches.aclose()
+        drawn = generator.drawn
+        # The first batch, and at most the one in progress when it stopped.
+        assert 50 <= drawn <= 100
+        assert not any(thread.name.startswith('dataset_gen') for thread in threading.enumerate())
+        await asyncio.sleep(0.1)
+        assert generator.drawn == drawn
+
+    asyncio.run(consume())
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        asyncio.run(collect(agenerate(DatasetGenerator(), 10, batch_size=0)))
+    with pytest.raises(ValueError):
+        asyncio.run(collect(agenerate(DatasetGenerator(), 10, max_pending=0)))
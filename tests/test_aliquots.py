@@ -0,0 +1,99 @@
+from collections import Counter
+
+import pytest
+
+from dataset_gen import dataset_gen as dg
+from dataset_gen.dataset_gen import DatasetGenerator
+
+
+def legacy_desc_qq(gen):
+    """
+    The aliquot generator before it was compiled into ``AliquotGrammar``
+    tables (with the generator's own RNG), as a reference.
+    """
+    abbrev_words = gen.roll(gen.desc_abbrev_wt)
+    abbrev_frac = abbrev_words and gen.roll(gen.frac_abbrev_wt)
+    quarter__, half__ = dg.QUARTER_WORD, dg.HALF_WORD
+    ns_compatible__, ew_compatible__ = dg.NS_COMPATIBLE_WORD, dg.EW_COMPATIBLE_WORD
+    aliquot_halves__, aliquot_quarters__ = dg.ALIQUOT_HALVES_WORD, dg.ALIQUOT_QUARTERS_WORD
+    if abbrev_words or abbrev_frac:
+        quarter__, half__ = dg.QUARTER_FRAC, dg.HALF_FRAC
+        ns_compatible__, ew_compatible__ = dg.NS_COMPATIBLE_ABBREV, dg.EW_COMPATIBLE_ABBREV
+        aliquot_halves__, aliquot_quarters__ = dg.ALIQUOT_HALVES_ABBREV, dg.ALIQUOT_QUARTERS_ABBREV
+    quarter_wd = gen.choose_weighted(quarter__)
+    half_wd = gen.choose_weighted(half__)
+    if not abbrev_words:
+        quarter_wd = ' ' + quarter_wd
+        half_wd = ' ' + half_wd
+    while True:
+        of_the = gen.choose_weighted(dg.OF_THE)
+        if not (half_wd in dg.OF_THE_BLANK_DISALLOWED
+                and quarter_wd in dg.OF_THE_BLANK_DISALLOWED
+                and of_the in dg.OF_THE_BLANK):
+            break
+    if of_the == '' and not abbrev_words:
+        of_the = ' '
+    desc_list = []
+    available = aliquot_halves__ + aliquot_quarters__ + [dg.ALL]
+    components = []
+    while True:
+        while True:
+            group = gen.rng.choice(available)
+            if group is dg.ALL:
+                return gen.choose_weighted(group)
+            if any(group is q for q in aliquot_quarters__):
+                available = aliquot_quarters__
+            elif any(group is ns for ns in ns_compatible__):
+                available = ns_compatible__ + aliquot_quarters__
+            elif any(group is ew for ew in ew_compatible__):
+                available = ew_compatible__ + aliquot_quarters__
+            component = gen.choose_weighted(group)
+            if component in dg.ALIQUOT_HALF_ELEMENTS:
+                component += half_wd
+            elif component in dg.ALIQUOT_QUARTER_ELEMENTS:
+                component += quarter_wd
+            components.append(component)
+            if not gen.roll(gen.qq_continue_wt):
+                break
+        desc_list.append(of_the.join(components))
+        components = []
+        if not gen.roll(gen.desc_continue_wt):
+            break
+        available = aliquot_halves__ + aliquot_quarters__
+    return gen.choose_weighted(dg.QQ_COMMA).join(desc_list)
+
+
+WEIGHTS = [
+    {},
+    {'desc_abbrev_wt': 1.0, 'frac_abbrev_wt': 1.0},
+    {'desc_abbrev_wt': 1.0, 'frac_abbrev_wt': 0.0},
+    {'desc_abbrev_wt': 0.0, 'qq_continue_wt': 0.9, 'desc_continue_wt': 0.5},
+]
+
+
+@pytest.mark.parametrize('kwargs', WEIGHTS)
+def test_same_as_legacy(kwargs):
+    gen = DatasetGenerator(seed=13, **kwargs)
+    legacy_gen = DatasetGenerator(seed=13, **kwargs)
+    for _ in range(5_000):
+        assert gen.gen_desc_qq() == legacy_desc_qq(legacy_gen)
+
+
+@pytest.mark.parametrize('kwargs', WEIGHTS)
+def test_grammar_rules(kwargs):
+    gen = DatasetGenerator(seed=14, **kwargs)
+    halves = {'N2', 'S2', 'E2', 'W2'}
+    group_counts = Counter()
+    for _ in range(5_000):
+        _, aliquots = gen._gen_desc_qq()
+        group_counts[len(aliquots)] += 1
+        if aliquots == ('ALL',):
+            continue
+        for code in aliquots:
+            assert code != 'ALL'
+            parts = [code[i:i + 2] for i in range(0, len(code), 2)]
+            used = [part for part in parts if part in halves]
+            # No halves after a quarter, and no N/S half crossed with an E/W half.
+            assert parts[:len(used)] == used
+            assert set(used) <= {'N2', 'S2'} or set(used) <= {'E2', 'W2'}
+    assert group_counts[1] and group_counts[2]
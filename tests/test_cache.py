@@ -0,0 +1,41 @@
+from dataset_gen._cache import ComponentCache
+from dataset_gen.dataset_gen import DatasetGenerator
+
+
+def test_get_or_render_counts_lookups():
+    cache = ComponentCache(4)
+    first = cache.get_or_render(('t', '', 154, '', 'n'))
+    second = cache.get_or_render(('t', '', 154, '', 'n'))
+    assert first == 't154n'
+    assert second is first
+    assert cache.stats() == {'lookups': 2, 'hits': 1, 'hit_rate': 0.5, 'size': 1}
+
+
+def test_get_or_render_uses_render():
+    cache = ComponentCache(4)
+    assert cache.get_or_render(('sec', 4), lambda key: f"{key[0]} {key[1]}") == 'sec 4'
+
+
+def test_bounded():
+    cache = ComponentCache(3)
+    for i in range(100):
+        cache.get_or_render(('sec ', i))
+    assert cache.stats()['size'] <= 2 * 3
+    # Recently used components survive a turnover.
+    cache.get_or_render(('sec ', 99))
+    assert cache.renders == 100
+
+
+def test_output_unchanged():
+    plain = DatasetGenerator(seed=5)
+    cached = DatasetGenerator(seed=5, component_cache_size=4096)
+    assert list(plain.generate_many(2_000)) == list(cached.generate_many(2_000))
+    stats = cached.component_cache_stats()
+    assert stats.keys() == {'twp', 'rge', 'sec'}
+    assert stats['sec']['hit_rate'] > 0.5
+
+
+def test_off_by_default():
+    gen = DatasetGenerator(seed=5)
+    assert gen.component_cache_size == 0
+    assert gen.component_cache_stats() == {}
@@ -0,0 +1,68 @@
+from collections import Counter
+
+import pytest
+
+from dataset_gen.dataset_gen import DatasetGenerator
+
+
+@pytest.mark.parametrize('weight, limit, expected', [
+    (0.0, 5, 0),
+    (-0.5, 5, 0),
+    (1.0, 5, 5),
+    (1.5, 5, 5),
+    (0.5, 0, 0),
+    (1.0, 0, 0),
+    (0.5, -3, 0),
+])
+def test_count_successes_edges(weight, limit, expected):
+    gen = DatasetGenerator(seed=1)
+    assert all(gen._count_successes(weight, limit) == expected for _ in range(100))
+
+
+@pytest.mark.parametrize('weight', [0.01, 0.6, 0.9])
+def test_count_successes_distribution(weight):
+    gen = DatasetGenerator(seed=2)
+    limit = 8
+    trials = 20_000
+    counts = Counter(gen._count_successes(weight, limit) for _ in range(trials))
+    assert max(counts) <= limit
+    # As with rolling ``weight`` until it fails: P(count >= k) = weight ** k.
+    for k in (1, 2, 4, limit):
+        share = sum(c for count, c in counts.items() if count >= k) / trials
+        assert share == pytest.approx(weight ** k, abs=0.015)
+
+
+def test_choose_multiple():
+    gen = DatasetGenerator(seed=3)
+    for _ in range(500):
+        chosen = gen.choose_multiple(list(range(1, 37)), min_count=2, repeat_wt=0.5)
+        assert len(chosen) >= 2
+        assert chosen == sorted(set(chosen))
+        assert set(chosen) <= set(range(1, 37))
+    assert gen.choose_multiple([3, 1, 2], min_count=1, repeat_wt=1.0, reverse=True) == [3, 2, 1]
+    assert gen.choose_multiple([3, 1, 2], min_count=3, repeat_wt=0.0) == [1, 2, 3]
+
+
+def test_choose_multiple_with_duplicates():
+    gen = DatasetGenerator(seed=4)
+    for _ in range(100):
+        chosen = gen.choose_multiple([1, 1, 2, 2, 3], min_count=1, repeat_wt=1.0)
+        assert chosen == [1, 2, 3]
+
+
+def test_choose_multiple_too_few():
+    with pytest.raises(ValueError):
+        DatasetGenerator().choose_multiple([1], min_count=2)
+
+
+def test_choose_multiple_is_uniform():
+    gen = DatasetGenerator(seed=5)
+    trials = 10_000
+    counts = Counter()
+    for _ in range(trials):
+        counts.update(gen.choose_multiple(range(10), min_count=1, repeat_wt=0.3))
+    # Each draws 1 + about 0.3 / 0.7 elements, each equally likely.
+    expected = trials * (1 + 0.3 / 0.7) / 10
+    assert sorted(counts) == list(range(10))
+    for count in counts.values():
+        assert count == pytest.approx(expected, rel=0.08)
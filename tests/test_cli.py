@@ -0,0 +1,72 @@
+import csv
+import gzip
+import json
+
+import pytest
+
+from dataset_gen.cli import main
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as file:
+        return list(csv.reader(file))
+
+
+def test_csv(tmp_path, capsys):
+    path = tmp_path / 'out.csv'
+    assert main(['-n', '25', '-o', str(path), '--seed', '1']) == 0
+    rows = read_csv(path)
+    assert rows[0] == ['text'] and len(rows) == 26
+    assert 'Wrote 25 rows' in capsys.readouterr().err
+
+
+def test_same_output_for_any_workers(tmp_path):
+    paths = [tmp_path / 'one.jsonl', tmp_path / 'two.jsonl']
+    for path, workers in zip(paths, ('1', '2')):
+        main(['-n', '30', '-o', str(path), '--seed', '7', '--workers', workers, '--shard-size', '8'])
+    assert paths[0].read_text(encoding='utf-8') == paths[1].read_text(encoding='utf-8')
+
+
+def test_zero_rows_parquet(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = tmp_path / 'out.parquet'
+    assert main(['-n', '0', '-o', str(path)]) == 0
+    assert pq.read_table(path).num_rows == 0
+
+
+def test_zero_rows_csv(tmp_path):
+    path = tmp_path / 'out.csv'
+    assert main(['-n', '0', '-o', str(path)]) == 0
+    assert read_csv(path) == [['text']]
+
+
+def test_unknown_extension(tmp_path, capsys):
+    path = tmp_path / 'out.txt'
+    with pytest.raises(SystemExit) as excinfo:
+        main(['-n', '5', '-o', str(path)])
+    assert excinfo.value.code == 2
+    assert 'Cannot infer output format' in capsys.readouterr().err
+    assert not path.exists()
+
+
+def test_format_with_unknown_extension(tmp_path):
+    path = tmp_path / 'out.txt'
+    assert main(['-n', '5', '-o', str(path), '--format', 'jsonl']) == 0
+    assert len(path.read_text(encoding='utf-8').splitlines()) == 5
+
+
+def test_format_keeps_compression_from_extension(tmp_path):
+    path = tmp_path / 'out.jsonl.gz'
+    assert main(['-n', '5', '-o', str(path), '--format', 'jsonl', '--labeled']) == 0
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        rows = [json.loads(line) for line in file]
+    assert len(rows) == 5 and 'tracts' in rows[0]
+
+
+@pytest.mark.parametrize('args', [
+    ['--compression', 'lzma'],
+    ['--format', 'corpus', '--compression', 'gzip'],
+])
+def test_invalid_compression(tmp_path, args):
+    with pytest.raises(SystemExit):
+        main(['-n', '5', '-o', str(tmp_path / 'out.csv')] + args)
@@ -0,0 +1,95 @@
+import pytest
+
+from dataset_gen.columnar import ColumnarDataset
+from dataset_gen.dataset_gen import DatasetGenerator
+from dataset_gen.labels import LabeledDescription
+
+
+@pytest.fixture(scope='module')
+def rows():
+    return list(DatasetGenerator(seed=1).generate_many(500))
+
+
+@pytest.fixture(scope='module')
+def labeled_rows():
+    return list(DatasetGenerator(seed=1).generate_many(500, labeled=True))
+
+
+def test_round_trip(rows):
+    dataset = ColumnarDataset.from_rows(rows)
+    assert not dataset.labeled
+    assert len(dataset) == len(rows)
+    assert list(dataset) == rows
+    assert [dataset[i] for i in range(len(rows))] == rows
+    assert dataset[-1] == rows[-1]
+    assert bytes(dataset.text_bytes(7)) == rows[7].encode('utf-8')
+
+
+def test_labeled_round_trip(labeled_rows):
+    dataset = ColumnarDataset.from_rows(labeled_rows)
+    assert dataset.labeled
+    assert list(dataset) == labeled_rows
+    for row in dataset:
+        assert isinstance(row, LabeledDescription)
+        for tract in row.tracts:
+            start, end = tract.desc_span
+            assert 0 <= start <= end <= len(row.text)
+
+
+def test_non_ascii_and_empty_rows():
+    rows = ['', 'NE¼ of Sec 1', '', 'T1N-R2W ½']
+    assert list(ColumnarDataset.from_rows(rows)) == rows
+    assert len(ColumnarDataset.from_rows([])) == 0
+
+
+def test_views(labeled_rows):
+    dataset = ColumnarDataset.from_rows(labeled_rows)
+    view = dataset[10:100:3]
+    assert list(view) == labeled_rows[10:100:3]
+    assert list(view[2:5]) == labeled_rows[10:100:3][2:5]
+    taken = dataset.take([5, 0, 5, 499])
+    assert list(taken) == [labeled_rows[i] for i in (5, 0, 5, 499)]
+    assert list(taken.take([3, 0])) == [labeled_rows[499], labeled_rows[5]]
+
+
+def test_shuffle(rows):
+    dataset = ColumnarDataset.from_rows(rows)
+    shuffled = dataset.shuffle(seed=0)
+    assert list(shuffled) != rows
+    assert sorted(shuffled) == sorted(rows)
+    assert list(dataset.shuffle(seed=0)) == list(shuffled)
+    assert sorted(dataset[:50].shuffle(seed=1)) == sorted(rows[:50])
+
+
+def test_compact(labeled_rows):
+    dataset = ColumnarDataset.from_rows(labeled_rows)
+    view = dataset.shuffle(seed=0)[:100]
+    compact = view.compact()
+    assert list(compact) == list(view)
+    assert compact.nbytes < view.nbytes
+    assert compact.nbytes < dataset.nbytes
+
+
+def test_nbytes(rows):
+    dataset = ColumnarDataset.from_rows(rows)
+    text = sum(len(row.encode('utf-8')) for row in rows)
+    # The text, plus 8 bytes per offset.
+    assert dataset.nbytes == text + 8 * (len(rows) + 1)
+    # A slice shares the storage; a shuffle adds its index.
+    assert dataset[:10].nbytes == dataset.nbytes
+    assert dataset.shuffle(seed=0).nbytes == dataset.nbytes + 8 * len(rows)
+
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_dump_and_load(tmp_path, labeled_rows, use_mmap):
+    dataset = ColumnarDataset.from_rows(labeled_rows)
+    path = tmp_path / 'all.corpus'
+    assert dataset.dump(path) == len(labeled_rows)
+    loaded = ColumnarDataset.load(path, use_mmap=use_mmap)
+    assert loaded.labeled
+    assert list(loaded) == labeled_rows
+
+    view = dataset.shuffle(seed=0)[:50]
+    path = tmp_path / 'view.corpus'
+    view.dump(path)
+    assert list(ColumnarDataset.load(path, use_mmap=use_mmap)) == list(view)
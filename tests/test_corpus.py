@@ -0,0 +1,150 @@
+import json
+import sys
+
+import pytest
+
+from dataset_gen.columnar import ColumnarDataset
+from dataset_gen.corpus import ALIGNMENT, CORPUS_VERSION, HEADER, MAGIC, CorpusWriter, open_corpus, write_corpus
+from dataset_gen.dataset_gen import DatasetGenerator
+
+
+@pytest.fixture(scope='module')
+def rows():
+    return list(DatasetGenerator(seed=2).generate_many(300))
+
+
+@pytest.fixture(scope='module')
+def labeled_rows():
+    return list(DatasetGenerator(seed=2).generate_many(300, labeled=True))
+
+
+def read_footer(path):
+    data = path.read_bytes()
+    magic, version, big_endian, footer_offset, footer_length = HEADER.unpack_from(data)
+    assert (magic, version, big_endian) == (MAGIC, CORPUS_VERSION, sys.byteorder == 'big')
+    assert footer_offset + footer_length == len(data)
+    return json.loads(data[footer_offset:].decode('utf-8'))
+
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_round_trip(tmp_path, rows, use_mmap):
+    path = tmp_path / 'rows.corpus'
+    assert write_corpus(rows, path) == len(rows)
+    dataset = open_corpus(path, use_mmap=use_mmap)
+    assert not dataset.labeled
+    assert list(dataset) == rows
+    assert dataset[123] == rows[123]
+
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_labeled_round_trip(tmp_path, labeled_rows, use_mmap):
+    path = tmp_path / 'labeled.corpus'
+    write_corpus(labeled_rows, path)
+    dataset = open_corpus(path, use_mmap=use_mmap)
+    assert dataset.labeled
+    assert list(dataset) == labeled_rows
+    # The spans still point at the text of each tract.
+    for row, original in zip(dataset, labeled_rows):
+        for tract, original_tract in zip(row.tracts, original.tracts):
+            for span in ('twprge_span', 'sec_span', 'desc_span'):
+                start, end = getattr(tract, span)
+                original_start, original_end = getattr(original_tract, span)
+                assert row.text[start:end] == original.text[original_start:original_end]
+
+
+def test_footer(tmp_path, labeled_rows):
+    path = tmp_path / 'labeled.corpus'
+    write_corpus(labeled_rows, path)
+    meta = read_footer(path)
+    assert meta['rows'] == len(labeled_rows)
+    assert meta['labeled']
+    assert meta['text'] == [HEADER.size, sum(len(row.text.encode('utf-8')) for row in labeled_rows)]
+    assert 'offsets' in meta['columns'] and 'tract_offsets' in meta['columns']
+    for typecode, itemsize, offset, count in meta['columns'].values():
+        assert offset % ALIGNMENT == 0
+    assert meta['columns']['offsets'][3] == len(labeled_rows) + 1
+
+
+def test_empty(tmp_path):
+    path = tmp_path / 'empty.corpus'
+    assert write_corpus([], path) == 0
+    assert read_footer(path)['rows'] == 0
+    assert len(open_corpus(path)) == 0
+
+
+def test_not_a_corpus(tmp_path):
+    path = tmp_path / 'rows.csv'
+    path.write_text('text\nT1N-R2W Sec 1\n')
+    with pytest.raises(ValueError):
+        open_corpus(path)
+    path.write_bytes(b'')
+    with pytest.raises(ValueError):
+        open_corpus(path)
+
+
+def test_bad_version(tmp_path, rows):
+    path = tmp_path / 'rows.corpus'
+    write_corpus(rows, path)
+    data = bytearray(path.read_bytes())
+    magic, version, *rest = HEADER.unpack_from(data)
+    HEADER.pack_into(data, 0, magic, version + 1, *rest)
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        open_corpus(path)
+
+
+def test_error_removes_file(tmp_path, rows):
+    path = tmp_path / 'rows.corpus'
+    with pytest.raises(RuntimeError):
+        with CorpusWriter(path) as writer:
+            writer.write_rows(rows[:10])
+            raise RuntimeError
+    assert not path.exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize('kwargs', [{'chunk_size': 1}, {'chunk_size': 7}, {'spill_bytes': 100}])
+def test_write_out(tmp_path, labeled_rows, kwargs):
+    path = tmp_path / 'labeled.corpus'
+    drains = 0
+    with CorpusWriter(path, labeled=True, **kwargs) as writer:
+        drain = writer._drain
+
+        def counting_drain():
+            nonlocal drains
+            drains += 1
+            drain()
+
+        writer._drain = counting_drain
+        writer.write(labeled_rows[0])
+        writer.write_rows(labeled_rows[1:])
+    assert drains > len(labeled_rows) // 10
+    assert list(open_corpus(path)) == labeled_rows
+
+
+def test_invalid_chunk_size(tmp_path):
+    with pytest.raises(ValueError):
+        CorpusWriter(tmp_path / 'rows.corpus', chunk_size=0)
+
+
+def test_write_corpus_chunk_size(tmp_path, rows):
+    path = tmp_path / 'rows.corpus'
+    write_corpus(rows, path, chunk_size=16)
+    assert list(open_corpus(path)) == rows
+
+
+def test_copy_rows(tmp_path, labeled_rows):
+    dataset = ColumnarDataset.from_rows(labeled_rows)
+    storage = dataset._storage
+    path = tmp_path / 'copy.corpus'
+    with CorpusWriter(path, labeled=True, tables=storage.tables, chunk_size=10) as writer:
+        writer.write_storage(storage)
+        for i in (3, 1, 4):
+            writer.copy_row(storage, i)
+    copied = open_corpus(path)
+    assert list(copied) == labeled_rows + [labeled_rows[i] for i in (3, 1, 4)]
+
+    with CorpusWriter(tmp_path / 'other.corpus', labeled=True, tables=storage.tables) as writer:
+        writer.copy_row(storage, 0)
+        with pytest.raises(ValueError):
+            writer.write_storage(storage)
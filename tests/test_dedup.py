@@ -0,0 +1,64 @@
+import pytest
+
+from dataset_gen.dataset_gen import DatasetGenerator
+from dataset_gen.dedup import BloomFilter, Deduplicator, HashSet64, _hash128
+
+
+def test_bloom_false_positive_rate():
+    bloom = BloomFilter(20_000, error_rate=0.01)
+    for i in range(20_000):
+        bloom.add(*_hash128(f"row {i}"))
+    # Nothing added is ever reported as new.
+    assert not any(bloom.add(*_hash128(f"row {i}")) for i in range(0, 20_000, 7))
+    assert bloom.false_positive_rate() == pytest.approx(0.01, rel=0.1)
+    # Probe with new elements (restoring the bits after each).
+    bits = bytes(bloom.bits)
+    false_positives = 0
+    for i in range(5_000):
+        if not bloom.add(*_hash128(f"other {i}")):
+            false_positives += 1
+        bloom.bits[:] = bits
+    # 1% of 5,000 is 50 +/- 7.
+    assert 25 < false_positives < 80
+
+
+def test_bloom_size():
+    bloom = BloomFilter(1_000_000, error_rate=1e-4)
+    # About 19.2 bits per element, with 13 hashes.
+    assert bloom.nbytes == pytest.approx(1_000_000 * 19.17 / 8, rel=0.01)
+    assert bloom.num_hashes == 13
+
+
+def test_hash_set_grows_and_finds_duplicates():
+    seen = HashSet64(4)
+    hashes = [_hash128(str(i))[0] for i in range(1_000)] + [0]
+    assert all(seen.add(h) for h in hashes)
+    assert seen.count == len(hashes)
+    assert not any(seen.add(h) for h in hashes)
+    assert seen.count <= seen.max_count
+
+
+@pytest.mark.parametrize('method', ['bloom', 'hash'])
+def test_deduplicator_never_lets_duplicates_through(method):
+    gen = DatasetGenerator(seed=1, avail_twp=[1], avail_rge=[1], avail_sec=[1, 2], qq_continue_wt=0, pm_wt=0)
+    rows = list(gen.generate_many(5_000, layouts=['TRS_desc']))
+    dedup = Deduplicator(capacity=5_000, method=method)
+    unique = list(dedup.filter(rows))
+    assert len(unique) == len(set(unique))
+    assert dedup.duplicates == len(rows) - len(unique)
+    if method == 'hash':
+        assert set(unique) == set(rows)
+    report = dedup.report()
+    assert report['rows'] == 5_000
+    assert report['duplicate_rate'] == dedup.duplicates / 5_000 > 0
+
+
+def test_labeled_rows_compare_by_text():
+    rows = list(DatasetGenerator(seed=2).generate_many(100, labeled=True))
+    dedup = Deduplicator(capacity=100, method='hash')
+    assert len(list(dedup.filter(rows + rows))) == len({row.text for row in rows})
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        Deduplicator(10, method='set')
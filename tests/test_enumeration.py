@@ -0,0 +1,62 @@
+from collections import Counter
+
+import pytest
+
+from dataset_gen.dataset_gen import DatasetGenerator
+from dataset_gen.enumeration import SurfaceForm, enumerate_aliquots, stratified_sample
+
+
+@pytest.fixture(scope='module')
+def forms():
+    return list(enumerate_aliquots(DatasetGenerator(), max_components=2, max_groups=1))
+
+
+def by_label(form):
+    return form.label
+
+
+def test_stratified_sample_is_reproducible(forms):
+    assert stratified_sample(forms, 5, key=by_label, seed=1) == stratified_sample(forms, 5, key=by_label, seed=1)
+
+
+def test_stratified_sample_depends_on_seed(forms):
+    first = stratified_sample(forms, 5, key=by_label, seed=1)
+    second = stratified_sample(forms, 5, key=by_label, seed=2)
+    assert first.keys() == second.keys()
+    differ = sum(first[stratum] != second[stratum] for stratum in first)
+    assert differ > len(first) // 2
+
+
+def test_stratified_sample_of_tiny_weights_depends_on_seed():
+    # Most forms of deeper enumerations have weights around 1e-10.
+    forms = [SurfaceForm(str(i), 1e-10 * (1 + i % 7), ()) for i in range(100)]
+    first = stratified_sample(forms, 5, seed=1)[None]
+    second = stratified_sample(forms, 5, seed=2)[None]
+    assert first != second
+    assert first != forms[:5]
+
+
+def test_stratified_sample_sizes(forms):
+    sample = stratified_sample(forms, 5, key=by_label, seed=1)
+    strata = Counter(form.label for form in forms)
+    assert sample.keys() == strata.keys()
+    for stratum, chosen in sample.items():
+        assert len(chosen) == min(5, strata[stratum])
+        assert len(set(chosen)) == len(chosen)
+        assert all(form.label == stratum for form in chosen)
+
+
+def test_stratified_sample_follows_weights():
+    forms = [SurfaceForm('heavy', 9e-12, ()), SurfaceForm('light', 1e-12, ())]
+    chosen = Counter(stratified_sample(forms, 1, seed=seed)[None][0].text for seed in range(2000))
+    assert 0.85 < chosen['heavy'] / 2000 < 0.95
+
+
+def test_stratified_sample_skips_zero_weights():
+    forms = [SurfaceForm('never', 0.0, ()), SurfaceForm('always', 0.5, ())]
+    assert stratified_sample(forms, 2, seed=1) == {None: [forms[1]]}
+
+
+def test_enumerated_weights_are_probabilities(forms):
+    assert all(0 < form.weight <= 1 for form in forms)
+    assert sum(form.weight for form in forms) <= 1 + 1e-9
@@ -0,0 +1,69 @@
+import types
+
+import pytest
+
+from dataset_gen.dataset_gen import DatasetGenerator
+
+
+def leads_with_twprge(row):
+    """Whether a labeled row is in the ``'TRS_desc'`` layout (rather than ``'desc_STR'``)."""
+    return row.tracts[0].twprge_span[0] == 0
+
+
+def test_lazy_and_reproducible():
+    rows = DatasetGenerator(seed=1).generate_many(100)
+    assert isinstance(rows, types.GeneratorType)
+    rows = list(rows)
+    assert len(rows) == 100 and all(isinstance(row, str) for row in rows)
+    assert list(DatasetGenerator(seed=1).generate_many(100)) == rows
+
+
+def test_zero_rows():
+    assert list(DatasetGenerator().generate_many(0)) == []
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'n': -1},
+    {'n': 5, 'chunk_size': 0},
+    {'n': 5, 'layouts': ['TRS_desc', 'desc_STR'], 'layout_weights': [1]},
+])
+def test_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        DatasetGenerator().generate_many(**kwargs)
+
+
+def test_single_layout():
+    gen = DatasetGenerator(seed=2)
+    rows = list(gen.generate_many(50, layouts=['TRS_desc'], labeled=True))
+    assert all(leads_with_twprge(row) for row in rows)
+    gen = DatasetGenerator(seed=2)
+    assert [row.text for row in rows] == [gen.gen_trs_desc() for _ in range(50)]
+
+
+def test_layout_weights():
+    gen = DatasetGenerator(seed=3)
+    rows = list(gen.generate_many(4_000, layouts=['TRS_desc', 'desc_STR'], layout_weights=[3, 1], labeled=True))
+    share = sum(map(leads_with_twprge, rows)) / len(rows)
+    assert share == pytest.approx(0.75, abs=0.03)
+
+
+def test_zero_weight_layout_is_never_drawn():
+    gen = DatasetGenerator(seed=4)
+    rows = gen.generate_many(500, layouts=['TRS_desc', 'desc_STR'], layout_weights=[0, 1], labeled=True)
+    assert not any(map(leads_with_twprge, rows))
+
+
+def test_combined_layouts():
+    gen = DatasetGenerator(seed=5)
+    rows = list(gen.generate_many(50, layouts=[['TRS_desc', 'desc_STR']], labeled=True))
+    for row in rows:
+        assert len({tract.twprge_span for tract in row.tracts}) == 2
+    gen = DatasetGenerator(seed=5)
+    assert [row.text for row in rows] == [gen.gen_combo_desc(['TRS_desc', 'desc_STR']) for _ in range(50)]
+
+
+def test_chunk_size_only_groups_layout_draws():
+    for chunk_size in (1, 7, 4096):
+        rows = list(DatasetGenerator(seed=6).generate_many(30, layouts=['TRS_desc'], chunk_size=chunk_size))
+        # With one layout, there are no layout draws to group.
+        assert rows == list(DatasetGenerator(seed=6).generate_many(30, layouts=['TRS_desc']))
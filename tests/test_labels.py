@@ -0,0 +1,69 @@
+import pytest
+
+from dataset_gen.dataset_gen import LAYOUTS, DatasetGenerator
+from dataset_gen.labels import LabeledDescription, Tract
+
+# Layout --> the order of its parts in the text.
+PART_ORDER = {
+    'TRS_desc': ('twprge_span', 'sec_span', 'desc_span'),
+    'TR_desc_S': ('twprge_span', 'desc_span', 'sec_span'),
+    'desc_STR': ('desc_span', 'sec_span', 'twprge_span'),
+    'S_desc_TR': ('sec_span', 'desc_span', 'twprge_span'),
+}
+
+
+def test_labeled_text_matches_unlabeled():
+    layouts = list(LAYOUTS) + [['TRS_desc', 'desc_STR']]
+    labeled = DatasetGenerator(seed=8).generate_many(300, layouts=layouts, labeled=True)
+    assert [row.text for row in labeled] == list(DatasetGenerator(seed=8).generate_many(300, layouts=layouts))
+
+
+@pytest.mark.parametrize('layout', list(LAYOUTS))
+def test_spans(layout):
+    gen = DatasetGenerator(seed=9)
+    for _ in range(300):
+        row = gen.gen_labeled(layout)
+        assert isinstance(row, LabeledDescription)
+        assert row.tracts
+        text = row.text
+        for tract in row.tracts:
+            assert isinstance(tract, Tract)
+            spans = [getattr(tract, name) for name in PART_ORDER[layout]]
+            for (_, end), (start, _) in zip(spans, spans[1:]):
+                assert end <= start
+            for start, end in spans:
+                assert 0 <= start <= end <= len(text)
+            twprge = text[slice(*tract.twprge_span)]
+            if tract.twp is not None:
+                assert str(tract.twp) in twprge
+            if tract.rge is not None:
+                assert str(tract.rge) in twprge
+            if tract.pm is not None:
+                assert tract.pm in twprge
+            sec = text[slice(*tract.sec_span)]
+            assert str(tract.secs[0]) in sec and str(tract.secs[-1]) in sec
+            desc = text[slice(*tract.desc_span)]
+            for lot in (tract.lots[0], tract.lots[-1]) if tract.lots else ():
+                assert str(lot) in desc
+            assert tract.lots or tract.aliquots
+
+
+def test_labels_are_canonical():
+    gen = DatasetGenerator(seed=10)
+    for row in gen.generate_many(500, labeled=True):
+        for tract in row.tracts:
+            assert tract.ns in (None, 'N', 'S')
+            assert tract.ew in (None, 'E', 'W')
+            assert list(tract.secs) == sorted(set(tract.secs))
+            for code in tract.aliquots:
+                assert code == 'ALL' or (len(code) % 2 == 0 and code.isupper())
+
+
+def test_combined_layouts():
+    gen = DatasetGenerator(seed=11)
+    row = gen.gen_labeled(['TRS_desc', 'desc_STR'])
+    twprge_spans = sorted({tract.twprge_span for tract in row.tracts})
+    assert len(twprge_spans) == 2
+    # The first block's Twp/Rge leads; the second's trails.
+    assert twprge_spans[0][0] == 0
+    assert twprge_spans[1][1] == len(row.text)
@@ -0,0 +1,85 @@
+import pickle
+
+import pytest
+
+from dataset_gen import dataset_gen as dg
+from dataset_gen.dataset_gen import LAYOUT_TEMPLATES, LAYOUTS, DatasetGenerator, LayoutTemplate, register_layout
+
+
+@pytest.fixture
+def registered():
+    """Remove the layouts registered by a test afterward."""
+    before = dict(LAYOUT_TEMPLATES)
+    yield
+    LAYOUT_TEMPLATES.clear()
+    LAYOUT_TEMPLATES.update(before)
+
+
+@pytest.mark.parametrize('name', list(LAYOUTS))
+def test_builtin_templates_match_methods(name):
+    template = LayoutTemplate(LAYOUT_TEMPLATES[name].template)
+    gen = DatasetGenerator(seed=12)
+    expected = [getattr(gen, LAYOUTS[name])() for _ in range(50)]
+    gen = DatasetGenerator(seed=12)
+    assert [gen.gen_combo_desc([template]) for _ in range(50)] == expected
+
+
+def test_compiled_template():
+    template = LayoutTemplate('Tract {of_the} [{S}: {desc}] in {TR}.')
+    assert not template.twprge_first
+    assert template.sec_first
+    assert template.draws == ('DESC_STR_OF_THE',)
+    text = DatasetGenerator(seed=1).gen_combo_desc([template])
+    assert text.startswith('Tract ') and text.endswith('.')
+    assert ' in ' in text
+
+
+@pytest.mark.parametrize('template', [
+    '{TR} {S} {desc}',
+    '{TR} [{S}: {desc}] [{S}]',
+    '{TR} ]{S}: {desc}[',
+    '[{S}: {desc}]',
+    '{TR} {TR} [{S}: {desc}]',
+    '{TR} [{S}: {S}]',
+    '{TR} [{desc}]',
+    '{S} [{TR}: {desc}]',
+    '{TR} [{S}: {desc}] {nope}',
+    '{TR} [{S}: {desc}] }',
+    '{TR} [{S}: {desc}] {',
+])
+def test_invalid_templates(template):
+    with pytest.raises(ValueError):
+        LayoutTemplate(template)
+
+
+def test_register_layout(registered):
+    template = register_layout('TR_S_desc', '{TR} [{S} {desc}]')
+    assert isinstance(template, LayoutTemplate)
+    assert LAYOUT_TEMPLATES['TR_S_desc'] is template
+    rows = list(DatasetGenerator(seed=2).generate_many(20, layouts=['TR_S_desc'], labeled=True))
+    for row in rows:
+        assert row.tracts[0].twprge_span[0] == 0
+    compiled = LayoutTemplate('[{desc}, {S}], {TR}')
+    assert register_layout('desc_S_TR', compiled) is compiled
+
+
+def test_register_duplicate_layout(registered):
+    with pytest.raises(ValueError):
+        register_layout('TRS_desc', '{TR} [{S} {desc}]')
+    register_layout('custom', '{TR} [{S} {desc}]')
+    with pytest.raises(ValueError):
+        register_layout('custom', '{TR} [{desc} {S}]')
+
+
+def test_unknown_layout():
+    with pytest.raises(ValueError):
+        list(DatasetGenerator().generate_many(1, layouts=['no_such_layout']))
+    with pytest.raises(ValueError):
+        dg._resolve_layout(['TRS_desc'])
+
+
+def test_pickle():
+    template = LayoutTemplate('{TR}; [{S} - {desc}]')
+    copy = pickle.loads(pickle.dumps(template))
+    assert copy.template == template.template
+    assert copy.literals == template.literals
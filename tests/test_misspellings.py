@@ -0,0 +1,46 @@
+import time
+from collections import Counter
+
+import pytest
+
+from dataset_gen.dataset_gen import MAX_TABULATED_SWAPS, DatasetGenerator, misspellings
+
+
+def test_table_is_a_distribution():
+    table = misspellings('twp', a=1, b=3)
+    assert sum(table.values()) == pytest.approx(1.0)
+    assert 'twp' in table
+
+
+def test_table_matches_misspell():
+    gen = DatasetGenerator(seed=1)
+    n = 40_000
+    drawn = Counter(gen.misspell('rge', a=1, b=3) for _ in range(n))
+    table = misspellings('rge', a=1, b=3)
+    assert drawn.keys() <= table.keys()
+    for variant, p in table.items():
+        # Within 5 standard deviations.
+        assert abs(drawn[variant] / n - p) < 5 * (p * (1 - p) / n) ** 0.5 + 1e-9
+
+
+def test_cannot_tabulate_long_swaps():
+    with pytest.raises(ValueError):
+        misspellings('township')
+    with pytest.raises(ValueError):
+        misspellings('township', a=2, b=MAX_TABULATED_SWAPS + 1)
+
+
+def test_misspell_cached_falls_back_for_long_swaps():
+    gen = DatasetGenerator(seed=1)
+    start = time.perf_counter()
+    for word in ('section', 'township'):
+        variant = gen.misspell_cached(word)
+        assert len(variant) <= len(word)
+        assert set(variant) <= set(word)
+    assert time.perf_counter() - start < 1.0
+
+
+def test_misspell_cached_draws_from_table():
+    gen = DatasetGenerator(seed=1)
+    table = misspellings('township', a=2, b=4)
+    assert all(gen.misspell_cached('township', a=2, b=4) in table for _ in range(100))
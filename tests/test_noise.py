@@ -0,0 +1,62 @@
+import pytest
+
+from dataset_gen.dataset_gen import DatasetGenerator
+from dataset_gen.labels import LabeledDescription
+from dataset_gen.noise import NoiseGenerator, TokenIndex
+
+# Layouts combined into one row, with filler between them.
+COMBINED = ['TRS_desc', 'desc_STR', 'S_desc_TR']
+
+
+def check_spans(row: LabeledDescription):
+    text = row.text
+    for tract in row.tracts:
+        twprge = text[slice(*tract.twprge_span)]
+        if tract.twp is not None:
+            assert str(tract.twp) in twprge
+        if tract.rge is not None:
+            assert str(tract.rge) in twprge
+        assert str(tract.secs[0]) in text[slice(*tract.sec_span)]
+        desc = text[slice(*tract.desc_span)]
+        assert desc and desc == desc.strip()
+        if tract.lots:
+            assert str(tract.lots[0]) in desc
+
+
+def test_token_index_runs():
+    index = TokenIndex(['Lorem', 'ipsum,', '', 'dolor', 'sit.'])
+    assert len(index) == 4
+    assert index.run(0, 2) == 'Lorem ipsum'
+    assert index.run(1, 3) == 'ipsum, dolor sit'
+    with pytest.raises(ValueError):
+        TokenIndex([''])
+
+
+def test_seeded_rows_are_reproducible():
+    rows = list(NoiseGenerator(DatasetGenerator(seed=4)).generate_many(200))
+    assert rows == list(NoiseGenerator(DatasetGenerator(seed=4)).generate_many(200))
+
+
+def test_label_spans_align_with_filler():
+    noisy = NoiseGenerator(DatasetGenerator(seed=2), negative_wt=0.0, prefix_wt=1.0, suffix_wt=1.0, interleave_wt=1.0)
+    for row in noisy.generate_many(300, layouts=[COMBINED], labeled=True):
+        assert row.tracts
+        check_spans(row)
+
+
+def test_negative_rows_have_no_tracts():
+    noisy = NoiseGenerator(DatasetGenerator(seed=3), negative_wt=1.0)
+    rows = list(noisy.generate_many(50, labeled=True))
+    assert all(not row.tracts and row.text for row in rows)
+
+
+def test_negative_rate():
+    noisy = NoiseGenerator(DatasetGenerator(seed=5), negative_wt=0.3)
+    rows = list(noisy.generate_many(2_000, labeled=True))
+    rate = sum(not row.tracts for row in rows) / len(rows)
+    assert 0.25 < rate < 0.35
+
+
+def test_invalid_word_counts():
+    with pytest.raises(ValueError):
+        NoiseGenerator(min_words=5, max_words=2)
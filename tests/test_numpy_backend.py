@@ -0,0 +1,69 @@
+import pytest
+
+pytest.importorskip('numpy')
+
+from dataset_gen._numpy_backend import NumpyColumns  # noqa: E402
+from dataset_gen.dataset_gen import DatasetGenerator  # noqa: E402
+
+AVAIL = {'avail_twp': [1, 2, 3], 'avail_rge': [40, 41], 'avail_sec': [7, 9, 11]}
+
+
+def tracts(backend, n=6_000, **kwargs):
+    gen = DatasetGenerator(seed=3, backend=backend, **kwargs)
+    return [tract for row in gen.generate_many(n, labeled=True) for tract in row.tracts]
+
+
+def test_reproducible():
+    rows = list(DatasetGenerator(seed=1, backend='numpy').generate_many(600))
+    assert list(DatasetGenerator(seed=1, backend='numpy').generate_many(600)) == rows
+    assert list(DatasetGenerator(seed=2, backend='numpy').generate_many(600)) != rows
+
+
+def test_reseed():
+    gen = DatasetGenerator(seed=1, backend='numpy')
+    rows = list(gen.generate_many(20))
+    gen.reseed(1)
+    assert list(gen.generate_many(20)) == rows
+
+
+def test_values_are_available():
+    for tract in tracts('numpy', 2_000, **AVAIL):
+        assert tract.twp in (None, *AVAIL['avail_twp'])
+        assert tract.rge in (None, *AVAIL['avail_rge'])
+        # (Sections may be a range, such as "sections 7-11".)
+        assert all(min(AVAIL['avail_sec']) <= sec <= max(AVAIL['avail_sec']) for sec in tract.secs)
+    columns = NumpyColumns(DatasetGenerator(seed=1, backend='numpy', **AVAIL))
+    for _ in range(2_000):
+        assert columns.twp()[1] in AVAIL['avail_twp']
+        assert columns.rge()[1] in AVAIL['avail_rge']
+        assert columns.sec()[1][0] in AVAIL['avail_sec']
+
+
+def frequencies(tract_list):
+    n = len(tract_list)
+    return {
+        'no twp': sum(tract.twp is None for tract in tract_list) / n,
+        'no rge': sum(tract.rge is None for tract in tract_list) / n,
+        'north': sum(tract.ns == 'N' for tract in tract_list) / n,
+        'east': sum(tract.ew == 'E' for tract in tract_list) / n,
+        'pm': sum(tract.pm is not None for tract in tract_list) / n,
+        'low twp': sum(tract.twp is not None and tract.twp <= 100 for tract in tract_list) / n,
+    }
+
+
+def test_distribution_matches_python_backend():
+    python = frequencies(tracts('python'))
+    numpy = frequencies(tracts('numpy'))
+    for name in python:
+        assert numpy[name] == pytest.approx(python[name], abs=0.03), name
+
+
+def test_block_sizes():
+    columns = NumpyColumns(DatasetGenerator(seed=1, backend='numpy'), block_size=2_000, first_block_size=500)
+    sizes = [columns._next_size('twp') for _ in range(4)]
+    assert sizes == [500, 1_000, 2_000, 2_000]
+    columns = NumpyColumns(DatasetGenerator(seed=1, backend='numpy'), block_size=2_000, first_block_size=500)
+    columns.sec()
+    assert len(columns._sec) == 499
+    with pytest.raises(ValueError):
+        NumpyColumns(DatasetGenerator(seed=1), block_size=0)
@@ -0,0 +1,76 @@
+import pytest
+
+from dataset_gen.dedup import Deduplicator
+from dataset_gen.parallel import _unique_rows, derive_seed, generate_parallel, generate_to_files, iter_shards
+
+
+def test_derive_seed_is_stable():
+    # (Fixed values, so that a change to the derivation is caught.)
+    assert derive_seed(42, 0) == 15232497090756937497
+    assert derive_seed(42, 1) == 3969959676567302753
+    assert derive_seed(0, 7) == 15864404452573910296
+    assert derive_seed(42, 0) != derive_seed(43, 0)
+    assert 0 <= derive_seed(10 ** 30, 10 ** 9) < 2 ** 64
+
+
+def test_iter_shards():
+    assert list(iter_shards(25, 10)) == [(0, 0, 10), (1, 10, 10), (2, 20, 5)]
+    assert list(iter_shards(20, 10)) == [(0, 0, 10), (1, 10, 10)]
+    assert list(iter_shards(3, 10)) == [(0, 0, 3)]
+    assert list(iter_shards(0, 10)) == []
+
+
+@pytest.mark.parametrize('n, shard_size', [(-1, 10), (10, 0), (10, -5)])
+def test_iter_shards_invalid(n, shard_size):
+    with pytest.raises(ValueError):
+        list(iter_shards(n, shard_size))
+
+
+def test_same_output_for_any_workers():
+    kwargs = {'seed': 11, 'shard_size': 16, 'labeled': True}
+    rows = list(generate_parallel(50, workers=1, **kwargs))
+    assert len(rows) == 50
+    assert list(generate_parallel(50, workers=2, **kwargs)) == rows
+    # Whole shards do not depend on ``n``.
+    assert list(generate_parallel(32, workers=2, **kwargs)) == rows[:32]
+    assert list(generate_parallel(50, workers=1, **{**kwargs, 'seed': 12})) != rows
+
+
+def test_same_output_with_noise_and_dedup():
+    kwargs = {'seed': 3, 'shard_size': 7, 'noise_kwargs': {}}
+    rows = list(generate_parallel(30, workers=1, dedup=Deduplicator(30, 'hash'), **kwargs))
+    assert len(set(rows)) == 30
+    assert list(generate_parallel(30, workers=2, dedup=Deduplicator(30, 'hash'), **kwargs)) == rows
+
+
+def test_zero_rows():
+    assert list(generate_parallel(0, workers=2)) == []
+    assert list(generate_parallel(0, workers=1, dedup=Deduplicator(1))) == []
+
+
+def test_unique_rows_stops_at_n():
+    def shards():
+        yield ['a', 'b', 'a']
+        yield ['c', 'd']
+        raise AssertionError("Drew a shard that was not needed")
+
+    assert list(_unique_rows(3, shards(), Deduplicator(10, 'hash'), shard_size=3)) == ['a', 'b', 'c']
+
+
+def test_unique_rows_raises_when_too_few_are_possible():
+    def shards():
+        while True:
+            yield ['a', 'b', 'a', 'b']
+
+    with pytest.raises(RuntimeError):
+        list(_unique_rows(3, shards(), Deduplicator(10, 'hash'), shard_size=4))
+
+
+def test_generate_to_files(tmp_path):
+    paths = generate_to_files(25, tmp_path / 'shards', seed=5, workers=2, shard_size=10)
+    assert [path.rsplit('_', 1)[1] for path in paths] == ['00000.txt', '00001.txt', '00002.txt']
+    lines = []
+    for path in paths:
+        with open(path, encoding='utf-8') as file:
+            lines.extend(file.read().splitlines())
+    assert lines == list(generate_parallel(25, seed=5, workers=1, shard_size=10))
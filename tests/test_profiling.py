@@ -0,0 +1,84 @@
+from dataset_gen._weighted import WeightedDict
+from dataset_gen.dataset_gen import DatasetGenerator
+
+
+def test_multisec_redraws_count_only_rejected_draws():
+    gen = DatasetGenerator(seed=1, vocab={'SECTION': {'sec': 1.0}})
+    with gen.profile() as profiler:
+        for _ in range(50):
+            gen.gen_multisec()
+    assert profiler.loops['gen_multisec.section_word_redraws'] == 0
+    assert profiler.vocab_draws['SECTION'] == 100
+
+
+def test_multisec_redraws_match_rejections():
+    gen = DatasetGenerator(seed=1, vocab={'SECTION': {'sec': 1.0, '§': 1.0}})
+    with gen.profile() as profiler:
+        for _ in range(500):
+            gen.gen_multisec()
+    redraws = profiler.loops['gen_multisec.section_word_redraws']
+    # Each call draws the accepted word, its redraws, and the type word.
+    assert profiler.vocab_draws['SECTION'] == 2 * 500 + redraws
+    # Half of the draws are rejected, so about one redraw per call.
+    assert 350 < redraws < 650
+
+
+def test_disable_removes_instrumentation():
+    gen = DatasetGenerator(seed=3)
+    expected = DatasetGenerator(seed=3).gen_trs_desc()
+    with gen.profile() as profiler:
+        gen.gen_trs_desc()
+    assert profiler.methods
+    gen.rng.seed(3)
+    assert gen.gen_trs_desc() == expected
+    assert 'choose_weighted' not in vars(gen)
+
+
+def test_aliquot_draws_match_hand_count():
+    gen = DatasetGenerator(seed=7)
+    with gen.profile() as profiler:
+        text, aliquots = gen._gen_desc_qq()
+    assert (text, aliquots) == ('nw4, s 1/2n 1/2se4ne4', ('NW', 'S2N2SENE'))
+    # The two fractions and "of the" (all drawn up front), 5 components
+    # in 2 groups, and the comma between the groups.
+    assert profiler.vocab_draws == {
+        'QUARTER_FRAC': 1,
+        'HALF_FRAC': 1,
+        'OF_THE': 1,
+        'NORTHWEST_ABBREV': 1,
+        'SOUTH_ABBREV': 1,
+        'NORTH_ABBREV': 1,
+        'SOUTHEAST_ABBREV': 1,
+        'NORTHEAST_ABBREV': 1,
+        'QQ_COMMA': 1,
+    }
+    assert profiler.loops['gen_desc_qq.groups'] == 2
+    assert profiler.loops['gen_desc_qq.components'] == 5
+    # Each vocabulary draw is one ``random()``.
+    assert profiler.rng_draws['random'] == 9
+
+
+def test_every_vocabulary_draw_is_counted(monkeypatch):
+    samples = []
+    sample = WeightedDict.sample
+
+    def counted_sample(self, rand):
+        samples.append(self)
+        return sample(self, rand)
+
+    monkeypatch.setattr(WeightedDict, 'sample', counted_sample)
+    gen = DatasetGenerator(seed=5)
+    with gen.profile() as profiler:
+        for _ in gen.generate_many(200):
+            pass
+    assert '<other>' not in profiler.vocab_draws
+    assert sum(profiler.vocab_draws.values()) == len(samples)
+    assert profiler.loops['gen_desc_qq.components'] >= profiler.loops['gen_desc_qq.groups'] > 0
+
+
+def test_disable_restores_vocabulary():
+    gen = DatasetGenerator(seed=3)
+    vocab = gen.vocab
+    with gen.profile():
+        assert gen.vocab is not vocab
+    assert gen.vocab is vocab
@@ -0,0 +1,59 @@
+import pytest
+
+from dataset_gen.dataset_gen import DatasetGenerator
+
+# Entries whose text can't be part of any other rendered text.
+DISTINCT_ENTRIES = {
+    ('THROUGH', '—'): '—',
+    ('THROUGH', 'thru'): 'thru',
+    ('THROUGH', 'through'): 'through',
+    ('HALF_WORD', 'one half'): 'one half',
+    ('QUARTER_WORD', 'qrtr'): 'qrtr',
+    ('SECTION', 'sect.'): 'sect.',
+    ('SECTION', '§'): '§',
+    ('TOWNSHIP', 'tw.'): 'tw.',
+    ('RANGE', 'rnge'): 'rnge',
+    ('HALF_FRAC', '½'): '½',
+    ('QUARTER_FRAC', '¼'): '¼',
+}
+MIN_COUNT = 20
+
+
+@pytest.fixture(scope='module')
+def sampled():
+    sampler = DatasetGenerator(seed=7).stratified(min_count=MIN_COUNT)
+    rows = list(sampler.generate())
+    return sampler, rows
+
+
+def test_every_entry_reaches_min_count(sampled):
+    sampler, rows = sampled
+    assert sampler.done()
+    assert sampler.unmet() == []
+    assert all(count >= MIN_COUNT for count in sampler.counts.values())
+
+
+def test_counts_are_rows_that_render_the_entry(sampled):
+    sampler, rows = sampled
+    for entry, text in DISTINCT_ENTRIES.items():
+        rendered = sum(text in row for row, _ in rows)
+        assert sampler.counts[entry] == rendered, entry
+        assert rendered >= MIN_COUNT, entry
+
+
+def test_weights_estimate_plain_sampling():
+    n = 20_000
+    plain = DatasetGenerator(seed=1).generate_many(n)
+    plain_rate = sum('sect.' in row for row in plain) / n
+    sampler = DatasetGenerator(seed=2).stratified(min_count=200, vocabularies=['SECTION'])
+    rows = list(sampler.generate(n))
+    weighted_rate = sum(weight for row, weight in rows if 'sect.' in row) / sum(weight for _, weight in rows)
+    raw_rate = sum('sect.' in row for row, _ in rows) / n
+    assert raw_rate > 2 * plain_rate
+    assert weighted_rate == pytest.approx(plain_rate, rel=0.3)
+
+
+def test_requires_python_backend():
+    pytest.importorskip('numpy')
+    with pytest.raises(ValueError):
+        DatasetGenerator(backend='numpy').stratified()
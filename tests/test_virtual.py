@@ -0,0 +1,60 @@
+import pickle
+
+import pytest
+
+from dataset_gen.virtual import VirtualDataset
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    return VirtualDataset(10_000, seed=42)
+
+
+def test_rows_do_not_depend_on_access_order(dataset):
+    forward = [dataset[i] for i in range(100, 120)]
+    backward = [dataset[i] for i in reversed(range(100, 120))][::-1]
+    assert forward == backward
+    assert dataset[100:120] == forward
+    assert list(dataset.iter_range(100, 120)) == forward
+    assert list(dataset)[100:120] == forward
+
+
+def test_rows_depend_on_seed_and_index(dataset):
+    assert dataset[0] != dataset[1]
+    assert VirtualDataset(10_000, seed=43)[0] != dataset[0]
+    assert VirtualDataset(10_000, seed=42)[5_000] == dataset[5_000]
+
+
+def test_indexing(dataset):
+    assert len(dataset) == 10_000
+    assert dataset[-1] == dataset[9_999]
+    assert dataset[9_990::3] == [dataset[9_990], dataset[9_993], dataset[9_996], dataset[9_999]]
+    with pytest.raises(IndexError):
+        dataset[10_000]
+    with pytest.raises(IndexError):
+        dataset[-10_001]
+
+
+def test_pickle(dataset):
+    copy = pickle.loads(pickle.dumps(dataset))
+    assert copy[1_234] == dataset[1_234]
+
+
+def test_labeled_and_noisy_rows_match_text():
+    labeled = VirtualDataset(100, seed=1, labeled=True)
+    plain = VirtualDataset(100, seed=1)
+    assert [row.text for row in labeled[:20]] == plain[:20]
+    noisy = VirtualDataset(100, seed=1, noise_kwargs={'negative_wt': 0.5})
+    assert noisy[:20] == VirtualDataset(100, seed=1, noise_kwargs={'negative_wt': 0.5})[:20]
+
+
+def test_auto_backend_does_not_draw_blocks():
+    dataset = VirtualDataset(10 ** 6, seed=1, generator_kwargs={'backend': 'auto'})
+    assert dataset.generator.backend == 'python'
+    dataset[123_456]
+    assert dataset.generator._columns is None
+
+
+def test_numpy_backend_is_rejected():
+    with pytest.raises(ValueError):
+        VirtualDataset(10, generator_kwargs={'backend': 'numpy'})
@@ -0,0 +1,51 @@
+import json
+import pickle
+
+import pytest
+
+from dataset_gen import dataset_gen as dg
+from dataset_gen.vocab import dump_vocabulary, load_vocabulary
+
+PROFILE = {'TOWNSHIP': {'township': 1.0, 'twp.': 0.5}, 'PM_IDS': ['6th']}
+
+
+@pytest.fixture
+def profile(tmp_path):
+    path = tmp_path / 'profile.json'
+    path.write_text(json.dumps(PROFILE), encoding='utf-8')
+    return path
+
+
+def test_load(profile):
+    vocab = load_vocabulary(profile)
+    assert dict(vocab.TOWNSHIP) == PROFILE['TOWNSHIP']
+    assert vocab.PM_IDS == ('6th',)
+    assert vocab.RANGE == dg.RANGE
+
+
+@pytest.mark.parametrize('contents', ['not json', '[1, 2]', '{"TOWNSHIP": {}}', '{"NOT_A_VOCABULARY": []}'])
+def test_invalid_profile(tmp_path, contents):
+    path = tmp_path / 'profile.json'
+    path.write_text(contents, encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_vocabulary(path)
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        load_vocabulary(tmp_path / 'profile.yaml')
+
+
+def test_pickled_vocabulary_generates_the_same(profile):
+    vocab = load_vocabulary(profile)
+    copy = pickle.loads(pickle.dumps(vocab))
+    assert copy.TOWNSHIP._table is not None
+    assert list(dg.DatasetGenerator(seed=1, vocab=copy).generate_many(50)) == list(
+        dg.DatasetGenerator(seed=1, vocab=vocab).generate_many(50))
+
+
+def test_dump_round_trip(tmp_path):
+    path = tmp_path / 'default.json'
+    dump_vocabulary(dg.DEFAULT_VOCABULARY, path)
+    vocab = load_vocabulary(path)
+    assert vocab.to_dict() == dg.DEFAULT_VOCABULARY.to_dict()
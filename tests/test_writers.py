@@ -0,0 +1,100 @@
+import csv
+import json
+
+import pytest
+
+from dataset_gen import corpus
+from dataset_gen.dataset_gen import DatasetGenerator
+from dataset_gen.writers import infer_format, resolve_output, write_rows
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as file:
+        return list(csv.reader(file))
+
+
+def test_empty_csv_has_header(tmp_path):
+    path = tmp_path / 'empty.csv'
+    assert write_rows([], path) == 0
+    assert read_csv(path) == [['text']]
+
+
+def test_empty_parquet(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = tmp_path / 'empty.parquet'
+    assert write_rows([], path) == 0
+    table = pq.read_table(path)
+    assert table.num_rows == 0
+    assert table.column_names == ['text']
+
+
+def test_parquet_round_trip(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    rows = list(DatasetGenerator(seed=1).generate_many(50, labeled=True))
+    path = tmp_path / 'out.parquet'
+    assert write_rows(rows, path, chunk_size=7) == 50
+    table = pq.read_table(path)
+    assert table.column('text').to_pylist() == [row.text for row in rows]
+    assert len(table.column('tracts')[0]) == len(rows[0].tracts)
+
+
+def test_csv_round_trip(tmp_path):
+    rows = list(DatasetGenerator(seed=1).generate_many(50, labeled=True))
+    path = tmp_path / 'out.csv'
+    assert write_rows(rows, path, chunk_size=7) == 50
+    read = read_csv(path)
+    assert read[0] == ['text', 'tracts']
+    assert [text for text, _ in read[1:]] == [row.text for row in rows]
+    assert len(json.loads(read[1][1])) == len(rows[0].tracts)
+
+
+def test_jsonl_round_trip(tmp_path):
+    rows = list(DatasetGenerator(seed=1).generate_many(50))
+    path = tmp_path / 'out.jsonl.gz'
+    assert write_rows(rows, path) == 50
+    import gzip
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        assert [json.loads(line)['text'] for line in file] == rows
+
+
+def test_corpus_honors_chunk_size(tmp_path, monkeypatch):
+    drains = []
+    drain = corpus.CorpusWriter._drain
+
+    def counted_drain(self):
+        drains.append(self.rows)
+        drain(self)
+
+    monkeypatch.setattr(corpus.CorpusWriter, '_drain', counted_drain)
+    rows = list(DatasetGenerator(seed=1).generate_many(25))
+    path = tmp_path / 'out.corpus'
+    assert write_rows(rows, path, chunk_size=10) == 25
+    # Every 10 rows, and the rest on closing.
+    assert drains == [10, 20, 25]
+    assert list(corpus.open_corpus(path)) == rows
+
+
+def test_corpus_rejects_compression(tmp_path):
+    with pytest.raises(ValueError):
+        write_rows([], tmp_path / 'out.corpus', compression='gzip')
+
+
+def test_infer_format():
+    assert infer_format('out.jsonl.gz') == ('jsonl', 'gzip')
+    assert infer_format('out.corpus') == ('corpus', None)
+    with pytest.raises(ValueError):
+        infer_format('out.txt')
+
+
+def test_resolve_output():
+    assert resolve_output('out.jsonl.gz') == ('jsonl', 'gzip')
+    assert resolve_output('out.gz', fmt='csv') == ('csv', 'gzip')
+    assert resolve_output('out.txt', fmt='jsonl') == ('jsonl', None)
+    assert resolve_output('out.csv.gz', compression='zstd') == ('csv', 'zstd')
+    assert resolve_output('out.parquet', compression='brotli') == ('parquet', 'brotli')
+    with pytest.raises(ValueError):
+        resolve_output('out.txt')
+    with pytest.raises(ValueError):
+        resolve_output('out.csv', compression='lzma')
+    with pytest.raises(ValueError):
+        resolve_output('out.corpus.gz')